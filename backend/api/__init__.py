@@ -1,12 +1,14 @@
 """
 LDVELH - API Module
 Routes et utilitaires FastAPI
+
+Les routeurs (api.routes, api.tooltips) ne sont pas importés ici: ils
+dépendent des services, qui utilisent api.streaming. Les importer depuis
+le package créerait un cycle services -> api -> services.
 """
 
 from api.dependencies import get_pool, get_connection, get_settings_dep
 from api.streaming import SSEWriter, SSEEvent, create_sse_response, build_display_text
-from api.routes import router as main_router
-from api.tooltips import router as tooltips_router
 
 __all__ = [
     # Dependencies
@@ -18,7 +20,4 @@ __all__ = [
     "SSEEvent",
     "create_sse_response",
     "build_display_text",
-    # Routers
-    "main_router",
-    "tooltips_router",
 ]
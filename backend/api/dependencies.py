@@ -3,11 +3,12 @@ LDVELH - FastAPI Dependencies
 Injection de dépendances
 """
 
+import secrets
 from collections.abc import AsyncGenerator
 from uuid import UUID
 
 import asyncpg
-from fastapi import Depends, Query
+from fastapi import Depends, Header, HTTPException, Query
 
 from config import Settings, get_settings
 
@@ -30,6 +31,24 @@ async def get_settings_dep() -> Settings:
     return get_settings()
 
 
+async def require_admin(
+    authorization: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings_dep),
+) -> None:
+    """
+    Réserve les endpoints de diagnostic au mode debug ou au jeton admin.
+    Répond 404 sinon, pour ne pas signaler leur existence.
+    """
+    if settings.debug:
+        return
+    expected = f"Bearer {settings.admin_token}".encode()
+    if settings.admin_token and authorization and secrets.compare_digest(
+        authorization.encode(), expected
+    ):
+        return
+    raise HTTPException(status_code=404, detail="Not Found")
+
+
 async def validate_game_id(game_id: UUID = Query(..., alias="gameId")) -> UUID:
     """Valide et retourne l'ID de partie"""
     return game_id
@@ -0,0 +1,57 @@
+"""
+LDVELH - Réponses JSON
+Classe de réponse branchée sur utils.serialization (orjson si disponible)
+et helpers de requêtes conditionnelles (ETag / 304)
+"""
+
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from utils.serialization import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse sérialisée par orjson (ou stdlib en repli).
+    Renvoyée directement par une route, elle évite aussi le passage par
+    jsonable_encoder: UUID et datetime sont gérés nativement.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+# =============================================================================
+# ETAG / REQUÊTES CONDITIONNELLES
+# =============================================================================
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Vrai si If-None-Match contient l'ETag (ou *)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def kg_etag(version: int) -> str:
+    """ETag dérivé de games.kg_version (pas besoin de charger le contenu)"""
+    return f'"kg-{version}"'
+
+
+def not_modified(etag: str) -> Response:
+    """Réponse 304 avec les en-têtes de validation"""
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+def conditional_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """200 avec le corps JSON déjà sérialisé, ou 304 si le client est à jour"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
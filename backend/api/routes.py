@@ -3,23 +3,35 @@ LDVELH - API Routes
 Routes FastAPI principales
 """
 
-import time
-import json
 import logging
 import asyncio
 from uuid import UUID
 
 import asyncpg
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+)
 from prompts.narrator_prompt import (
     NARRATOR_SYSTEM_PROMPT,
     build_narrator_context_prompt,
 )
 from pydantic import BaseModel
-from schema import NarrationOutput, WorldGeneration
-
-from api.dependencies import get_pool, get_settings_dep
-from api.streaming import SSEWriter, create_sse_response
+from schema import NarrationOutput, WorldGeneration, normalization_stats
+
+from api.dependencies import get_pool, get_settings_dep, require_admin
+from api.responses import FastJSONResponse, etag_matches, kg_etag, not_modified
+from api.streaming import (
+    SSEWriter,
+    create_sse_response,
+    get_turn_stream,
+    register_turn_stream,
+)
 from config import Settings
 from prompts.world_generation_prompt import get_full_generation_prompt
 from services.context_builder import ContextBuilder
@@ -29,6 +41,12 @@ from services.extraction_service import (
 )
 from services.game_service import GameService
 from services.llm_service import get_llm_service
+from utils.llm_recording import record_turn
+from utils.loop_monitor import get_loop_monitor
+from utils.offload import log_json, validate_model_offloaded
+from utils.query_stats import query_stats
+from utils.tracing import current_span, new_trace_id, span, start_trace
+from utils.validation import validation_stats
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +73,9 @@ class ChatRequest(BaseModel):
     message: str
     gameId: UUID
     gameState: GameState | None = None
+    # Coalescence des chunks (None = réglages serveur)
+    streamFlushMs: int | None = None
+    streamFlushBytes: int | None = None
 
 
 class RollbackRequest(BaseModel):
@@ -87,11 +108,21 @@ async def list_games(pool: asyncpg.Pool = Depends(get_pool)):
 
 
 @router.get("/games/{game_id}")
-async def load_game(game_id: UUID, pool: asyncpg.Pool = Depends(get_pool)):
-    """Charge une partie"""
+async def load_game(
+    game_id: UUID, request: Request, pool: asyncpg.Pool = Depends(get_pool)
+):
+    """
+    Charge une partie.
+    ETag = version du KG: 304 si le client a déjà cette version.
+    """
     service = GameService(pool)
 
     try:
+        # Version lue AVANT les données: l'ETag n'est jamais plus récent
+        version = await service.get_kg_version(game_id)
+        if version is not None and etag_matches(request, kg_etag(version)):
+            return not_modified(kg_etag(version))
+
         state = await service.load_game_state(game_id)
         messages = await service.load_chat_messages(game_id)
 
@@ -101,11 +132,14 @@ async def load_game(game_id: UUID, pool: asyncpg.Pool = Depends(get_pool)):
         if state.get("monde_cree") and not messages:
             world_info = await service.load_world_info(game_id)
 
-        return {
-            "state": state,
-            "messages": messages,
-            "world_info": world_info,
-        }
+        return FastJSONResponse(
+            {
+                "state": state,
+                "messages": messages,
+                "world_info": world_info,
+            },
+            headers=_version_headers(version),
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -146,9 +180,12 @@ async def rename_game(
 
 
 @router.get("/games/{game_id}/world")
-async def get_world_data(game_id: UUID, pool: asyncpg.Pool = Depends(get_pool)):
+async def get_world_data(
+    game_id: UUID, request: Request, pool: asyncpg.Pool = Depends(get_pool)
+):
     """
     Récupère les données du monde pour les sidebars.
+    ETag = version du KG: 304 si rien n'a été écrit depuis.
 
     Returns:
         - npcs: Liste des PNJs connus
@@ -159,22 +196,102 @@ async def get_world_data(game_id: UUID, pool: asyncpg.Pool = Depends(get_pool)):
     service = GameService(pool)
 
     try:
-        # Charger chaque type de données séparément
-        npcs = await service.load_npcs(game_id)
-        locations = await service.load_locations(game_id)
-        quests = await service.load_quests(game_id)
-        organizations = await service.load_organizations(game_id)
-
-        return {
-            "npcs": npcs,
-            "locations": locations,
-            "quests": quests,
-            "organizations": organizations,
-        }
+        version = await service.get_kg_version(game_id)
+        if version is not None and etag_matches(request, kg_etag(version)):
+            return not_modified(kg_etag(version))
+
+        # Chaque loader prend sa propre connexion: chargement en parallèle
+        npcs, locations, quests, organizations = await asyncio.gather(
+            service.load_npcs(game_id),
+            service.load_locations(game_id),
+            service.load_quests(game_id),
+            service.load_organizations(game_id),
+        )
+
+        return FastJSONResponse(
+            {
+                "npcs": npcs,
+                "locations": locations,
+                "quests": quests,
+                "organizations": organizations,
+            },
+            headers=_version_headers(version),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _version_headers(version: int | None) -> dict[str, str]:
+    """En-têtes de validation (aucun si la version est inconnue)"""
+    if version is None:
+        return {}
+    return {"ETag": kg_etag(version), "Cache-Control": "no-cache"}
+
+
+@router.get("/games/{game_id}/stats/history")
+async def get_stats_history(game_id: UUID, pool: asyncpg.Pool = Depends(get_pool)):
+    """
+    Évolution des stats du protagoniste pour le graphique.
+
+    Returns:
+        - energie, moral, sante, credits: [{cycle, valeur, delta, description}]
+    """
+    service = GameService(pool)
+    try:
+        return await service.load_stats_history(game_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+# =============================================================================
+# DEBUG ENDPOINTS (mode debug ou jeton admin, cf. require_admin)
+# =============================================================================
+
+
+@router.get("/debug/validation-stats", dependencies=[Depends(require_admin)])
+async def get_validation_stats():
+    """
+    Temps de validation Pydantic par modèle (p50/p95/p99 sur les dernières
+    validations) et valeurs LLM passées par le fuzzy matching ou inconnues.
+    """
+    return {
+        "models": validation_stats.snapshot(),
+        "normalization": normalization_stats.snapshot(),
+    }
+
+
+@router.get("/debug/query-stats", dependencies=[Depends(require_admin)])
+async def get_query_stats(
+    limit: int = Query(50, ge=1, le=500),
+    order: str = Query("total", pattern="^(total|p95|calls)$"),
+):
+    """
+    Requêtes SQL par empreinte (appels, lignes, p50/p95/p99), triées par
+    temps cumulé, p95 ou nombre d'appels, et dernières requêtes lentes
+    (avec plan EXPLAIN si DB_EXPLAIN_SLOW_QUERIES).
+    """
+    return query_stats.snapshot(limit=limit, order=order)
+
+
+@router.delete("/debug/query-stats", dependencies=[Depends(require_admin)])
+async def reset_query_stats():
+    """Remet les statistiques SQL à zéro (avant une mesure)"""
+    query_stats.reset()
+    return {"success": True}
+
+
+@router.get("/debug/event-loop", dependencies=[Depends(require_admin)])
+async def get_event_loop_stats():
+    """
+    Retard de la boucle asyncio (p50/p95/p99/max récents) et derniers
+    blocages avec la pile du code qui tenait la boucle.
+    """
+    monitor = get_loop_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Surveillance désactivée")
+    return monitor.snapshot()
+
+
 # =============================================================================
 # ROLLBACK ENDPOINT
 # =============================================================================
@@ -212,6 +329,7 @@ async def rollback_game(
 @router.post("/chat")
 async def chat(
     request: ChatRequest,
+    http_request: Request,
     background_tasks: BackgroundTasks,
     pool: asyncpg.Pool = Depends(get_pool),
     settings: Settings = Depends(get_settings_dep),
@@ -224,20 +342,69 @@ async def chat(
     - FIRST_LIGHT: Premier narratif après création du monde
     - LIGHT: Narratif normal
     """
-    sse_writer = SSEWriter()
-
-    # Lancer le traitement en background
-    asyncio.create_task(
-        _handle_chat(
-            request=request,
-            sse_writer=sse_writer,
-            pool=pool,
-            settings=settings,
-            background_tasks=background_tasks,
+    sse_writer = SSEWriter.for_client(
+        request.streamFlushMs,
+        request.streamFlushBytes,
+        settings.sse_chunk_flush_ms,
+        settings.sse_chunk_flush_bytes,
+        resume_grace=settings.sse_resume_grace_seconds,
+        trace_id=new_trace_id(),
+    )
+    register_turn_stream(sse_writer)
+
+    # Lancer le traitement en background (annulé si le client part)
+    sse_writer.attach_task(
+        asyncio.create_task(
+            _handle_chat(
+                request=request,
+                sse_writer=sse_writer,
+                pool=pool,
+                settings=settings,
+                background_tasks=background_tasks,
+            )
         )
     )
 
-    return create_sse_response(sse_writer)
+    return create_sse_response(sse_writer, http_request)
+
+
+@router.get("/chat/{turn_id}/stream")
+async def resume_chat_stream(
+    turn_id: str,
+    http_request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+):
+    """
+    Reprend le stream d'un tour après une coupure: rejoue les événements
+    postérieurs à Last-Event-ID puis continue en direct.
+    Ne relance jamais la génération.
+    """
+    sse_writer = get_turn_stream(turn_id)
+    if sse_writer is None:
+        raise HTTPException(status_code=404, detail="Tour introuvable ou expiré")
+
+    try:
+        last_id = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID invalide")
+
+    return create_sse_response(sse_writer, http_request, last_event_id=last_id)
+
+
+# Sauvegardes de tour en cours (la boucle ne garde qu'une référence faible)
+_persist_tasks: set[asyncio.Task] = set()
+
+
+async def _run_shielded(coro) -> None:
+    """
+    Exécute coro dans sa propre tâche, protégée par asyncio.shield: si le
+    client part, le tour est annulé (stream LLM, résumé anticipé) mais la
+    sauvegarde déjà commencée va jusqu'au bout.
+    """
+    task = asyncio.create_task(coro)
+    _persist_tasks.add(task)
+    task.add_done_callback(_persist_tasks.discard)
+    await asyncio.shield(task)
 
 
 async def _handle_chat(
@@ -246,6 +413,27 @@ async def _handle_chat(
     pool: asyncpg.Pool,
     settings: Settings,
     background_tasks: BackgroundTasks,
+):
+    """
+    Tour de chat complet, sous une trace (trace_id rappelé dans le SSE).
+    Avec LLM_RECORD_FILE, la requête et les sorties LLM sont enregistrées
+    pour benchmarks.replay.
+    """
+    with start_trace(
+        "chat.turn",
+        trace_id=sse_writer.trace_id,
+        **{"game.id": str(request.gameId), "turn.id": sse_writer.turn_id},
+    ):
+        async with record_turn(request.gameId, request):
+            await _process_chat(request, sse_writer, pool, settings, background_tasks)
+
+
+async def _process_chat(
+    request: ChatRequest,
+    sse_writer: SSEWriter,
+    pool: asyncpg.Pool,
+    settings: Settings,
+    background_tasks: BackgroundTasks,
 ):
     """Gère le traitement du chat de manière asynchrone"""
     try:
@@ -275,6 +463,7 @@ async def _handle_chat(
         # =====================================================================
         if is_init_mode:
             logger.info("[CHAT] Mode: INIT (World Builder)")
+            current_span().set_attribute("turn.mode", "init")
 
             ### TODO un jour, il faudra ajouter la paramétrisation du npc soi même mandatory en config avant création du monde. Idem pour lieu, station ?
             prompt = get_full_generation_prompt(
@@ -301,8 +490,19 @@ async def _handle_chat(
 
                 try:
                     # Normalisation et validation Pydantic
-                    world_gen = WorldGeneration.model_validate(parsed)
+                    world_gen = await validate_model_offloaded(
+                        WorldGeneration, parsed, size=len(raw_json)
+                    )
+                except Exception as e:
+                    logger.error(f"[CHAT] Monde invalide: {e}")
+                    await sse_writer.send_error(str(e), recoverable=True)
+                    return
+
+                await _run_shielded(persist_init(world_gen, parsed))
 
+            async def persist_init(world_gen: WorldGeneration, parsed: dict):
+                """Peuple le KG avec le monde généré"""
+                try:
                     # Peupler le KG
                     init_result = await game_service.process_init(game_id, world_gen)
 
@@ -339,6 +539,8 @@ async def _handle_chat(
         else:
             mode_label = "FIRST_LIGHT" if is_first_light else "LIGHT"
             logger.info(f"[CHAT] Mode: {mode_label}, Cycle: {current_cycle}")
+            current_span().set_attribute("turn.mode", mode_label.lower())
+            current_span().set_attribute("turn.cycle", current_cycle)
 
             # Si first_light, utiliser l'événement d'arrivée comme contexte initial
             if is_first_light:
@@ -348,17 +550,20 @@ async def _handle_chat(
                     else "Je viens d'arriver sur la station. IA (remplacer par personnal_ai.name) commente."
                 )
 
-            async with pool.acquire() as conn:
-                builder = ContextBuilder(pool, game_id)
-                context = await builder.build(
-                    conn=conn,
-                    player_input=message,
-                    current_cycle=current_cycle,
-                    current_time=current_time,
-                    current_location_name=current_location,
-                )
+            with span("context.build"):
+                async with pool.acquire() as conn:
+                    builder = ContextBuilder(pool, game_id)
+                    context = await builder.build(
+                        conn=conn,
+                        player_input=message,
+                        current_cycle=current_cycle,
+                        current_time=current_time,
+                        current_location_name=current_location,
+                    )
 
-            context_prompt = build_narrator_context_prompt(context)
+            with span("prompt.render") as render_span:
+                context_prompt = build_narrator_context_prompt(context)
+                render_span.set_attribute("prompt.chars", len(context_prompt))
             logger.info(f"[CHAT] context: \n{context_prompt}")
 
             # Variable pour stocker la tâche de résumé lancée tôt
@@ -367,10 +572,11 @@ async def _handle_chat(
             async def on_narrative_ready(narrative_text: str):
                 """Callback dès que le narrative_text est complet"""
                 logger.info("[CHAT] Narrative ready, lancement résumé anticipé")
-                summary_task_holder["task"] = create_summary_task(pool, narrative_text)
+                summary_task_holder["task"] = sse_writer.attach_task(
+                    create_summary_task(pool, narrative_text)
+                )
 
             async def on_light_complete(parsed, display_text, raw_json):
-                t0 = time.perf_counter()
                 if not parsed:
                     await sse_writer.send_error(
                         "Échec de génération narrative", recoverable=True
@@ -378,20 +584,24 @@ async def _handle_chat(
                     return
 
                 try:
-                    t1 = time.perf_counter()
                     # Normalisation et validation Pydantic
-                    narration = NarrationOutput.model_validate(parsed)
-                    logger.debug(
-                        f"[TIMING] validation + pydantic: {(time.perf_counter() - t1) * 1000:.0f}ms"
+                    narration = await validate_model_offloaded(
+                        NarrationOutput, parsed, size=len(raw_json)
                     )
-                    t1 = time.perf_counter()
+                except Exception as e:
+                    logger.error(f"[CHAT] Narration invalide: {e}")
+                    await sse_writer.send_error(str(e), recoverable=True)
+                    return
+
+                await _run_shielded(persist_light(narration, display_text))
+
+            async def persist_light(narration: NarrationOutput, display_text: str):
+                """Sauvegarde du tour: KG, extraction puis messages"""
+                try:
                     # Traiter la narration
                     process_result = await game_service.process_light(
                         game_id, narration, current_cycle
                     )
-                    logger.debug(
-                        f"[TIMING] process_light: {(time.perf_counter() - t1) * 1000:.0f}ms"
-                    )
 
                     # === EXTRACTION PARALLÈLE (BLOQUANTE) ===
                     # Signaler au client que l'extraction commence
@@ -418,7 +628,6 @@ async def _handle_chat(
                     logger.debug(
                         f"[CHAT] Extraction - hints actifs: {', '.join(hints_active) or 'aucun'}"
                     )
-                    t1 = time.perf_counter()
                     logger.info("[CHAT] Lancement extraction parallèle...")
 
                     extraction_result = await extraction_service.extract_and_populate(
@@ -430,19 +639,12 @@ async def _handle_chat(
                         npcs_present=process_result["npcs_present"],
                         summary_task=summary_task_holder.get("task"),
                     )
-                    logger.info(
-                        f"[CHAT] Extraction terminée:\n{json.dumps(extraction_result, indent=2, default=str, ensure_ascii=False)}"
+                    await log_json(
+                        logger, "[CHAT] Extraction terminée", extraction_result
                     )
-                    logger.debug(
-                        f"[TIMING] extract_and_populate: {(time.perf_counter() - t1) * 1000:.0f}ms"
-                    )
-                    t1 = time.perf_counter()
 
                     # Construire l'état pour le client
                     state = await game_service.load_game_state(game_id)
-                    logger.debug(
-                        f"[TIMING] load_game_state: {(time.perf_counter() - t1) * 1000:.0f}ms"
-                    )
                     state["partie"].update(
                         {
                             "cycle_actuel": process_result["cycle"],
@@ -453,17 +655,17 @@ async def _handle_chat(
                     )
                     if process_result.get("date"):
                         state["partie"]["date_jeu"] = process_result["date"]
-                    t1 = time.perf_counter()
                     await sse_writer.send_done(display_text, state)
 
-                    logger.debug(
-                        f"[TIMING] send_done: {(time.perf_counter() - t1) * 1000:.0f}ms"
-                    )
-                    t1 = time.perf_counter()
                     # Sauvegarder les messages
                     summary_task = summary_task_holder.get("task", "")
                     segment_summary = ""
-                    if summary_task and summary_task.done():
+                    # Résumé anticipé annulé si le client est parti
+                    if (
+                        summary_task
+                        and summary_task.done()
+                        and not summary_task.cancelled()
+                    ):
                         try:
                             summary_result = summary_task.result()
                             segment_summary = (
@@ -487,16 +689,8 @@ async def _handle_chat(
                         tone_notes=narration.scene_mood,
                     )
 
-                    logger.debug(
-                        f"[TIMING] save_messages: {(time.perf_counter() - t1) * 1000:.0f}ms"
-                    )
-
                     await sse_writer.send_saved()
 
-                    logger.debug(
-                        f"[TIMING] TOTAL on_light_complete: {(time.perf_counter() - t0) * 1000:.0f}ms"
-                    )
-
                 except Exception as e:
                     logger.error(f"[CHAT] Erreur process light: {e}")
                     import traceback
@@ -513,6 +707,10 @@ async def _handle_chat(
                 on_narrative_ready=on_narrative_ready,
             )
 
+    except asyncio.CancelledError:
+        logger.info(f"[CHAT] Tour abandonné pour la partie {request.gameId}")
+        raise
+
     except Exception as e:
         logger.debug(f"[CHAT] Erreur non gérée: {e}")
         import traceback
@@ -5,17 +5,28 @@ Gestion du streaming Server-Sent Events
 
 import os
 import asyncio
-import json
 import logging
 import time
+import weakref
+from collections import deque
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 from uuid import uuid4
 
+from fastapi import Request
 from fastapi.responses import StreamingResponse
 
+from utils.metrics import (
+    SSE_ACTIVE_STREAMS,
+    SSE_BYTES_SENT,
+    SSE_EVENTS_SENT,
+    SSE_QUEUE_DEPTH,
+    registry,
+)
+from utils.serialization import sse_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +41,21 @@ class SSEEvent(str, Enum):
     ERROR = "error"
     WARNING = "warning"
     STATE = "state"
+    TURN = "turn"
+    END = "end"
+
+
+# Bornes des réglages de coalescence demandés par un client
+CHUNK_FLUSH_MAX_MS = 250
+CHUNK_FLUSH_MAX_BYTES = 8192
+
+# Événements fusionnables quand la file est pleine (texte concaténé)
+_MERGEABLE_EVENTS = {SSEEvent.CHUNK.value: "content", SSEEvent.PROGRESS.value: "delta"}
+# Événements abandonnés quand la file est pleine
+_DROPPABLE_EVENTS = {SSEEvent.WARNING.value}
+
+# Durée de conservation d'un tour terminé pour les reconnexions (secondes)
+TURN_STREAM_TTL = 120.0
 
 
 @dataclass
@@ -37,18 +63,80 @@ class SSEWriter:
     """
     Gestionnaire d'écriture SSE avec queue async.
     Permet d'envoyer des événements depuis n'importe où.
+
+    Coalescence des chunks: si chunk_flush_interval > 0, les deltas de texte
+    sont regroupés et émis en un seul événement quand la fenêtre de temps
+    expire ou que chunk_flush_bytes est atteint (le premier des deux).
+    Tout autre événement vide d'abord le tampon pour conserver l'ordre.
+
+    File bornée: au-delà de max_queue_events, les chunks/progress sont
+    fusionnés dans le dernier événement du même type et les warnings sont
+    abandonnés. Si le texte en attente dépasse max_queue_bytes, le client
+    est jugé bloqué: le stream est abandonné et les tâches attachées
+    (génération, extraction) sont annulées, comme pour une déconnexion.
+
+    Reprise: chaque événement porte un id croissant et les replay_size
+    derniers sont conservés. Un client reconnecté (Last-Event-ID) reçoit
+    les événements manqués puis la suite en direct; il remplace l'ancienne
+    connexion. Après une déconnexion, le tour continue pendant
+    resume_grace secondes avant d'être abandonné.
     """
 
-    _queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    chunk_flush_interval: float = 0.0  # secondes, 0 = un événement par delta
+    chunk_flush_bytes: int = 512
+    max_queue_events: int = 256
+    max_queue_bytes: int = 1024 * 1024
+    replay_size: int = 512
+    resume_grace: float = 0.0
+    _events: deque = field(default_factory=deque)  # (id, payload) non envoyés
+    _history: deque = field(default_factory=deque)  # (id, payload) récents
+    _last_event_id: int = 0
+    _consumer: int = 0
+    _abandon_handle: asyncio.TimerHandle | None = None
+    _turn_id: str = field(default_factory=lambda: uuid4().hex)
+    _queued_bytes: int = 0
+    _ready: asyncio.Event = field(default_factory=asyncio.Event)
+    _tasks: set = field(default_factory=set)
     _closed: bool = False
+    _abandoned: bool = False
     _stream_id: str = field(default_factory=lambda: uuid4().hex[:8])
     _start_time: float = field(default_factory=time.perf_counter)
     _event_count: int = 0
     _bytes_sent: int = 0
+    _chunk_buffer: list[str] = field(default_factory=list)
+    _chunk_buffer_bytes: int = 0
+    _flush_handle: asyncio.TimerHandle | None = None
+    trace_id: str | None = None  # trace du tour, rappelée dans les événements
 
     def __post_init__(self):
+        self._history = deque(maxlen=max(self.replay_size, self.max_queue_events))
+        _LIVE_WRITERS[self._stream_id] = self
         logger.info(f"[SSE:{self._stream_id}] Stream créé")
 
+    @property
+    def turn_id(self) -> str:
+        return self._turn_id
+
+    @classmethod
+    def for_client(
+        cls,
+        flush_ms: int | None,
+        flush_bytes: int | None,
+        default_flush_ms: int,
+        default_flush_bytes: int,
+        resume_grace: float = 0.0,
+        trace_id: str | None = None,
+    ) -> "SSEWriter":
+        """Crée un writer avec les réglages de coalescence d'un client (bornés)"""
+        ms = default_flush_ms if flush_ms is None else flush_ms
+        size = default_flush_bytes if flush_bytes is None else flush_bytes
+        return cls(
+            chunk_flush_interval=min(max(ms, 0), CHUNK_FLUSH_MAX_MS) / 1000,
+            chunk_flush_bytes=min(max(size, 1), CHUNK_FLUSH_MAX_BYTES),
+            resume_grace=resume_grace,
+            trace_id=trace_id,
+        )
+
     async def send(self, event_type: SSEEvent, data: dict[str, Any]) -> None:
         """Envoie un événement dans la queue"""
         if self._closed:
@@ -57,9 +145,8 @@ class SSEWriter:
             )
             return
 
-        self._event_count += 1
-        payload = {"type": event_type.value, **data}
-        await self._queue.put(payload)
+        self._flush_chunks()
+        self._enqueue(event_type, data)
 
         # Log pour événements importants
         if event_type in (SSEEvent.DONE, SSEEvent.ERROR, SSEEvent.EXTRACTING):
@@ -69,15 +156,129 @@ class SSEWriter:
                 f"({self._event_count} événements)"
             )
 
+    def _enqueue(self, event_type: SSEEvent, data: dict[str, Any]) -> None:
+        payload = {"type": event_type.value, **data}
+        size = _payload_size(payload)
+        # traceId sur les événements de contrôle, pas sur chaque delta de texte
+        if self.trace_id and payload["type"] not in _MERGEABLE_EVENTS:
+            payload["traceId"] = self.trace_id
+
+        if len(self._events) >= self.max_queue_events:
+            tail = self._events[-1][1] if self._events else None
+            text_key = _MERGEABLE_EVENTS.get(payload["type"])
+            if text_key and tail and tail["type"] == payload["type"]:
+                tail[text_key] += payload[text_key]
+                if "milestones" in payload:
+                    tail["milestones"] = payload["milestones"]
+                self._queued_bytes += size
+                self._check_backlog()
+                return
+            if payload["type"] in _DROPPABLE_EVENTS:
+                return
+
+        self._event_count += 1
+        self._last_event_id += 1
+        event = (self._last_event_id, payload)
+        self._events.append(event)
+        self._history.append(event)
+        self._queued_bytes += size
+        self._ready.set()
+        self._check_backlog()
+
+    def _check_backlog(self) -> None:
+        if self._queued_bytes > self.max_queue_bytes:
+            self.abandon(
+                f"client trop lent ({self._queued_bytes / 1024:.0f} KB en attente)"
+            )
+
+    @property
+    def abandoned(self) -> bool:
+        return self._abandoned
+
+    def attach_task(self, task: asyncio.Task) -> asyncio.Task:
+        """Lie une tâche au stream: elle sera annulée si le client part"""
+        if self._abandoned:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def abandon(self, reason: str) -> None:
+        """
+        Abandonne le stream (client déconnecté ou bloqué): vide la file et
+        annule les tâches attachées pour ne plus consommer de tokens.
+        """
+        if self._abandoned or (self._closed and not self._events):
+            return
+        self._abandoned = True
+        self._closed = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._abandon_handle = None
+        self._chunk_buffer.clear()
+        self._events.clear()
+        self._history.clear()
+        self._queued_bytes = 0
+        self._ready.set()
+        _TURN_STREAMS.pop(self._turn_id, None)
+
+        pending = [task for task in self._tasks if not task.done()]
+        logger.warning(
+            f"[SSE:{self._stream_id}] Stream abandonné: {reason} - "
+            f"{len(pending)} tâche(s) annulée(s)"
+        )
+        for task in pending:
+            task.cancel()
+
     async def send_chunk(self, content: str) -> None:
-        """Envoie un chunk de texte narratif"""
-        self._bytes_sent += len(content.encode("utf-8"))
-        await self.send(SSEEvent.CHUNK, {"content": content})
+        """Envoie un chunk de texte narratif (coalescé si configuré)"""
+        size = len(content.encode("utf-8"))
+        self._bytes_sent += size
+
+        if self.chunk_flush_interval <= 0:
+            await self.send(SSEEvent.CHUNK, {"content": content})
+            return
+        if self._closed:
+            return
 
-    async def send_progress(self, raw_json: str) -> None:
-        """Envoie la progression du JSON (mode init)"""
-        self._bytes_sent += len(raw_json.encode("utf-8"))
-        await self.send(SSEEvent.PROGRESS, {"rawJson": raw_json})
+        self._chunk_buffer.append(content)
+        self._chunk_buffer_bytes += size
+
+        if self._chunk_buffer_bytes >= self.chunk_flush_bytes:
+            self._flush_chunks()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.chunk_flush_interval, self._flush_chunks
+            )
+
+    def _flush_chunks(self) -> None:
+        """Émet les chunks en attente en un seul événement"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._chunk_buffer or self._closed:
+            return
+
+        content = "".join(self._chunk_buffer)
+        self._chunk_buffer.clear()
+        self._chunk_buffer_bytes = 0
+        self._enqueue(SSEEvent.CHUNK, {"content": content})
+
+    async def send_progress(
+        self, delta: str, offset: int, milestones: dict | None = None
+    ) -> None:
+        """
+        Envoie la progression du JSON (mode init).
+        Seul le texte ajouté depuis le dernier envoi est transmis: le client
+        le recolle à `offset` pour reconstituer le JSON complet.
+        """
+        self._bytes_sent += len(delta.encode("utf-8"))
+        await self.send(
+            SSEEvent.PROGRESS,
+            {"delta": delta, "offset": offset, "milestones": milestones},
+        )
 
     async def send_extracting(self, display_text: str | None) -> None:
         """
@@ -122,6 +323,8 @@ class SSEWriter:
     async def close(self) -> None:
         """Ferme la queue"""
         if not self._closed:
+            self._flush_chunks()
+            self._enqueue(SSEEvent.END, {})
             self._closed = True
             elapsed = time.perf_counter() - self._start_time
             logger.info(
@@ -130,48 +333,282 @@ class SSEWriter:
                 f"Événements: {self._event_count} | "
                 f"Données: {self._bytes_sent / 1024:.1f} KB"
             )
-            await self._queue.put(None)  # Signal de fin
+            self._ready.set()  # Signal de fin
+            if self._turn_id in _TURN_STREAMS:
+                asyncio.get_running_loop().call_later(
+                    TURN_STREAM_TTL, _TURN_STREAMS.pop, self._turn_id, None
+                )
 
-    async def iterate(self) -> AsyncGenerator[str, None]:
-        """Itère sur les événements pour le streaming"""
-        logger.debug(f"[SSE:{self._stream_id}] Début de l'itération")
+    def _replay_from(self, last_event_id: int) -> list[tuple[int, dict]] | None:
+        """
+        Événements postérieurs à last_event_id (None si l'historique ne
+        remonte plus assez loin). Les retire de la file d'envoi.
+        """
+        if self._history and self._history[0][0] > last_event_id + 1:
+            return None
+        missed = [event for event in self._history if event[0] > last_event_id]
+        replayed_up_to = missed[-1][0] if missed else last_event_id
+        while self._events and self._events[0][0] <= replayed_up_to:
+            _, payload = self._events.popleft()
+            self._queued_bytes -= _payload_size(payload)
+        return missed
+
+    def _consumer_lost(self) -> None:
+        """Connexion perdue: abandon immédiat ou après le délai de reprise"""
+        if self._closed:
+            return  # tour terminé, les événements restent rejouables
+        if self.resume_grace <= 0:
+            self.abandon("client déconnecté")
+            return
+        logger.info(
+            f"[SSE:{self._stream_id}] Client déconnecté, "
+            f"reprise possible pendant {self.resume_grace:.0f}s"
+        )
+        self._abandon_handle = asyncio.get_running_loop().call_later(
+            self.resume_grace, self.abandon, "client non revenu"
+        )
 
-        while True:
-            try:
-                payload = await asyncio.wait_for(
-                    self._queue.get(),
-                    timeout=60.0,  # Timeout de 60s
+    async def iterate(
+        self, request: Request | None = None, last_event_id: int | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Itère sur les événements pour le streaming.
+        Avec last_event_id, rejoue d'abord les événements manqués.
+        Si l'itération s'arrête avant la fin (déconnexion, annulation par
+        le serveur ASGI), le stream est abandonné (cf. resume_grace).
+        """
+        logger.debug(f"[SSE:{self._stream_id}] Début de l'itération")
+        self._consumer += 1
+        consumer = self._consumer
+        self._ready.set()  # réveille une éventuelle connexion remplacée
+        if self._abandon_handle is not None:
+            self._abandon_handle.cancel()
+            self._abandon_handle = None
+        finished = False
+
+        try:
+            if last_event_id is not None:
+                missed = self._replay_from(last_event_id)
+                if missed is None:
+                    logger.warning(
+                        f"[SSE:{self._stream_id}] Reprise impossible après "
+                        f"l'événement {last_event_id}"
+                    )
+                    payload = {
+                        "type": SSEEvent.ERROR.value,
+                        "error": "Historique du tour expiré",
+                        "details": None,
+                        "recoverable": False,
+                    }
+                    yield sse_frame(payload)
+                    self._consumer_lost()
+                    finished = True
+                    return
+                logger.info(
+                    f"[SSE:{self._stream_id}] Reprise après l'événement "
+                    f"{last_event_id}: {len(missed)} événement(s) rejoué(s)"
                 )
-
-                if payload is None:  # Signal de fin
-                    logger.debug(f"[SSE:{self._stream_id}] Signal de fin reçu")
+                for event_id, payload in missed:
+                    frame = sse_frame(payload, event_id)
+                    _count_sent(frame)
+                    yield frame
+
+            while True:
+                if self._consumer != consumer:
+                    # Remplacé par une reconnexion
+                    finished = True
+                    break
+                if not self._events:
+                    if self._closed:
+                        logger.debug(f"[SSE:{self._stream_id}] Signal de fin reçu")
+                        finished = True
+                        break
+                    self._ready.clear()
+                    try:
+                        await asyncio.wait_for(self._ready.wait(), timeout=60.0)
+                    except TimeoutError:
+                        if request is not None and await request.is_disconnected():
+                            break
+                        # Envoie un keepalive
+                        logger.debug(f"[SSE:{self._stream_id}] Keepalive envoyé")
+                        yield b": keepalive\n\n"
+                    continue
+
+                event_id, payload = self._events.popleft()
+                self._queued_bytes -= _payload_size(payload)
+
+                try:
+                    frame = sse_frame(payload, event_id)
+                except Exception as e:
+                    logger.error(f"[SSE:{self._stream_id}] Erreur iteration: {e}")
                     break
+                _count_sent(frame)
+                yield frame
+        finally:
+            if not finished and self._consumer == consumer:
+                self._consumer_lost()
 
-                yield f"data: {json.dumps(payload)}\n\n"
 
-            except TimeoutError:
-                # Envoie un keepalive
-                logger.debug(f"[SSE:{self._stream_id}] Keepalive envoyé")
-                yield ": keepalive\n\n"
-            except Exception as e:
-                logger.error(f"[SSE:{self._stream_id}] Erreur iteration: {e}")
-                break
+def _payload_size(payload: dict) -> int:
+    """Taille approximative du texte porté par un événement"""
+    text_key = _MERGEABLE_EVENTS.get(payload["type"])
+    return len(payload[text_key]) if text_key else 0
+
+
+# =============================================================================
+# MÉTRIQUES
+# =============================================================================
+
+# Writers vivants (références faibles: un tour expiré disparaît seul)
+_LIVE_WRITERS: "weakref.WeakValueDictionary[str, SSEWriter]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _count_sent(frame: bytes) -> None:
+    SSE_EVENTS_SENT.inc()
+    SSE_BYTES_SENT.inc(len(frame))
+
+
+def _collect_sse_metrics() -> None:
+    """Collecteur /metrics: tours en cours et profondeur des files"""
+    writers = list(_LIVE_WRITERS.values())
+    SSE_ACTIVE_STREAMS.set(sum(1 for w in writers if not w._closed))
+    SSE_QUEUE_DEPTH.set(sum(len(w._events) for w in writers))
+
+
+registry.register_collector(_collect_sse_metrics)
+
 
+# =============================================================================
+# REGISTRE DES TOURS (reprise de stream)
+# =============================================================================
+
+_TURN_STREAMS: dict[str, SSEWriter] = {}
 
-def create_sse_response(writer: SSEWriter) -> StreamingResponse:
+
+def register_turn_stream(writer: SSEWriter) -> str:
+    """
+    Rend un tour joignable par GET /chat/{turn_id}/stream.
+    Le premier événement du stream communique le turn_id au client.
+    """
+    _TURN_STREAMS[writer.turn_id] = writer
+    writer._enqueue(SSEEvent.TURN, {"turnId": writer.turn_id})
+    return writer.turn_id
+
+
+def get_turn_stream(turn_id: str) -> SSEWriter | None:
+    """Writer d'un tour en cours ou récemment terminé"""
+    return _TURN_STREAMS.get(turn_id)
+
+
+def create_sse_response(
+    writer: SSEWriter,
+    request: Request | None = None,
+    last_event_id: int | None = None,
+) -> StreamingResponse:
     """Crée une réponse SSE à partir d'un writer"""
     logger.debug(f"[SSE:{writer._stream_id}] Création de la réponse SSE")
+    headers = {
+        "Cache-Control": "no-cache, no-transform",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",  # Désactive le buffering nginx
+    }
+    if writer.trace_id:
+        headers["X-Trace-Id"] = writer.trace_id
     return StreamingResponse(
-        writer.iterate(),
+        writer.iterate(request, last_event_id),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-transform",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Désactive le buffering nginx
-        },
+        headers=headers,
     )
 
 
+# =============================================================================
+# PROGRESSION GÉNÉRATION DU MONDE
+# =============================================================================
+
+
+class WorldGenProgressTracker:
+    """
+    Parseur incrémental du JSON de WorldGeneration en cours de streaming.
+
+    Ne conserve que l'état lexical (pile de conteneurs, chaîne en cours,
+    section racine courante): chaque caractère n'est lu qu'une fois, quel
+    que soit le nombre d'appels à feed().
+    """
+
+    COUNTED_SECTIONS = ("characters", "locations", "organizations")
+
+    def __init__(self):
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_chars: list[str] | None = None
+        self._section: str | None = None
+        self._completed: list[str] = []
+        self._counts = dict.fromkeys(self.COUNTED_SECTIONS, 0)
+
+    def feed(self, text: str) -> None:
+        """Avance le parseur sur le texte ajouté"""
+        stack = self._stack
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._section = "".join(self._key_chars)
+                        self._key_chars = None
+                    continue
+                if self._key_chars is not None:
+                    self._key_chars.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if len(stack) == 1 and self._expect_key:
+                    self._key_chars = []
+            elif char in "{[":
+                if not stack:
+                    self._expect_key = True
+                stack.append(char)
+            elif char in "}]":
+                if stack:
+                    stack.pop()
+                depth = len(stack)
+                if (
+                    char == "}"
+                    and depth == 2
+                    and stack[1] == "["
+                    and self._section in self._counts
+                ):
+                    self._counts[self._section] += 1
+                if depth <= 1:
+                    self._complete_section()
+            elif len(stack) == 1:
+                if char == ":":
+                    self._expect_key = False
+                elif char == ",":
+                    self._complete_section()
+                    self._expect_key = True
+
+    def _complete_section(self) -> None:
+        if self._section and self._section not in self._completed:
+            self._completed.append(self._section)
+
+    def milestones(self) -> dict:
+        """Compteurs et sections terminées, pour l'affichage client"""
+        return {
+            **self._counts,
+            "section": self._section,
+            "completedSections": list(self._completed),
+        }
+
+
 # =============================================================================
 # DISPLAY BUILDER
 # =============================================================================
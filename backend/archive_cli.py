@@ -0,0 +1,157 @@
+"""
+LDVELH - CLI Archive
+Export / import d'une partie entre bases de données
+
+Usage:
+    python archive_cli.py export <game_id> <fichier.ldvelh.gz>
+    python archive_cli.py import <fichier.ldvelh.gz> [--name NOM] [--inactive]
+    python archive_cli.py info <fichier.ldvelh.gz>
+    python archive_cli.py archive-inactive --days N
+    python archive_cli.py restore <game_id>
+"""
+
+import argparse
+import asyncio
+import gzip
+import sys
+from uuid import UUID
+
+import asyncpg
+
+from config import get_settings
+from kg.archive import (
+    ArchiveError,
+    archive_game,
+    export_game,
+    find_archivable_games,
+    import_game,
+    read_archive_header,
+    restore_game,
+)
+
+
+async def _export(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.database_url)
+    try:
+        stats = await export_game(
+            conn, UUID(args.game_id), args.file, compresslevel=args.level
+        )
+    finally:
+        await conn.close()
+
+    print(f"[ARCHIVE] Partie {stats['game_id']} exportée vers {args.file}")
+    for table, count in stats["tables"].items():
+        if count:
+            print(f"  {table}: {count}")
+
+
+async def _import(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.database_url)
+    try:
+        stats = await import_game(
+            conn,
+            args.file,
+            name=args.name,
+            active=False if args.inactive else None,
+        )
+    finally:
+        await conn.close()
+
+    print(
+        f"[ARCHIVE] Partie {stats['source_game_id']} importée "
+        f"sous l'id {stats['game_id']}"
+    )
+    for table, count in stats["tables"].items():
+        if count:
+            print(f"  {table}: {count}")
+
+
+async def _archive_inactive(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.database_url)
+    try:
+        game_ids = await find_archivable_games(conn, args.days)
+        print(f"[ARCHIVE] {len(game_ids)} partie(s) inactive(s) depuis {args.days} jours")
+        for game_id in game_ids:
+            stats = await archive_game(conn, game_id)
+            if stats:
+                print(f"  {game_id}: {stats['size_bytes'] / 1024:.1f} Ko")
+    finally:
+        await conn.close()
+
+
+async def _restore(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.database_url)
+    try:
+        stats = await restore_game(conn, UUID(args.game_id))
+    finally:
+        await conn.close()
+
+    if stats is None:
+        print(f"[ARCHIVE] Partie {args.game_id} non archivée")
+    else:
+        print(f"[ARCHIVE] Partie {args.game_id} restaurée")
+
+
+def _info(args: argparse.Namespace) -> None:
+    with gzip.open(args.file, "rb") as f:
+        version, header = read_archive_header(f)
+    print(f"[ARCHIVE] Format v{version}")
+    for key, value in header.items():
+        print(f"  {key}: {value}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export/import de parties LDVELH")
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="URL PostgreSQL (défaut: DATABASE_URL)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Exporte une partie")
+    p_export.add_argument("game_id")
+    p_export.add_argument("file")
+    p_export.add_argument("--level", type=int, default=6, help="Compression gzip 1-9")
+
+    p_import = sub.add_parser("import", help="Importe une archive (nouvel id)")
+    p_import.add_argument("file")
+    p_import.add_argument("--name", default=None, help="Renomme la partie importée")
+    p_import.add_argument(
+        "--inactive", action="store_true", help="Importe la partie désactivée"
+    )
+
+    p_archive = sub.add_parser(
+        "archive-inactive", help="Déplace les parties inactives en cold storage"
+    )
+    p_archive.add_argument("--days", type=int, required=True)
+
+    p_restore = sub.add_parser("restore", help="Restaure une partie archivée")
+    p_restore.add_argument("game_id")
+
+    p_info = sub.add_parser("info", help="Affiche l'en-tête d'une archive")
+    p_info.add_argument("file")
+
+    args = parser.parse_args()
+    if args.database_url is None:
+        args.database_url = get_settings().database_url
+
+    try:
+        if args.command == "export":
+            asyncio.run(_export(args))
+        elif args.command == "import":
+            asyncio.run(_import(args))
+        elif args.command == "archive-inactive":
+            asyncio.run(_archive_inactive(args))
+        elif args.command == "restore":
+            asyncio.run(_restore(args))
+        else:
+            _info(args)
+    except (ArchiveError, ValueError) as e:
+        print(f"[ARCHIVE] Erreur: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+LDVELH - Benchmarks
+Scripts de mesure à lancer depuis backend/: python -m benchmarks.<nom>
+"""
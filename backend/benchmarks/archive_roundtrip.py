@@ -0,0 +1,129 @@
+"""
+LDVELH - Aller-retour export / import d'archive
+
+Génère une partie synthétique (benchmarks.synthetic_world: jauges,
+historique de jauges, faits, messages...), l'exporte avec
+kg.archive.export_game, la réimporte comme nouvelle partie puis vérifie:
+- le nombre de lignes par table (export = import),
+- les valeurs des jauges et de leur historique (colonnes NUMERIC),
+- les attributs courants (clé, valeur) de chaque entité.
+
+Affiche la durée de l'export, de l'import et la taille de l'archive.
+Les deux parties sont supprimées à la fin (sauf --keep).
+
+Usage (depuis backend/):
+    python -m benchmarks.archive_roundtrip --tier medium
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import time
+from uuid import UUID
+
+import asyncpg
+
+from benchmarks.synthetic_world import TIERS, generate_game
+from config import get_settings
+from kg.archive import export_game, import_game
+
+# Contenu comparé entre la partie source et la partie importée
+# (sans UUID: ils sont remappés à l'import)
+CHECKS = {
+    "protagonist_gauges": """
+        SELECT energy, morale, health, credits, updated_cycle
+        FROM protagonist_gauges WHERE game_id = $1""",
+    "protagonist_gauge_history": """
+        SELECT gauge, cycle, old_value, new_value, description
+        FROM protagonist_gauge_history WHERE game_id = $1
+        ORDER BY cycle, gauge, new_value""",
+    "attributes": """
+        SELECT e.name, a.key, a.value, a.start_cycle
+        FROM attributes a JOIN entities e ON e.id = a.entity_id
+        WHERE a.game_id = $1 AND a.end_cycle IS NULL
+        ORDER BY e.name, a.key""",
+}
+
+
+async def _snapshot(conn: asyncpg.Connection, game_id: UUID) -> dict[str, list]:
+    return {
+        name: [tuple(row) for row in await conn.fetch(query, game_id)]
+        for name, query in CHECKS.items()
+    }
+
+
+async def run(args: argparse.Namespace) -> bool:
+    pool = await asyncpg.create_pool(
+        args.database_url or get_settings().database_url, min_size=1, max_size=2
+    )
+    source_id = imported_id = None
+    try:
+        source_id, _ = await generate_game(pool, TIERS[args.tier], args.seed, "archive")
+
+        async with pool.acquire() as conn:
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            exported = await export_game(conn, source_id, buffer)
+            export_s = time.perf_counter() - start
+
+            buffer.seek(0)
+            start = time.perf_counter()
+            async with conn.transaction():
+                imported = await import_game(conn, buffer)
+            import_s = time.perf_counter() - start
+            imported_id = imported["game_id"]
+
+            before = await _snapshot(conn, source_id)
+            after = await _snapshot(conn, imported_id)
+
+        rows = sum(exported["tables"].values())
+        print(
+            f"[ROUNDTRIP] {args.tier}: {rows} lignes, "
+            f"{len(buffer.getvalue()) / 1024:.1f} Ko"
+        )
+        print(f"  export {export_s * 1000:>9.1f} ms")
+        print(f"  import {import_s * 1000:>9.1f} ms")
+
+        ok = True
+        for table, count in exported["tables"].items():
+            if imported["tables"].get(table) != count:
+                print(
+                    f"  ! {table}: {count} exportées, {imported['tables'].get(table)}"
+                )
+                ok = False
+        for name in CHECKS:
+            if before[name] != after[name]:
+                print(f"  ! {name}: contenu différent après import")
+                ok = False
+            elif not before[name]:
+                print(f"  ! {name}: aucune ligne à comparer")
+                ok = False
+        print("  OK" if ok else "  ÉCHEC")
+        return ok
+    finally:
+        if not args.keep:
+            for game_id in (source_id, imported_id):
+                if game_id:
+                    await pool.execute("DELETE FROM games WHERE id = $1", game_id)
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aller-retour export / import")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tier", default="small", choices=list(TIERS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--keep", action="store_true", help="Conserver les parties créées"
+    )
+    args = parser.parse_args()
+
+    # Le populator journalise chaque opération
+    logging.getLogger("kg").setLevel(logging.WARNING)
+    if not asyncio.run(run(args)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+LDVELH - Faux serveur Anthropic (Messages API) pour les tests de charge
+POST /v1/messages, streaming SSE ou non, avec des réponses JSON
+préenregistrées: monde (prompts/example_world_generation.json),
+narrateur et chaque extracteur, reconnus d'après leur prompt système.
+Latence, débit de tokens et erreurs (HTTP ou en cours de stream) sont
+réglables, pour mesurer le backend sans payer d'appels réels.
+
+Usage (depuis backend/):
+    python -m benchmarks.fake_anthropic --port 8100
+    python -m benchmarks.fake_anthropic --latency-ms 600 --tokens-per-second 60 \\
+        --error-rate 0.02 --stream-error-rate 0.01
+
+Puis lancer le backend avec ANTHROPIC_BASE_URL=http://127.0.0.1:8100
+(et une ANTHROPIC_API_KEY quelconque).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from prompts.extractor_prompts import (
+    COMMITMENTS_SYSTEM,
+    ENTITIES_SYSTEM,
+    FACTS_SYSTEM,
+    OBJECTS_SYSTEM,
+    PROTAGONIST_STATE_SYSTEM,
+    RELATIONS_SYSTEM,
+    SUMMARY_SYSTEM,
+)
+from prompts.narrator_prompt import NARRATOR_SYSTEM_PROMPT
+from prompts.world_generation_prompt import WORLD_GENERATION_SYSTEM_PROMPT
+from schema import NarrationOutput, WorldGeneration
+
+EXAMPLE_WORLD = (
+    Path(__file__).parent.parent / "prompts" / "example_world_generation.json"
+)
+
+# Approximation utilisée pour l'usage renvoyé et le débit simulé
+CHARS_PER_TOKEN = 4
+# Tokens par delta de texte en streaming
+TOKENS_PER_DELTA = 3
+
+_ERRORS = [
+    (429, "rate_limit_error", "Rate limited"),
+    (500, "api_error", "Internal server error"),
+    (529, "overloaded_error", "Overloaded"),
+]
+
+_PARAGRAPH = (
+    "La coursive résonne du ronronnement des recycleurs d'air. Valentin "
+    "avance entre les caisses de semences, salue d'un signe de tête une "
+    "technicienne qui répare un panneau lumineux, puis s'arrête devant la "
+    "baie vitrée où la planète défile lentement, bleue et indifférente. "
+)
+
+
+@dataclass
+class FakeConfig:
+    """Comportement simulé de l'API"""
+
+    latency_ms: float = 300.0  # Avant la réponse / le premier token
+    jitter_ms: float = 100.0
+    tokens_per_second: float = 80.0  # 0 = pas de limite de débit
+    error_rate: float = 0.0  # Réponses HTTP en erreur (429/500/529)
+    stream_error_rate: float = 0.0  # Événements error en cours de stream
+    narrator_tokens: int = 600
+    seed: int | None = None
+
+
+# =============================================================================
+# RÉPONSES PRÉENREGISTRÉES
+# =============================================================================
+
+
+def _prefix(prompt: str) -> str:
+    return prompt.strip()[:80]
+
+
+_KINDS = [
+    (_prefix(WORLD_GENERATION_SYSTEM_PROMPT), "world"),
+    (_prefix(NARRATOR_SYSTEM_PROMPT), "narrator"),
+    (_prefix(SUMMARY_SYSTEM), "summary"),
+    (_prefix(PROTAGONIST_STATE_SYSTEM), "protagonist_state"),
+    (_prefix(ENTITIES_SYSTEM), "entities"),
+    (_prefix(OBJECTS_SYSTEM), "objects"),
+    (_prefix(FACTS_SYSTEM), "facts"),
+    (_prefix(RELATIONS_SYSTEM), "relations"),
+    (_prefix(COMMITMENTS_SYSTEM), "commitments"),
+]
+
+
+def system_text(system) -> str:
+    """Prompt système d'une requête (chaîne ou liste de blocs texte)"""
+    if isinstance(system, list):
+        return "".join(block.get("text", "") for block in system)
+    return system or ""
+
+
+def classify(system) -> str:
+    """Type d'appel d'après le début du prompt système"""
+    text = system_text(system).strip()
+    if not text:
+        return "short_summary"
+    for prefix, kind in _KINDS:
+        if text.startswith(prefix):
+            return kind
+    return "unknown"
+
+
+class CannedResponses:
+    """
+    Textes renvoyés par type d'appel. Le monde et la narration sont validés
+    à la construction: une réponse invalide ferait échouer chaque tour
+    côté backend, le serveur refuse de démarrer.
+    """
+
+    def __init__(self, narrator_tokens: int):
+        with open(EXAMPLE_WORLD, encoding="utf-8") as f:
+            world = json.load(f)
+        self.world_json = json.dumps(world, ensure_ascii=False, indent=2)
+        self.location = world["arrival_event"]["arrival_location_ref"]
+        self.protagonist = world["protagonist"]["name"]
+        repeat = max(1, narrator_tokens * CHARS_PER_TOKEN // len(_PARAGRAPH))
+        self.narrative = (_PARAGRAPH * repeat).strip()
+        self._turns = itertools.count(1)
+
+        WorldGeneration.model_validate(world)
+        NarrationOutput.model_validate(self._narration(1))
+
+    def text(self, kind: str) -> str:
+        turn = next(self._turns)
+        if kind == "world":
+            return self.world_json
+        if kind == "narrator":
+            return json.dumps(self._narration(turn), ensure_ascii=False)
+        if kind == "short_summary":
+            return f"{self.protagonist} traverse la station."
+        return json.dumps(self._extraction(kind, turn), ensure_ascii=False)
+
+    def _narration(self, turn: int) -> dict:
+        minutes = 8 * 60 + (turn * 10) % (14 * 60)
+        return {
+            "narrative_text": self.narrative,
+            "time": {"new_time": f"{minutes // 60:02d}h{minutes % 60:02d}"},
+            "current_location": self.location,
+            "npcs_present": [],
+            "suggested_actions": [
+                "Continuer vers les serres",
+                "Parler à la technicienne",
+                "Regarder la planète",
+            ],
+            "hints": {
+                "protagonist_state_changed": True,
+                "information_learned": True,
+            },
+            "scene_mood": "calme contemplatif",
+        }
+
+    def _extraction(self, kind: str, turn: int) -> dict:
+        if kind == "summary":
+            return {"segment_summary": f"{self.protagonist} observe la planète."}
+        if kind == "protagonist_state":
+            return {
+                "gauge_changes": [
+                    {"gauge": "energy", "delta": -0.5, "reason": "Longue marche"}
+                ],
+                "credit_transactions": [
+                    {"amount": -5, "description": "Café au kiosque"}
+                ],
+                "inventory_changes": [],
+            }
+        if kind == "facts":
+            subject = self.protagonist.lower()
+            return {
+                "facts": [
+                    {
+                        "fact_type": "observation",
+                        "description": "Valentin contemple la planète depuis la baie.",
+                        "importance": 2,
+                        "participants": [{"entity_ref": self.protagonist}],
+                        "semantic_key": f"{subject}:observe:planete_{turn}",
+                    }
+                ]
+            }
+        return {
+            "entities": {"entities_created": [], "entities_updated": []},
+            "objects": {"objects_created": []},
+            "relations": {"relations_created": [], "relations_updated": []},
+            "commitments": {
+                "commitments_created": [],
+                "commitments_resolved": [],
+                "events_scheduled": [],
+            },
+        }.get(kind, {})
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _error_body(error_type: str, message: str) -> dict:
+    return {"type": "error", "error": {"type": error_type, "message": message}}
+
+
+def _event(name: str, data: dict) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake Anthropic")
+    canned = CannedResponses(config.narrator_tokens)
+    rng = random.Random(config.seed)
+    stats: dict[str, int] = {}
+
+    async def initial_delay() -> None:
+        delay = config.latency_ms + rng.uniform(-1, 1) * config.jitter_ms
+        await asyncio.sleep(max(0.0, delay) / 1000)
+
+    @app.get("/stats")
+    async def get_stats():
+        """Appels reçus par type (vérifier la répartition d'un test)"""
+        return stats
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        kind = classify(body.get("system"))
+        stats[kind] = stats.get(kind, 0) + 1
+        model = body.get("model", "fake")
+
+        if rng.random() < config.error_rate:
+            await initial_delay()
+            status, error_type, message = rng.choice(_ERRORS)
+            return JSONResponse(_error_body(error_type, message), status_code=status)
+
+        text = canned.text(kind)
+        prompt = system_text(body.get("system")) + json.dumps(body.get("messages"))
+        usage = {"input_tokens": _tokens(prompt), "output_tokens": _tokens(text)}
+        message_id = f"msg_fake_{uuid.uuid4().hex[:20]}"
+
+        if not body.get("stream"):
+            await initial_delay()
+            if config.tokens_per_second > 0:
+                await asyncio.sleep(usage["output_tokens"] / config.tokens_per_second)
+            return {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": usage,
+            }
+
+        fail_mid_stream = rng.random() < config.stream_error_rate
+
+        async def stream():
+            await initial_delay()
+            yield _event(
+                "message_start",
+                {
+                    "type": "message_start",
+                    "message": {
+                        "id": message_id,
+                        "type": "message",
+                        "role": "assistant",
+                        "model": model,
+                        "content": [],
+                        "stop_reason": None,
+                        "stop_sequence": None,
+                        "usage": {**usage, "output_tokens": 1},
+                    },
+                },
+            )
+            yield _event(
+                "content_block_start",
+                {
+                    "type": "content_block_start",
+                    "index": 0,
+                    "content_block": {"type": "text", "text": ""},
+                },
+            )
+            step = TOKENS_PER_DELTA * CHARS_PER_TOKEN
+            pause = (
+                TOKENS_PER_DELTA / config.tokens_per_second
+                if config.tokens_per_second > 0
+                else 0
+            )
+            for start in range(0, len(text), step):
+                if fail_mid_stream and start >= len(text) // 2:
+                    yield _event("error", _error_body("overloaded_error", "Overloaded"))
+                    return
+                yield _event(
+                    "content_block_delta",
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {
+                            "type": "text_delta",
+                            "text": text[start : start + step],
+                        },
+                    },
+                )
+                await asyncio.sleep(pause)
+            yield _event(
+                "content_block_stop", {"type": "content_block_stop", "index": 0}
+            )
+            yield _event(
+                "message_delta",
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": usage["output_tokens"]},
+                },
+            )
+            yield _event("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Faux serveur Anthropic")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=80.0, help="0 = sans limite"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream-error-rate", type=float, default=0.0)
+    parser.add_argument("--narrator-tokens", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        stream_error_rate=args.stream_error_rate,
+        narrator_tokens=args.narrator_tokens,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
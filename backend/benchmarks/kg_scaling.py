@@ -0,0 +1,379 @@
+"""
+LDVELH - Passage à l'échelle des lectures du KG
+
+Pour chaque palier de taille (benchmarks.synthetic_world), génère une
+partie synthétique puis chronomètre:
+- chaque méthode de KnowledgeGraphReader (découvertes par introspection,
+  arguments tirés de la partie: PNJ, lieu, cycle, message...),
+- ContextBuilder.build (contexte du narrateur),
+- GameService.load_game_state (chargement d'une partie),
+- l'index des tooltips, à froid (invalidé) et à chaud,
+- rollback_to_cycle, dans une transaction annulée.
+
+Le rapport (p50/p95 en ms par opération et par palier) peut être écrit en
+JSON avec le commit courant, puis comparé à celui d'un autre commit.
+
+Usage (depuis backend/):
+    python -m benchmarks.kg_scaling --tiers small,medium,large
+    python -m benchmarks.kg_scaling --json before.json
+    python -m benchmarks.kg_scaling --json after.json --compare before.json
+    python -m benchmarks.kg_scaling --game-id <uuid>
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import UUID
+
+import asyncpg
+
+from benchmarks.synthetic_world import (
+    ARRIVAL_LOCATION,
+    TIERS,
+    generate_game,
+)
+from config import get_settings
+from kg.populator import KnowledgeGraphPopulator
+from kg.reader import KnowledgeGraphReader
+from services.context_builder import ContextBuilder
+from services.game_service import GameService
+from services.tooltip_service import tooltip_index
+from utils.validation import percentile
+
+# Au-delà de ce ratio (p50 courant / référence), la comparaison signale
+REGRESSION_RATIO = 1.2
+
+# Arguments propres à une méthode (le nom seul serait ambigu)
+METHOD_ARGS = {
+    "get_location_details": {"name": "location_name"},
+}
+
+
+# =============================================================================
+# ARGUMENTS DES MÉTHODES DU READER
+# =============================================================================
+
+
+async def sample_arguments(
+    conn: asyncpg.Connection, reader: KnowledgeGraphReader
+) -> dict:
+    """Valeurs réelles de la partie, indexées par nom de paramètre"""
+    game_id = reader.game_id
+    cycle = await reader.get_current_cycle(conn)
+    protagonist = await reader.get_protagonist(conn)
+    npc = await conn.fetchrow(
+        """SELECT id, name FROM entities
+           WHERE game_id = $1 AND type = 'character' AND removed_cycle IS NULL
+           ORDER BY name LIMIT 1""",
+        game_id,
+    )
+    message_id = await conn.fetchval(
+        """SELECT id FROM chat_messages WHERE game_id = $1
+           ORDER BY created_at DESC LIMIT 1""",
+        game_id,
+    )
+    fact = await conn.fetchrow(
+        """SELECT cycle, semantic_key FROM facts
+           WHERE game_id = $1 AND semantic_key IS NOT NULL
+           ORDER BY cycle DESC LIMIT 1""",
+        game_id,
+    )
+    description = await conn.fetchval(
+        """SELECT description FROM commitments WHERE game_id = $1
+           ORDER BY created_cycle DESC LIMIT 1""",
+        game_id,
+    )
+    return {
+        "cycle": fact["cycle"] if fact else cycle,
+        "max_cycle": cycle,
+        "from_cycle": cycle,
+        "entity_id": npc["id"],
+        "character_id": npc["id"],
+        "entity_ids": [npc["id"], protagonist["id"]],
+        "source_id": protagonist["id"],
+        "target_id": npc["id"],
+        "name": npc["name"],
+        "names": [npc["name"], ARRIVAL_LOCATION, "Inconnu"],
+        "key": "mood",
+        "location_name": ARRIVAL_LOCATION,
+        "message_id": message_id,
+        "semantic_key": fact["semantic_key"] if fact else "",
+        "description": description or "",
+    }
+
+
+def reader_operations(
+    reader: KnowledgeGraphReader, values: dict
+) -> tuple[dict[str, Callable], list[str]]:
+    """
+    Méthodes publiques du reader prêtes à appeler avec (conn,), et celles
+    dont un paramètre obligatoire n'a pas de valeur connue (ignorées).
+    """
+    operations, skipped = {}, []
+    for name, method in inspect.getmembers(reader, inspect.iscoroutinefunction):
+        if name.startswith("_"):
+            continue
+        kwargs = {}
+        params = list(inspect.signature(method).parameters.values())[1:]
+        for param in params:
+            if param.default is not param.empty:
+                continue
+            source = METHOD_ARGS.get(name, {}).get(param.name, param.name)
+            if source not in values:
+                skipped.append(name)
+                break
+            kwargs[param.name] = values[source]
+        else:
+            operations[f"reader.{name}"] = _bind(method, kwargs)
+    return operations, skipped
+
+
+def _bind(method: Callable, kwargs: dict) -> Callable:
+    async def call(conn: asyncpg.Connection):
+        return await method(conn, **kwargs)
+
+    return call
+
+
+# =============================================================================
+# MESURES
+# =============================================================================
+
+
+async def measure(
+    func: Callable[[], Awaitable], repeat: int, warmup: int
+) -> list[float]:
+    """Durées en ms de repeat appels, après warmup appels non mesurés"""
+    for _ in range(warmup):
+        await func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def _stats(durations: list[float]) -> dict:
+    durations = sorted(durations)
+    return {
+        "p50": round(percentile(durations, 0.50), 3),
+        "p95": round(percentile(durations, 0.95), 3),
+        "max": round(durations[-1], 3),
+    }
+
+
+async def run_suite(
+    pool: asyncpg.Pool, game_id: UUID, repeat: int, warmup: int
+) -> tuple[dict[str, dict], list[str]]:
+    """Toutes les opérations sur une partie: {op: stats}, méthodes ignorées"""
+    reader = KnowledgeGraphReader(pool, game_id)
+    results = {}
+
+    async with pool.acquire() as conn:
+        values = await sample_arguments(conn, reader)
+        operations, skipped = reader_operations(reader, values)
+        for name, call in sorted(operations.items()):
+            durations = await measure(lambda: call(conn), repeat, warmup)
+            results[name] = _stats(durations)
+
+        cycle = values["max_cycle"]
+        current_time = (await reader.get_last_assistant_message(conn) or {}).get(
+            "time"
+        ) or "08h00"
+        builder = ContextBuilder(pool, game_id)
+
+        async def build_context():
+            await builder.build(
+                conn, "Je regarde autour de moi.", cycle, current_time, ARRIVAL_LOCATION
+            )
+
+        results["context_builder.build"] = _stats(
+            await measure(build_context, repeat, warmup)
+        )
+
+        populator = KnowledgeGraphPopulator(pool, game_id)
+
+        async def rollback():
+            tr = conn.transaction()
+            await tr.start()
+            try:
+                await populator.rollback_to_cycle(conn, max(1, cycle // 2))
+            finally:
+                await tr.rollback()
+
+        results["populator.rollback_to_cycle"] = _stats(
+            await measure(rollback, repeat, warmup)
+        )
+
+    game_service = GameService(pool)
+    results["game_service.load_game_state"] = _stats(
+        await measure(lambda: game_service.load_game_state(game_id), repeat, warmup)
+    )
+
+    async def tooltips_cold():
+        tooltip_index.invalidate(game_id)
+        await tooltip_index.get(pool, game_id)
+
+    results["tooltips.cold"] = _stats(await measure(tooltips_cold, repeat, warmup))
+    results["tooltips.warm"] = _stats(
+        await measure(lambda: tooltip_index.get(pool, game_id), repeat, warmup)
+    )
+    tooltip_index.invalidate(game_id)
+    return results, skipped
+
+
+# =============================================================================
+# RAPPORT
+# =============================================================================
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict) -> None:
+    tiers = list(report["tiers"])
+    ops = sorted({op for tier in report["tiers"].values() for op in tier["ops"]})
+    print(f"\nCommit {report['commit'] or '?'}, p50 / p95 en ms")
+    print(f"{'opération':<44}" + "".join(f"{t:>20}" for t in tiers))
+    for op in ops:
+        cells = []
+        for tier in tiers:
+            stats = report["tiers"][tier]["ops"].get(op)
+            cells.append(
+                f"{stats['p50']:>9.2f} /{stats['p95']:>8.2f}" if stats else "-"
+            )
+        print(f"{op:<44}" + "".join(f"{c:>20}" for c in cells))
+
+    for tier, data in report["tiers"].items():
+        if data["skipped"]:
+            print(f"\n[{tier}] Méthodes ignorées: {', '.join(data['skipped'])}")
+
+
+def print_comparison(report: dict, baseline: dict) -> None:
+    """Ratio des p50 (courant / référence) pour les paliers communs"""
+    print(
+        f"\nComparaison avec {baseline.get('commit') or '?'} "
+        f"(p50 courant / référence, '!' au-delà de x{REGRESSION_RATIO})"
+    )
+    for tier, data in report["tiers"].items():
+        before = baseline.get("tiers", {}).get(tier)
+        if not before:
+            continue
+        print(f"\n[{tier}]")
+        for op, stats in sorted(data["ops"].items()):
+            old = before["ops"].get(op)
+            if not old or not old["p50"]:
+                continue
+            ratio = stats["p50"] / old["p50"]
+            flag = " !" if ratio > REGRESSION_RATIO else ""
+            print(
+                f"  {op:<44}{old['p50']:>10.2f} -> {stats['p50']:>10.2f}"
+                f"  x{ratio:.2f}{flag}"
+            )
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+async def run(args: argparse.Namespace) -> dict:
+    pool = await asyncpg.create_pool(
+        args.database_url or get_settings().database_url, min_size=1, max_size=4
+    )
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "tiers": {},
+    }
+    try:
+        if args.game_id:
+            targets = [("game", UUID(args.game_id), False)]
+        else:
+            targets = [(tier, None, True) for tier in args.tiers.split(",")]
+
+        for tier, game_id, generated in targets:
+            counts = {}
+            if generated:
+                start = time.perf_counter()
+                game_id, counts = await generate_game(
+                    pool, TIERS[tier], args.seed, tier
+                )
+                print(
+                    f"[SCALING] {tier}: partie générée en "
+                    f"{time.perf_counter() - start:.1f}s"
+                )
+            try:
+                ops, skipped = await run_suite(pool, game_id, args.repeat, args.warmup)
+            finally:
+                if generated and not args.keep:
+                    await pool.execute("DELETE FROM games WHERE id = $1", game_id)
+            report["tiers"][tier] = {
+                "game_id": str(game_id),
+                "counts": counts,
+                "ops": ops,
+                "skipped": skipped,
+            }
+    finally:
+        await pool.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Passage à l'échelle du KG")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument(
+        "--tiers", default="small,medium,large", help=f"Parmi {', '.join(TIERS)}"
+    )
+    parser.add_argument("--game-id", default=None, help="Partie existante à mesurer")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--keep", action="store_true", help="Conserver les parties générées"
+    )
+    parser.add_argument("--json", default=None, help="Écrire le rapport")
+    parser.add_argument("--compare", default=None, help="Rapport JSON de référence")
+    args = parser.parse_args()
+
+    unknown = set(args.tiers.split(",")) - set(TIERS)
+    if unknown:
+        parser.error(f"Paliers inconnus: {', '.join(sorted(unknown))}")
+
+    # Le populator et le reader journalisent chaque opération
+    logging.getLogger("kg").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nRapport écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+LDVELH - Test de charge de /api/chat
+
+Simule N joueurs concurrents: chacun crée une partie, génère le monde
+(tour init) puis enchaîne des tours de narration. Mesure par tour la
+latence totale (requête -> fin du stream), le délai avant le premier
+chunk (progress pour l'init) et l'arrivée du done, compte les erreurs,
+et échantillonne /metrics pendant le test pour la saturation du pool DB.
+
+À lancer contre un backend branché sur le faux serveur Anthropic
+(aucun appel payant):
+    python -m benchmarks.fake_anthropic --port 8100
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8100 ANTHROPIC_API_KEY=x uvicorn main:app
+
+Usage (depuis backend/):
+    python -m benchmarks.load_test --players 20 --turns 5
+    python -m benchmarks.load_test --players 50 --turns 3 --ramp-up 10 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+import httpx
+
+from utils.validation import percentile
+
+PLAYER_MESSAGES = [
+    "Je regarde autour de moi.",
+    "Je me dirige vers le kiosque à café.",
+    "Je demande mon chemin à la technicienne.",
+    "Je prends le temps d'observer la planète par la baie.",
+    "Je vérifie mon terminal personnel.",
+]
+
+_METRIC_LINE = re.compile(r"^(\w+)(?:\{([^}]*)\})? (\S+)$")
+
+
+@dataclass
+class TurnResult:
+    player: int
+    turn: int
+    mode: str  # init | narration
+    total_s: float = 0.0
+    first_chunk_s: float | None = None
+    done_s: float | None = None
+    error: str | None = None
+
+
+@dataclass
+class PoolSample:
+    at: float
+    in_use: float
+    max_size: float
+    acquire_sum: float
+    acquire_count: float
+
+
+@dataclass
+class LoadReport:
+    turns: list[TurnResult] = field(default_factory=list)
+    pool: list[PoolSample] = field(default_factory=list)
+    duration_s: float = 0.0
+
+
+# =============================================================================
+# TOURS
+# =============================================================================
+
+
+async def run_turn(
+    client: httpx.AsyncClient,
+    game_id: str,
+    message: str,
+    result: TurnResult,
+) -> None:
+    """Un tour de chat: lit le stream SSE jusqu'à sa fermeture"""
+    started = time.perf_counter()
+    first_events = {"chunk", "progress"}
+    try:
+        async with client.stream(
+            "POST", "/api/chat", json={"message": message, "gameId": game_id}
+        ) as response:
+            if response.status_code != 200:
+                result.error = f"HTTP {response.status_code}"
+                return
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                payload = json.loads(line[6:])
+                event = payload.get("type")
+                elapsed = time.perf_counter() - started
+                if event in first_events and result.first_chunk_s is None:
+                    result.first_chunk_s = elapsed
+                elif event == "done":
+                    result.done_s = elapsed
+                elif event == "error":
+                    result.error = payload.get("error") or "error"
+    except httpx.HTTPError as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        result.total_s = time.perf_counter() - started
+    if result.error is None and result.done_s is None:
+        result.error = "stream fermé sans done"
+
+
+async def run_player(
+    client: httpx.AsyncClient,
+    player: int,
+    turns: int,
+    think_time: float,
+    report: LoadReport,
+    delete: bool,
+) -> None:
+    """Session complète d'un joueur: partie, monde, puis turns narrations"""
+    try:
+        response = await client.post("/api/games")
+        response.raise_for_status()
+        game_id = response.json()["gameId"]
+    except httpx.HTTPError as e:
+        report.turns.append(TurnResult(player, 0, "init", error=f"création: {e}"))
+        return
+
+    try:
+        for turn in range(turns + 1):
+            mode = "init" if turn == 0 else "narration"
+            message = (
+                "Commencer"
+                if turn == 0
+                else PLAYER_MESSAGES[(player + turn) % len(PLAYER_MESSAGES)]
+            )
+            result = TurnResult(player, turn, mode)
+            await run_turn(client, game_id, message, result)
+            report.turns.append(result)
+            if result.error and turn == 0:
+                # Sans monde, les tours suivants n'ont pas de sens
+                return
+            await asyncio.sleep(think_time)
+    finally:
+        if delete:
+            try:
+                await client.delete(f"/api/games/{game_id}")
+            except httpx.HTTPError:
+                pass
+
+
+# =============================================================================
+# POOL DB (/metrics)
+# =============================================================================
+
+
+def parse_pool_metrics(text: str) -> PoolSample:
+    """Connexions utilisées/max et cumul d'attente d'acquisition"""
+    values = defaultdict(float)
+    for line in text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        if name == "ldvelh_db_pool_connections":
+            values[labels or ""] = float(value)
+        elif name in (
+            "ldvelh_db_pool_acquire_seconds_sum",
+            "ldvelh_db_pool_acquire_seconds_count",
+        ):
+            values[name] = float(value)
+    return PoolSample(
+        at=time.perf_counter(),
+        in_use=values['state="in_use"'],
+        max_size=values['state="max"'],
+        acquire_sum=values["ldvelh_db_pool_acquire_seconds_sum"],
+        acquire_count=values["ldvelh_db_pool_acquire_seconds_count"],
+    )
+
+
+async def sample_pool(
+    client: httpx.AsyncClient, interval: float, report: LoadReport
+) -> None:
+    while True:
+        try:
+            response = await client.get("/metrics")
+            report.pool.append(parse_pool_metrics(response.text))
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+# =============================================================================
+# RAPPORT
+# =============================================================================
+
+
+def summarize(report: LoadReport) -> dict:
+    by_mode: dict[str, list[TurnResult]] = defaultdict(list)
+    for turn in report.turns:
+        by_mode[turn.mode].append(turn)
+
+    summary = {"duration_s": round(report.duration_s, 2), "modes": {}}
+    for mode, turns in sorted(by_mode.items()):
+        ok = [t for t in turns if t.error is None]
+        summary["modes"][mode] = {
+            "turns": len(turns),
+            "errors": len(turns) - len(ok),
+            "error_rate": round((len(turns) - len(ok)) / len(turns), 4),
+            "total_ms": _percentiles([t.total_s for t in ok]),
+            "first_chunk_ms": _percentiles(
+                [t.first_chunk_s for t in ok if t.first_chunk_s is not None]
+            ),
+            "done_ms": _percentiles([t.done_s for t in ok if t.done_s is not None]),
+        }
+
+    if report.pool:
+        first, last = report.pool[0], report.pool[-1]
+        acquired = last.acquire_count - first.acquire_count
+        saturated = [s for s in report.pool if s.max_size and s.in_use >= s.max_size]
+        summary["pool"] = {
+            "samples": len(report.pool),
+            "max_size": last.max_size,
+            "peak_in_use": max(s.in_use for s in report.pool),
+            "saturated_ratio": round(len(saturated) / len(report.pool), 4),
+            "acquire_avg_ms": round(
+                (last.acquire_sum - first.acquire_sum) / acquired * 1000, 3
+            )
+            if acquired
+            else None,
+        }
+    return summary
+
+
+def _percentiles(values: list[float]) -> dict:
+    """p50/p95/p99 en ms"""
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        f"p{int(q * 100)}": round(percentile(values, q) * 1000, 1)
+        for q in (0.50, 0.95, 0.99)
+    }
+
+
+def _columns(stats: dict) -> str:
+    return " ".join(f"{stats.get(p, '-'):>8}" for p in ("p50", "p95", "p99"))
+
+
+def print_report(report: LoadReport, summary: dict) -> None:
+    print(f"\nDurée: {summary['duration_s']}s, {len(report.turns)} tours")
+    print(
+        f"\n{'mode':<10} {'tours':>6} {'err':>5} | {'total p50':>8} {'p95':>8} "
+        f"{'p99':>8} | {'1er chunk':>8} {'p95':>8} {'p99':>8}"
+    )
+    for mode, stats in summary["modes"].items():
+        print(
+            f"{mode:<10} {stats['turns']:>6} {stats['errors']:>5} | "
+            f"{_columns(stats['total_ms'])} | {_columns(stats['first_chunk_ms'])}"
+        )
+
+    errors = defaultdict(int)
+    for turn in report.turns:
+        if turn.error:
+            errors[turn.error[:80]] += 1
+    if errors:
+        print("\nErreurs:")
+        for message, count in sorted(errors.items(), key=lambda e: -e[1]):
+            print(f"  {count:>5} × {message}")
+
+    pool = summary.get("pool")
+    if pool:
+        print(
+            f"\nPool DB: pic {pool['peak_in_use']:.0f}/{pool['max_size']:.0f} "
+            f"connexions, saturé {pool['saturated_ratio']:.0%} des échantillons, "
+            f"attente moyenne d'acquisition {pool['acquire_avg_ms']} ms"
+        )
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+async def run(args) -> LoadReport:
+    report = LoadReport()
+    limits = httpx.Limits(max_connections=args.players * 2 + 4)
+    timeout = httpx.Timeout(args.timeout, connect=10.0)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=timeout
+    ) as client:
+        sampler = asyncio.create_task(sample_pool(client, args.scrape_interval, report))
+        started = time.perf_counter()
+
+        async def delayed(player: int) -> None:
+            await asyncio.sleep(args.ramp_up * player / max(1, args.players))
+            await run_player(
+                client, player, args.turns, args.think_time, report, args.delete
+            )
+
+        await asyncio.gather(*(delayed(p) for p in range(args.players)))
+        report.duration_s = time.perf_counter() - started
+        sampler.cancel()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge /api/chat")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument(
+        "--turns", type=int, default=3, help="Tours de narration après l'init"
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=5.0, help="Secondes pour lancer les joueurs"
+    )
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--scrape-interval", type=float, default=0.5)
+    parser.add_argument(
+        "--delete", action="store_true", help="Supprimer les parties à la fin"
+    )
+    parser.add_argument("--json", default=None, help="Résultats bruts + résumé")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    summary = summarize(report)
+    print_report(report, summary)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "args": vars(args),
+                    "summary": summary,
+                    "turns": [asdict(t) for t in report.turns],
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"\nRésultats écrits dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+LDVELH - Garde-fou N+1 des loaders de GameService
+
+Exécute chaque loader (sidebar, état, messages...) sur une partie réelle
+via utils.query_counter.CountingPool et affiche le nombre de requêtes,
+le nombre de lignes renvoyées et les requêtes répétées. Une même requête
+répétée au sein d'un loader est le signe d'un N+1.
+
+Usage (depuis backend/):
+    python -m benchmarks.loader_queries [--game-id UUID] [--strict]
+
+Sans --game-id, prend la partie active la plus récemment modifiée.
+--strict: code de sortie 1 si un loader répète une requête.
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+import asyncpg
+
+from config import get_settings
+from services.game_service import GameService
+from utils.query_counter import CountingPool
+
+LOADERS = [
+    "load_npcs",
+    "load_locations",
+    "load_quests",
+    "load_organizations",
+    "load_game_state",
+    "load_world_info",
+    "load_chat_messages",
+    "load_stats_history",
+]
+
+
+def _size(result) -> int:
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 0 if result is None else 1
+
+
+async def run(args: argparse.Namespace) -> int:
+    pool = await asyncpg.create_pool(
+        args.database_url or get_settings().database_url, min_size=1, max_size=4
+    )
+    try:
+        game_id = args.game_id
+        if game_id is None:
+            game_id = await pool.fetchval(
+                """SELECT id FROM games WHERE active = true
+                   ORDER BY updated_at DESC NULLS LAST LIMIT 1"""
+            )
+            if game_id is None:
+                print("[BENCH] Aucune partie active")
+                return 1
+
+        counting = CountingPool(pool)
+        service = GameService(counting)
+        offenders = []
+
+        print(f"[BENCH] Partie {game_id}\n")
+        print(f"{'loader':<22}{'requêtes':>10}{'résultats':>11}  répétées")
+        for name in LOADERS:
+            async with counting.count() as counter:
+                try:
+                    result = await getattr(service, name)(game_id)
+                except ValueError as e:
+                    print(f"{name:<22}{'-':>10}{'-':>11}  ({e})")
+                    continue
+
+            repeated = counter.repeated()
+            print(
+                f"{name:<22}{counter.total:>10}{_size(result):>11}  "
+                f"{sum(repeated.values()) if repeated else '-'}"
+            )
+            for query, n in repeated.items():
+                print(f"    {n}x {query[:100]}")
+            if repeated:
+                offenders.append(name)
+
+        if offenders:
+            print(f"\n[BENCH] N+1 suspect: {', '.join(offenders)}")
+        return 1 if offenders and args.strict else 0
+    finally:
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nombre de requêtes par loader")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--game-id", type=UUID, default=None)
+    parser.add_argument("--strict", action="store_true")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+LDVELH - Benchmark normalisation des valeurs LLM
+
+Compare l'ancienne normalisation (lower/strip/replace puis dict.get sur
+le dictionnaire de synonymes, à chaque appel) et les tables compilées de
+schema.normalizer (une seule map par enum + mémo LRU), sur un corpus de
+valeurs réalistes: synonymes avec casse, espaces et tirets variés, tirés
+avec répétition comme dans une extraction.
+
+Mesure aussi la validation complète (WorldGeneration) de
+prompts/example_world_generation.json.
+
+Usage (depuis backend/):
+    python -m benchmarks.normalization --values 20000 --rounds 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+from schema import WorldGeneration, synonyms
+from schema.normalizer import CompiledNormalizer
+
+TABLES = {
+    "relation_type": synonyms.RELATION_TYPE_SYNONYMS,
+    "fact_type": synonyms.FACT_TYPE_SYNONYMS,
+    "entity_type": synonyms.ENTITY_TYPE_SYNONYMS,
+    "arc_domain": synonyms.ARC_DOMAIN_SYNONYMS,
+    "attribute": {
+        **synonyms.SHARED_ATTRIBUTE_SYNONYMS,
+        **synonyms.CHARACTER_ATTRIBUTE_SYNONYMS,
+    },
+}
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "prompts" / "example_world_generation.json"
+
+
+def _legacy_lookup(value: str, table: dict[str, str], valid: set[str]) -> str | None:
+    """Chemin d'origine de _normalize_enum_value"""
+    key = str(value).lower().strip().replace(" ", "_").replace("-", "_")
+    result = table.get(key)
+    if result is None and key in valid:
+        return key
+    return result
+
+
+def _corpus(table: dict[str, str], size: int, rng: random.Random) -> list[str]:
+    keys = list(table)
+    # Peu de valeurs distinctes, beaucoup de répétitions (comme le LLM)
+    vocabulary = []
+    for key in rng.sample(keys, min(len(keys), 150)):
+        word = key.replace("_", rng.choice([" ", "-", "_"]))
+        vocabulary.append(rng.choice([word, word.title(), word.upper(), f" {word} "]))
+    return [rng.choice(vocabulary) for _ in range(size)]
+
+
+def _time(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_lookups(values: int, rounds: int) -> None:
+    rng = random.Random(42)
+    print(f"{'table':<16}{'legacy µs':>12}{'compilé µs':>12}{'gain':>8}{'mémo':>14}")
+    for name, table in TABLES.items():
+        corpus = _corpus(table, values, rng)
+        valid = set(table.values())
+        compiled = CompiledNormalizer(table, valid)
+
+        def legacy():
+            for value in corpus:
+                _legacy_lookup(value, table, valid)
+
+        def fast():
+            lookup = compiled.lookup
+            for value in corpus:
+                lookup(value)
+
+        # Les deux chemins doivent donner le même résultat
+        for value in corpus:
+            assert compiled.lookup(value) == _legacy_lookup(value, table, valid), value
+
+        t_legacy = _time(legacy, rounds) / values * 1e6
+        t_fast = _time(fast, rounds) / values * 1e6
+        info = compiled.cache_info()
+        print(
+            f"{name:<16}{t_legacy:>12.3f}{t_fast:>12.3f}{t_legacy / t_fast:>7.1f}x"
+            f"{f'{info.hits}/{info.hits + info.misses}':>14}"
+        )
+
+
+def bench_validation(rounds: int) -> None:
+    data = json.loads(EXAMPLE.read_text(encoding="utf-8"))
+    iterations = 50
+    elapsed = _time(
+        lambda: [WorldGeneration.model_validate(data) for _ in range(iterations)], rounds
+    )
+    print(
+        f"\nWorldGeneration.model_validate (exemple): "
+        f"{elapsed / iterations * 1000:.2f} ms / validation"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark normalisation")
+    parser.add_argument("--values", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    bench_lookups(args.values, args.rounds)
+    bench_validation(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
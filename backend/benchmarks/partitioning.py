@@ -0,0 +1,288 @@
+"""
+LDVELH - Benchmark partitionnement (attributes)
+
+Compare la table attributes classique et sa variante partitionnée par
+hash de game_id (migrations/002_partition_by_game.sql) sur un volume
+synthétique: profondeur et taille des index, latence de lecture,
+suppression d'une partie et coût du VACUUM après churn.
+
+Travaille dans deux schémas jetables (bench_flat, bench_part), sans
+toucher aux tables de l'application.
+
+Usage (depuis backend/):
+    python -m benchmarks.partitioning --rows 1000000 --games 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from uuid import UUID
+
+import asyncpg
+
+from config import get_settings
+
+FLAT = "bench_flat"
+PART = "bench_part"
+
+KEYS = ["mood", "energy", "morale", "health", "credits", "description", "occupation"]
+
+_COLUMNS = """
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL,
+  entity_id UUID NOT NULL,
+  key VARCHAR(100) NOT NULL,
+  value TEXT NOT NULL,
+  details JSONB,
+  known_by_protagonist BOOLEAN DEFAULT true,
+  start_cycle INTEGER NOT NULL,
+  end_cycle INTEGER,
+  created_at TIMESTAMPTZ DEFAULT now()
+"""
+
+_INDEXES = [
+    "CREATE INDEX ON {t}(entity_id)",
+    "CREATE INDEX ON {t}(entity_id, key)",
+    "CREATE INDEX ON {t}(entity_id) WHERE end_cycle IS NULL",
+    "CREATE INDEX ON {t}(game_id, key) WHERE end_cycle IS NULL",
+]
+
+
+def _uuid(prefix: int, n: int) -> UUID:
+    return UUID(f"{prefix:08x}-0000-0000-0000-{n:012x}")
+
+
+# =============================================================================
+# SETUP
+# =============================================================================
+
+
+async def _create_tables(conn: asyncpg.Connection, partitions: int) -> None:
+    for schema in (FLAT, PART):
+        await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {schema}")
+
+    await conn.execute(f"CREATE TABLE {FLAT}.attributes ({_COLUMNS})")
+    await conn.execute(
+        f"CREATE TABLE {PART}.attributes ({_COLUMNS}) PARTITION BY HASH (game_id)"
+    )
+    for i in range(partitions):
+        await conn.execute(
+            f"CREATE TABLE {PART}.attributes_p{i} PARTITION OF {PART}.attributes "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+        )
+
+
+async def _populate(conn: asyncpg.Connection, rows: int, games: int) -> None:
+    """Même jeu de données dans les deux tables (généré côté serveur)"""
+    insert = """
+        INSERT INTO {t} (game_id, entity_id, key, value, start_cycle, end_cycle)
+        SELECT
+          ('00000001-0000-0000-0000-' || lpad(to_hex(i % $2), 12, '0'))::uuid,
+          ('00000002-0000-0000-0000-' || lpad(to_hex(i % ($2 * 40)), 12, '0'))::uuid,
+          ($3::text[])[1 + i % array_length($3::text[], 1)],
+          md5(i::text),
+          1 + i / ($2 * 40),
+          CASE WHEN i % 5 = 0 THEN NULL ELSE 2 + i / ($2 * 40) END
+        FROM generate_series(0, $1 - 1) AS i
+    """
+    for schema in (FLAT, PART):
+        start = time.perf_counter()
+        await conn.execute(insert.format(t=f"{schema}.attributes"), rows, games, KEYS)
+        print(f"  {schema}: {rows} lignes en {time.perf_counter() - start:.1f}s")
+
+    await conn.execute(f"ALTER TABLE {FLAT}.attributes ADD PRIMARY KEY (id)")
+    await conn.execute(f"ALTER TABLE {PART}.attributes ADD PRIMARY KEY (game_id, id)")
+    await conn.execute(f"CREATE INDEX ON {FLAT}.attributes(game_id)")
+    for schema in (FLAT, PART):
+        for ddl in _INDEXES:
+            await conn.execute(ddl.format(t=f"{schema}.attributes"))
+        await conn.execute(f"VACUUM ANALYZE {schema}.attributes")
+
+
+# =============================================================================
+# MESURES
+# =============================================================================
+
+
+async def _leaf_tables(conn: asyncpg.Connection, schema: str) -> list[str]:
+    rows = await conn.fetch(
+        """SELECT c.oid::regclass::text AS name FROM pg_class c
+           JOIN pg_namespace n ON n.oid = c.relnamespace
+           WHERE n.nspname = $1 AND c.relkind = 'r'""",
+        schema,
+    )
+    return [r["name"] for r in rows]
+
+
+async def _index_stats(
+    conn: asyncpg.Connection, schema: str, has_pageinspect: bool
+) -> dict:
+    """Taille totale des index et profondeur max des B-tree (bt_metap.level)"""
+    rows = await conn.fetch(
+        """SELECT i.indexrelid::regclass::text AS name,
+                  pg_relation_size(i.indexrelid) AS size
+           FROM pg_index i
+           JOIN pg_class c ON c.oid = i.indrelid
+           JOIN pg_namespace n ON n.oid = c.relnamespace
+           WHERE n.nspname = $1 AND c.relkind = 'r'""",
+        schema,
+    )
+    depth = None
+    if has_pageinspect:
+        levels = [
+            await conn.fetchval("SELECT level FROM bt_metap($1)", r["name"])
+            for r in rows
+        ]
+        depth = max(levels) + 1 if levels else None
+
+    return {
+        "index_count": len(rows),
+        "index_mb": sum(r["size"] for r in rows) / 1024 / 1024,
+        "btree_depth": depth,
+    }
+
+
+async def _lookup_latency(
+    conn: asyncpg.Connection, schema: str, games: int, samples: int
+) -> dict:
+    """Lecture type get_attribute (game_id + entity_id + key, version active)"""
+    stmt = await conn.prepare(
+        f"""SELECT value FROM {schema}.attributes
+            WHERE game_id = $1 AND entity_id = $2 AND key = $3 AND end_cycle IS NULL"""
+    )
+    rng = random.Random(42)
+    timings = []
+    for _ in range(samples):
+        entity = rng.randrange(games * 40)
+        args = (_uuid(1, entity % games), _uuid(2, entity), rng.choice(KEYS))
+        start = time.perf_counter()
+        await stmt.fetch(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    plan = await conn.fetchval(
+        f"""EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+            SELECT value FROM {schema}.attributes
+            WHERE game_id = $1 AND entity_id = $2 AND key = $3 AND end_cycle IS NULL""",
+        _uuid(1, 0),
+        _uuid(2, 0),
+        KEYS[0],
+    )
+    buffers = _plan_buffers(plan)
+
+    timings.sort()
+    return {
+        "lookup_p50_ms": statistics.median(timings),
+        "lookup_p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "lookup_buffers": buffers,
+    }
+
+
+def _plan_buffers(plan) -> int:
+    data = json.loads(plan) if isinstance(plan, str) else plan
+    root = data[0]["Plan"]
+    return root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0)
+
+
+async def _churn_and_vacuum(
+    conn: asyncpg.Connection, schema: str, games: int, churn_games: int
+) -> dict:
+    """Supprime churn_games parties puis mesure DELETE et VACUUM"""
+    start = time.perf_counter()
+    for g in range(churn_games):
+        await conn.execute(
+            f"DELETE FROM {schema}.attributes WHERE game_id = $1", _uuid(1, g)
+        )
+    delete_ms = (time.perf_counter() - start) * 1000 / max(churn_games, 1)
+
+    # VACUUM table par table (ce que fait l'autovacuum)
+    vacuum_timings = []
+    for table in await _leaf_tables(conn, schema):
+        dead = await conn.fetchval(
+            "SELECT n_dead_tup FROM pg_stat_user_tables WHERE relid = $1::regclass",
+            table,
+        )
+        start = time.perf_counter()
+        await conn.execute(f"VACUUM {table}")
+        vacuum_timings.append(((time.perf_counter() - start) * 1000, dead or 0))
+
+    touched = [ms for ms, dead in vacuum_timings if dead]
+    return {
+        "delete_game_ms": delete_ms,
+        "vacuum_total_ms": sum(ms for ms, _ in vacuum_timings),
+        "vacuum_max_table_ms": max((ms for ms, _ in vacuum_timings), default=0),
+        "tables_with_dead_tuples": len(touched),
+    }
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def _print_report(results: dict[str, dict]) -> None:
+    keys = list(next(iter(results.values())).keys())
+    print(f"\n{'mesure':<26}" + "".join(f"{name:>16}" for name in results))
+    for key in keys:
+        line = f"{key:<26}"
+        for values in results.values():
+            value = values[key]
+            if value is None:
+                line += f"{'n/a':>16}"
+            elif isinstance(value, float):
+                line += f"{value:>16.2f}"
+            else:
+                line += f"{value:>16}"
+        print(line)
+
+
+async def run(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.database_url or get_settings().database_url)
+    try:
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pageinspect")
+            has_pageinspect = True
+        except asyncpg.PostgresError:
+            print("[BENCH] pageinspect indisponible: profondeur des index non mesurée")
+            has_pageinspect = False
+
+        print(f"[BENCH] Création ({args.partitions} partitions)...")
+        await _create_tables(conn, args.partitions)
+        print(f"[BENCH] Remplissage ({args.rows} lignes, {args.games} parties)...")
+        await _populate(conn, args.rows, args.games)
+
+        results = {}
+        for label, schema in (("classique", FLAT), ("partitionnée", PART)):
+            stats = await _index_stats(conn, schema, has_pageinspect)
+            stats.update(await _lookup_latency(conn, schema, args.games, args.samples))
+            stats.update(
+                await _churn_and_vacuum(conn, schema, args.games, args.churn_games)
+            )
+            results[label] = stats
+
+        _print_report(results)
+
+        if not args.keep:
+            for schema in (FLAT, PART):
+                await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark partitionnement par game_id")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--churn-games", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Conserve les schémas")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+LDVELH - Benchmark validation des références (WorldGeneration)
+
+Compare l'ancien validate_references_soft (jusqu'à 5 passes, registre des
+noms reconstruit et monde entier re-parcouru à chaque passe) et la
+version actuelle (une seule passe: aucune correction ne retire de nom,
+le registre ne change pas en cours de route), sur un monde
+synthétique de --entities entités dont --invalid-ratio des références
+pointent vers des noms inconnus.
+
+Le monde est assemblé par benchmarks.world_fixture (entités de
+l'exemple de génération dupliquées et renommées, model_construct).
+Les deux chemins doivent produire le même monde.
+
+Usage (depuis backend/):
+    python -m benchmarks.reference_validation --entities 1000 --rounds 5
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from benchmarks.world_fixture import assemble_world, clones, load_example
+from schema import WorldGeneration
+
+# Répartition des entités du monde synthétique
+SHARES = {"characters": 0.4, "locations": 0.3, "organizations": 0.1, "inventory": 0.2}
+
+
+# =============================================================================
+# ANCIEN ALGORITHME (référence)
+# =============================================================================
+
+
+def _legacy_validate(world: WorldGeneration) -> None:
+    """Boucle multi-passes d'origine (journalisation retirée)"""
+    for _ in range(5):
+        changed = False
+        known = world._build_name_registry()
+
+        for char in world.characters:
+            if char.workplace_ref and char.workplace_ref.lower() not in known:
+                char.workplace_ref = None
+                changed = True
+            if char.residence_ref and char.residence_ref.lower() not in known:
+                char.residence_ref = None
+                changed = True
+        for loc in world.locations:
+            if loc.parent_location_ref and loc.parent_location_ref.lower() not in known:
+                loc.parent_location_ref = None
+                changed = True
+        for org in world.organizations:
+            if org.headquarters_ref and org.headquarters_ref.lower() not in known:
+                org.headquarters_ref = None
+                changed = True
+
+        valid_rels = [
+            rel
+            for rel in world.initial_relations
+            if rel.source_ref.lower() in known and rel.target_ref.lower() in known
+        ]
+        if len(valid_rels) != len(world.initial_relations):
+            world.initial_relations = valid_rels
+            changed = True
+
+        valid_arcs = []
+        for arc in world.narrative_arcs:
+            valid = [e for e in arc.involved_entities if e.lower() in known]
+            if len(valid) != len(arc.involved_entities):
+                changed = True
+                if not valid:
+                    continue
+                arc.involved_entities = valid
+            valid_arcs.append(arc)
+        world.narrative_arcs = valid_arcs
+
+        if world.arrival_event.arrival_location_ref.lower() not in known:
+            fallback = world._find_arrival_location_fallback()
+            if fallback:
+                world.arrival_event.arrival_location_ref = fallback
+                changed = True
+        first_npc = world.arrival_event.first_npc_encountered
+        if first_npc and first_npc.lower() not in known:
+            world.arrival_event.first_npc_encountered = None
+            changed = True
+
+        if not changed:
+            break
+
+
+# =============================================================================
+# MONDE SYNTHÉTIQUE
+# =============================================================================
+
+
+def build_world(entities: int, invalid_ratio: float, seed: int = 42) -> WorldGeneration:
+    rng = random.Random(seed)
+    data = load_example()
+    counts = {field: max(1, int(entities * share)) for field, share in SHARES.items()}
+
+    locations = clones(data["locations"], counts["locations"], "name", "Lieu")
+    location_names = [loc["name"] for loc in locations]
+    characters = clones(data["characters"], counts["characters"], "name", "PNJ")
+    character_names = [char["name"] for char in characters]
+    organizations = clones(data["organizations"], counts["organizations"], "name", "Org")
+    inventory = clones(data["inventory"], counts["inventory"], "name", "Objet")
+    all_names = location_names + character_names + [org["name"] for org in organizations]
+
+    def ref(pool: list[str]) -> str:
+        if rng.random() < invalid_ratio:
+            return f"Fantôme {rng.randrange(1000)}"
+        return rng.choice(pool)
+
+    for char in characters:
+        char["workplace_ref"] = ref(location_names)
+        char["residence_ref"] = ref(location_names)
+    for loc in locations:
+        loc["parent_location_ref"] = ref(location_names) if rng.random() < 0.5 else None
+    for org in organizations:
+        org["headquarters_ref"] = ref(location_names)
+
+    relation = data["initial_relations"][0]
+    relations = [
+        {**relation, "source_ref": ref(character_names), "target_ref": ref(all_names)}
+        for _ in range(2 * entities)
+    ]
+    arc = data["narrative_arcs"][0]
+    arcs = [
+        {**arc, "title": f"Arc {i:04d}", "involved_entities": [ref(all_names) for _ in range(3)]}
+        for i in range(entities // 5)
+    ]
+    arrival = {**data["arrival_event"], "first_npc_encountered": ref(character_names)}
+
+    return assemble_world(
+        data,
+        characters=characters,
+        locations=locations,
+        organizations=organizations,
+        inventory=inventory,
+        narrative_arcs=arcs,
+        initial_relations=relations,
+        arrival_event=arrival,
+    )
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _time(world: WorldGeneration, fn, rounds: int) -> tuple[float, WorldGeneration]:
+    timings = []
+    for _ in range(rounds):
+        copy = world.model_copy(deep=True)
+        start = time.perf_counter()
+        fn(copy)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), copy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark validation des références")
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.1)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # Une ligne de warning par référence invalide: hors mesure
+    logging.getLogger("schema.world_generation").setLevel(logging.ERROR)
+
+    world = build_world(args.entities, args.invalid_ratio)
+    print(
+        f"[BENCH] {args.entities} entités, {len(world.initial_relations)} relations, "
+        f"{len(world.narrative_arcs)} arcs, {args.invalid_ratio:.0%} de références invalides"
+    )
+
+    t_legacy, legacy = _time(world, _legacy_validate, args.rounds)
+    t_single, single = _time(world, lambda w: w.validate_references_soft(), args.rounds)
+
+    if legacy.model_dump() != single.model_dump():
+        raise SystemExit("[BENCH] Résultats différents entre les deux algorithmes")
+
+    print(f"{'multi-passes':<16}{t_legacy * 1000:>10.2f} ms")
+    print(f"{'une passe':<16}{t_single * 1000:>10.2f} ms  ({t_legacy / t_single:.1f}x)")
+    print(
+        f"Après filtrage: {len(single.initial_relations)} relations, "
+        f"{len(single.narrative_arcs)} arcs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,616 @@
+"""
+LDVELH - Rejeu de tours enregistrés (benchmarks de régression)
+
+Rejoue les tours capturés avec LLM_RECORD_FILE (utils.llm_recording):
+chaque partie enregistrée est recréée, puis ses tours repassent dans
+_handle_chat, en process, avec un LLMService dont le client renvoie les
+sorties enregistrées (stream du narrateur, réponse de chaque extracteur)
+au lieu d'appeler l'API. Le reste du pipeline tourne pour de vrai:
+contexte, parsing, validation, population du KG, extraction, SSE.
+
+--speed 1 reproduit le timing d'origine (délai de chaque delta, latence
+des extracteurs), --speed 0 (défaut) rejoue à vitesse max pour mesurer le
+coût propre du pipeline. Les pauses du joueur entre deux tours ne sont pas
+rejouées. Seules les parties enregistrées depuis leur création (premier
+tour = génération du monde) sont rejouables.
+
+L'état final du KG de chaque partie (sans UUID ni horodatage) peut être
+sauvegardé puis comparé à une autre exécution, ou à la partie d'origine
+(commande snapshot, tant qu'elle n'a pas avancé depuis l'enregistrement).
+
+Usage (depuis backend/):
+    LLM_RECORD_FILE=turns.jsonl uvicorn main:app
+    python -m benchmarks.replay run turns.jsonl --state-out before.json
+    python -m benchmarks.replay run turns.jsonl --compare-state before.json
+    python -m benchmarks.replay run turns.jsonl --speed 1 --json out.json
+    python -m benchmarks.replay snapshot <game_id> --out original.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from types import SimpleNamespace
+from uuid import UUID
+
+import asyncpg
+from fastapi import BackgroundTasks
+
+from api.routes import ChatRequest, _handle_chat
+from api.streaming import SSEWriter
+from benchmarks.kg_scaling import git_commit
+from config import get_settings
+from services import llm_service
+from services.game_service import GameService
+from services.llm_service import LLMService
+from utils.llm_recording import RECORD_FORMAT
+from utils.validation import percentile
+
+# Exemples de lignes différentes affichés par section
+DIFF_EXAMPLES = 3
+
+
+@dataclass
+class RecordedGame:
+    game_id: str
+    turns: list[dict]
+
+
+@dataclass
+class TurnResult:
+    game: str
+    turn: int
+    mode: str  # init | narration
+    recorded_s: float
+    total_s: float = 0.0
+    first_chunk_s: float | None = None
+    done_s: float | None = None
+    error: str | None = None
+    missing: list[str] = field(default_factory=list)  # Appels non enregistrés
+    unused: list[str] = field(default_factory=list)  # Sorties non consommées
+
+
+def turn_mode(turn: dict) -> str:
+    if any(call["kind"] == "world_builder" for call in turn["calls"]):
+        return "init"
+    return "narration"
+
+
+def load_recordings(path: str) -> tuple[list[RecordedGame], list[str]]:
+    """Tours groupés par partie dans l'ordre, et parties non rejouables"""
+    turns_by_game: dict[str, list[dict]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            turn = json.loads(line)
+            if turn.get("format") != RECORD_FORMAT:
+                raise ValueError(
+                    f"Format d'enregistrement inconnu: {turn.get('format')}"
+                )
+            turns_by_game[turn["game_id"]].append(turn)
+
+    games, skipped = [], []
+    for game_id, turns in turns_by_game.items():
+        turns.sort(key=lambda t: t["recorded_at"])
+        if turn_mode(turns[0]) == "init":
+            games.append(RecordedGame(game_id, turns))
+        else:
+            skipped.append(game_id)
+    return games, skipped
+
+
+# =============================================================================
+# FAUX LLM (sorties enregistrées)
+# =============================================================================
+
+
+class ReplayError(Exception):
+    """Appel sans sortie enregistrée, ou en erreur lors de l'enregistrement"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class TurnCalls:
+    """Sorties enregistrées d'un tour, consommées par type d'appel"""
+
+    def __init__(self, calls: list[dict]):
+        self.pending: dict[str, deque[dict]] = defaultdict(deque)
+        for call in calls:
+            self.pending[call["kind"]].append(call)
+        self.missing: list[str] = []
+
+    def next(self, kind: str) -> dict:
+        if not self.pending[kind]:
+            self.missing.append(kind)
+            raise ReplayError(f"Aucune sortie enregistrée pour '{kind}'")
+        return self.pending[kind].popleft()
+
+    def unused(self) -> list[str]:
+        return [kind for kind, calls in self.pending.items() for _ in calls]
+
+
+# Tour rejoué (hérité par les tâches du tour) et type de l'appel en cours
+_current_calls: ContextVar[TurnCalls | None] = ContextVar(
+    "ldvelh_replay_calls", default=None
+)
+_expected_kind: ContextVar[str] = ContextVar("ldvelh_replay_kind", default="?")
+
+
+@contextmanager
+def _expecting(kind: str):
+    token = _expected_kind.set(kind)
+    try:
+        yield
+    finally:
+        _expected_kind.reset(token)
+
+
+def _usage(call: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        **{"input_tokens": 0, "output_tokens": 0, **(call["usage"] or {})}
+    )
+
+
+class _ReplayStream:
+    """messages.stream(): deltas enregistrés, à leur cadence d'origine"""
+
+    def __init__(self, call: dict, speed: float):
+        self.call = call
+        self.speed = speed
+
+    async def __aenter__(self) -> "_ReplayStream":
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+    async def __aiter__(self):
+        call = self.call
+        deltas = call["deltas"] or []
+        if not deltas and call["text"]:
+            deltas = [(call["latency_s"] or 0.0, call["text"])]
+        started = time.perf_counter()
+        for offset, text in deltas:
+            if self.speed > 0:
+                delay = offset / self.speed - (time.perf_counter() - started)
+                await asyncio.sleep(max(0.0, delay))
+            else:
+                # Rend la main comme le ferait une lecture réseau
+                await asyncio.sleep(0)
+            yield SimpleNamespace(
+                type="content_block_delta", delta=SimpleNamespace(text=text)
+            )
+        if call["text"] is None:
+            raise ReplayError(f"Stream '{call['kind']}' interrompu à l'enregistrement")
+
+    async def get_final_message(self) -> SimpleNamespace:
+        return SimpleNamespace(usage=_usage(self.call))
+
+
+class _ReplayMessages:
+    def __init__(self, speed: float):
+        self.speed = speed
+
+    def _next(self) -> dict:
+        calls = _current_calls.get()
+        if calls is None:
+            raise ReplayError("Appel LLM hors d'un tour rejoué")
+        return calls.next(_expected_kind.get())
+
+    def stream(self, **kwargs) -> _ReplayStream:
+        return _ReplayStream(self._next(), self.speed)
+
+    async def create(self, **kwargs) -> SimpleNamespace:
+        call = self._next()
+        if self.speed > 0 and call["latency_s"]:
+            await asyncio.sleep(call["latency_s"] / self.speed)
+        if call["text"] is None:
+            raise ReplayError(f"Appel '{call['kind']}' en erreur à l'enregistrement")
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=call["text"])],
+            usage=_usage(call),
+        )
+
+
+class ReplayLLMService(LLMService):
+    """
+    LLMService dont le client rejoue les sorties enregistrées. Chaque
+    méthode annonce le type d'appel (narrator, summary...) pour que le
+    client serve la bonne sortie, y compris entre extracteurs parallèles.
+    """
+
+    def __init__(self, speed: float = 0.0):
+        # Pas de super().__init__(): aucun client anthropic
+        self.settings = get_settings()
+        self.client = SimpleNamespace(messages=_ReplayMessages(speed))
+        self._api_error = ReplayError
+
+    async def stream_narration(
+        self, system_prompt, user_message, sse_writer, is_init_mode=False, **kwargs
+    ) -> None:
+        with _expecting("world_builder" if is_init_mode else "narrator"):
+            await super().stream_narration(
+                system_prompt,
+                user_message,
+                sse_writer,
+                is_init_mode=is_init_mode,
+                **kwargs,
+            )
+
+    async def extract_light(self, system_prompt, user_message, extractor="light"):
+        with _expecting(extractor):
+            return await super().extract_light(system_prompt, user_message, extractor)
+
+    async def extract_heavy(self, system_prompt, user_message, extractor="heavy"):
+        with _expecting(extractor):
+            return await super().extract_heavy(system_prompt, user_message, extractor)
+
+
+# =============================================================================
+# REJEU
+# =============================================================================
+
+
+async def _drain(writer: SSEWriter, started: float, result: TurnResult) -> None:
+    """Consomme le stream SSE comme un client (premier chunk, done, erreur)"""
+    async for frame in writer.iterate():
+        _, _, data = frame.partition(b"data: ")
+        if not data:
+            continue
+        payload = json.loads(data)
+        event = payload.get("type")
+        elapsed = time.perf_counter() - started
+        if event in ("chunk", "progress") and result.first_chunk_s is None:
+            result.first_chunk_s = elapsed
+        elif event == "done":
+            result.done_s = elapsed
+        elif event == "error" and result.error is None:
+            result.error = payload.get("error") or "error"
+
+
+async def replay_turn(
+    pool: asyncpg.Pool, game_id: UUID, index: int, turn: dict
+) -> TurnResult:
+    settings = get_settings()
+    result = TurnResult(turn["game_id"], index, turn_mode(turn), turn["duration_s"])
+    request = ChatRequest.model_validate({**turn["request"], "gameId": str(game_id)})
+    writer = SSEWriter.for_client(
+        request.streamFlushMs,
+        request.streamFlushBytes,
+        settings.sse_chunk_flush_ms,
+        settings.sse_chunk_flush_bytes,
+    )
+    calls = TurnCalls(turn["calls"])
+    token = _current_calls.set(calls)
+    started = time.perf_counter()
+    try:
+        drain = asyncio.create_task(_drain(writer, started, result))
+        await _handle_chat(request, writer, pool, settings, BackgroundTasks())
+        await drain
+    finally:
+        _current_calls.reset(token)
+    result.total_s = time.perf_counter() - started
+    result.missing = calls.missing
+    result.unused = calls.unused()
+    return result
+
+
+async def replay_game(
+    pool: asyncpg.Pool, game: RecordedGame, keep: bool
+) -> tuple[list[TurnResult], dict]:
+    """Rejoue une partie dans une nouvelle partie; retourne tours et état KG"""
+    game_service = GameService(pool)
+    game_id = await game_service.create_game()
+    try:
+        results = [
+            await replay_turn(pool, game_id, index, turn)
+            for index, turn in enumerate(game.turns)
+        ]
+        async with pool.acquire() as conn:
+            state = await kg_snapshot(conn, game_id)
+    finally:
+        if not keep:
+            await game_service.delete_game(game_id)
+    return results, state
+
+
+# =============================================================================
+# ÉTAT DU KG
+# =============================================================================
+
+# Lignes comparables d'une exécution à l'autre: noms à la place des UUID,
+# pas d'horodatage ni d'id généré
+SNAPSHOT_QUERIES = {
+    "entities": """
+        SELECT type::text, name, known_by_protagonist, created_cycle, removed_cycle
+        FROM entities WHERE game_id = $1""",
+    "attributes": """
+        SELECT e.type::text, e.name, a.key, a.value, a.known_by_protagonist,
+               a.start_cycle, a.end_cycle
+        FROM attributes a JOIN entities e ON e.id = a.entity_id
+        WHERE a.game_id = $1""",
+    "relations": """
+        SELECT s.name, t.name, r.type::text, r.start_cycle, r.end_cycle,
+               r.known_by_protagonist
+        FROM relations r
+        JOIN entities s ON s.id = r.source_id
+        JOIN entities t ON t.id = r.target_id
+        WHERE r.game_id = $1""",
+    "facts": """
+        SELECT f.cycle, f.time, f.type::text, f.description, f.importance,
+               f.semantic_key, l.name,
+               (SELECT array_agg(
+                          e.name || '/' || fp.role::text
+                          ORDER BY e.name, fp.role::text)
+                FROM fact_participants fp JOIN entities e ON e.id = fp.entity_id
+                WHERE fp.fact_id = f.id)
+        FROM facts f LEFT JOIN entities l ON l.id = f.location_id
+        WHERE f.game_id = $1""",
+    "commitments": """
+        SELECT type::text, description, created_cycle, deadline_cycle, resolved
+        FROM commitments WHERE game_id = $1""",
+    "events": """
+        SELECT type::text, title, planned_cycle, time, completed, cancelled
+        FROM events WHERE game_id = $1""",
+    "messages": """
+        SELECT m.role, m.cycle, m.time, m.date, l.name, md5(m.content), m.summary
+        FROM chat_messages m LEFT JOIN entities l ON l.id = m.location_id
+        WHERE m.game_id = $1""",
+    "cycle_summaries": """
+        SELECT cycle, date, summary FROM cycle_summaries WHERE game_id = $1""",
+    "gauges": """
+        SELECT energy::float8, morale::float8, health::float8, credits,
+               updated_cycle
+        FROM protagonist_gauges WHERE game_id = $1""",
+}
+
+
+def _row_key(row: list) -> str:
+    return json.dumps(row, ensure_ascii=False, default=str)
+
+
+async def kg_snapshot(conn: asyncpg.Connection, game_id: UUID) -> dict[str, list]:
+    """État comparable du KG d'une partie, lignes triées par section"""
+    state = {}
+    for section, query in SNAPSHOT_QUERIES.items():
+        rows = [json.loads(_row_key(list(r))) for r in await conn.fetch(query, game_id)]
+        state[section] = sorted(rows, key=_row_key)
+    return state
+
+
+def compare_snapshots(expected: dict, actual: dict) -> dict[str, dict]:
+    """Par section: lignes attendues absentes et lignes en trop"""
+    diff = {}
+    for section in sorted(set(expected) | set(actual)):
+        before = Counter(_row_key(r) for r in expected.get(section, []))
+        after = Counter(_row_key(r) for r in actual.get(section, []))
+        missing = list((before - after).elements())
+        extra = list((after - before).elements())
+        if missing or extra:
+            diff[section] = {"missing": missing, "extra": extra}
+    return diff
+
+
+# =============================================================================
+# RAPPORT
+# =============================================================================
+
+
+def _percentiles(values: list[float]) -> dict:
+    """p50/p95 en ms"""
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        f"p{int(q * 100)}": round(percentile(values, q) * 1000, 1) for q in (0.50, 0.95)
+    }
+
+
+def summarize(results: list[TurnResult], duration_s: float) -> dict:
+    by_mode: dict[str, list[TurnResult]] = defaultdict(list)
+    for result in results:
+        by_mode[result.mode].append(result)
+
+    summary = {"duration_s": round(duration_s, 2), "modes": {}}
+    for mode, turns in sorted(by_mode.items()):
+        ok = [t for t in turns if t.error is None]
+        summary["modes"][mode] = {
+            "turns": len(turns),
+            "errors": len(turns) - len(ok),
+            "missing_calls": sum(len(t.missing) for t in turns),
+            "unused_calls": sum(len(t.unused) for t in turns),
+            "total_ms": _percentiles([t.total_s for t in ok]),
+            "recorded_ms": _percentiles([t.recorded_s for t in turns]),
+            "first_chunk_ms": _percentiles(
+                [t.first_chunk_s for t in ok if t.first_chunk_s is not None]
+            ),
+        }
+    return summary
+
+
+def print_report(results: list[TurnResult], summary: dict) -> None:
+    print(f"\nDurée: {summary['duration_s']}s, {len(results)} tours rejoués")
+    print(
+        f"\n{'mode':<10} {'tours':>6} {'err':>5} {'manq':>5} {'inut':>5} | "
+        f"{'p50':>8} {'p95':>8} | {'1er chunk':>9} | {'enreg. p50':>10}"
+    )
+    for mode, stats in summary["modes"].items():
+        print(
+            f"{mode:<10} {stats['turns']:>6} {stats['errors']:>5} "
+            f"{stats['missing_calls']:>5} {stats['unused_calls']:>5} | "
+            f"{stats['total_ms'].get('p50', '-'):>8} "
+            f"{stats['total_ms'].get('p95', '-'):>8} | "
+            f"{stats['first_chunk_ms'].get('p50', '-'):>9} | "
+            f"{stats['recorded_ms'].get('p50', '-'):>10}"
+        )
+
+    for result in results:
+        if result.error or result.missing or result.unused:
+            print(
+                f"  {result.game[:8]} tour {result.turn}: "
+                f"{result.error or 'ok'}"
+                + (f", manquants {result.missing}" if result.missing else "")
+                + (f", inutilisés {result.unused}" if result.unused else "")
+            )
+
+
+def print_diff(game: str, diff: dict) -> None:
+    if not diff:
+        print(f"[REPLAY] {game}: état du KG identique")
+        return
+    print(f"[REPLAY] {game}: état du KG différent")
+    for section, rows in diff.items():
+        print(
+            f"  {section}: {len(rows['missing'])} absente(s), "
+            f"{len(rows['extra'])} en trop"
+        )
+        for label, items in (("-", rows["missing"]), ("+", rows["extra"])):
+            for row in items[:DIFF_EXAMPLES]:
+                print(f"    {label} {row[:160]}")
+
+
+def _write_json(path: str, data: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+async def _run(args: argparse.Namespace) -> int:
+    games, skipped = load_recordings(args.recordings)
+    for game_id in skipped:
+        print(f"[REPLAY] {game_id} ignorée: enregistrement commencé en cours de partie")
+    if args.games:
+        games = games[: args.games]
+    if not games:
+        print("[REPLAY] Aucune partie rejouable")
+        return 1
+
+    # Singleton utilisé par les routes et les extracteurs
+    llm_service._llm_service = ReplayLLMService(args.speed)
+    pool = await asyncpg.create_pool(
+        args.database_url, min_size=2, max_size=max(10, args.concurrency * 3)
+    )
+    results: list[TurnResult] = []
+    states: dict[str, dict] = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def replay(game: RecordedGame) -> None:
+        async with semaphore:
+            turns, states[game.game_id] = await replay_game(pool, game, args.keep)
+            results.extend(turns)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(replay(game) for game in games))
+    finally:
+        await pool.close()
+    duration = time.perf_counter() - started
+
+    summary = summarize(results, duration)
+    print_report(results, summary)
+
+    status = 0
+    if args.compare_state:
+        with open(args.compare_state, encoding="utf-8") as f:
+            expected = json.load(f)["games"]
+        print()
+        for game_id, state in states.items():
+            if game_id not in expected:
+                print(f"[REPLAY] {game_id}: absente de {args.compare_state}")
+                continue
+            diff = compare_snapshots(expected[game_id], state)
+            print_diff(game_id, diff)
+            status = status or (1 if diff else 0)
+
+    if args.state_out:
+        _write_json(args.state_out, {"commit": git_commit(), "games": states})
+        print(f"\nÉtat du KG écrit dans {args.state_out}")
+    if args.json:
+        _write_json(
+            args.json,
+            {
+                "commit": git_commit(),
+                "speed": args.speed,
+                "summary": summary,
+                "turns": [asdict(r) for r in results],
+            },
+        )
+        print(f"Résultats écrits dans {args.json}")
+    return status
+
+
+async def _snapshot(args: argparse.Namespace) -> int:
+    conn = await asyncpg.connect(args.database_url)
+    try:
+        state = await kg_snapshot(conn, UUID(args.game_id))
+    finally:
+        await conn.close()
+    _write_json(args.out, {"commit": git_commit(), "games": {args.game_id: state}})
+    print(f"[REPLAY] État de {args.game_id} écrit dans {args.out}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rejeu de tours enregistrés")
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="URL PostgreSQL (défaut: DATABASE_URL)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Logs INFO")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Rejoue un fichier d'enregistrement")
+    p_run.add_argument("recordings")
+    p_run.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="1 = timing d'origine, 2 = deux fois plus vite, 0 = vitesse max",
+    )
+    p_run.add_argument(
+        "--concurrency", type=int, default=1, help="Parties en parallèle"
+    )
+    p_run.add_argument("--games", type=int, default=None, help="Limiter à N parties")
+    p_run.add_argument(
+        "--keep", action="store_true", help="Conserver les parties rejouées"
+    )
+    p_run.add_argument("--state-out", default=None, help="Écrire l'état final du KG")
+    p_run.add_argument(
+        "--compare-state", default=None, help="État de référence (run ou snapshot)"
+    )
+    p_run.add_argument("--json", default=None, help="Résultats bruts + résumé")
+
+    p_snapshot = sub.add_parser("snapshot", help="État du KG d'une partie existante")
+    p_snapshot.add_argument("game_id", help="Partie d'origine (game_id enregistré)")
+    p_snapshot.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    if args.database_url is None:
+        args.database_url = get_settings().database_url
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    try:
+        if args.command == "run":
+            return asyncio.run(_run(args))
+        return asyncio.run(_snapshot(args))
+    except (OSError, ValueError) as e:
+        print(f"[REPLAY] Erreur: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
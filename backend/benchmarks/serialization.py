@@ -0,0 +1,169 @@
+"""
+LDVELH - Benchmark sérialisation JSON
+
+Compare l'ancien chemin (json.dumps stdlib, précédé de jsonable_encoder
+pour les réponses FastAPI) et utils.serialization (orjson si installé,
+repli stdlib) sur deux charges:
+  * un payload /tooltips de 500 entités (UUID, alias, connaissances)
+  * un long stream SSE de chunks narratifs
+
+Sans base de données ni réseau.
+
+Usage (depuis backend/):
+    python -m benchmarks.serialization --entities 500 --chunks 5000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from utils import serialization
+from utils.serialization import HAS_ORJSON, sse_frame
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+KNOWLEDGE_KEYS = ["metier", "physique", "espece", "age", "hobby", "traits"]
+WORDS = "station coursive néon dock relais ombre écho vapeur cargo lumière".split()
+
+
+# =============================================================================
+# PAYLOADS
+# =============================================================================
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def build_tooltip_payload(entities: int, seed: int = 42) -> dict:
+    """Même forme que la réponse de GET /api/tooltips"""
+    rng = random.Random(seed)
+    tooltips = {}
+    for i in range(entities):
+        name = f"{_sentence(rng, 2).title()} {i}"
+        aliases = [f"{name.split()[0]} {i}-{j}" for j in range(rng.randint(0, 3))]
+        connaissances = {
+            key: _sentence(rng, rng.randint(2, 8))
+            for key in rng.sample(KNOWLEDGE_KEYS, 4)
+        }
+        entry = {
+            "entite_id": uuid4(),
+            "entite_type": rng.choice(["personnage", "lieu", "organisation", "objet"]),
+            "entite_nom": name,
+            "alias": aliases,
+            "connaissances": connaissances,
+            "relation_valentin": {"type": "connait", "props": None},
+            "updated_at": datetime.now(timezone.utc),
+            "formatted": {
+                "icon": "👤",
+                "nom": name,
+                "type": "personnage",
+                "infos": [f"{k}: {v}" for k, v in connaissances.items()],
+                "relation": "Connaissance",
+            },
+        }
+        tooltips[name.lower()] = entry
+        for alias in aliases:
+            tooltips[alias.lower()] = entry
+    return {"tooltips": tooltips}
+
+
+def build_chunk_stream(chunks: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"type": "chunk", "content": _sentence(rng, rng.randint(1, 4)) + " "}
+        for _ in range(chunks)
+    ]
+
+
+# =============================================================================
+# MESURES
+# =============================================================================
+
+
+def _time(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+
+
+def bench_tooltips(payload: dict, repeat: int) -> dict[str, dict]:
+    results = {
+        "stdlib json.dumps(default=str)": _time(
+            lambda: json.dumps(payload, default=str).encode("utf-8"), repeat
+        ),
+        "serialization (stdlib)": _time(
+            lambda: serialization._dumps_stdlib(payload), repeat
+        ),
+    }
+    if jsonable_encoder is not None:
+        results["jsonable_encoder + json.dumps"] = _time(
+            lambda: json.dumps(jsonable_encoder(payload)).encode("utf-8"), repeat
+        )
+    if HAS_ORJSON:
+        results["serialization (orjson)"] = _time(
+            lambda: serialization._dumps_orjson(payload), repeat
+        )
+    return results
+
+
+def bench_chunks(events: list[dict], repeat: int) -> dict[str, dict]:
+    def old_path():
+        for i, payload in enumerate(events):
+            f"id: {i}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+
+    def new_path():
+        for i, payload in enumerate(events):
+            sse_frame(payload, i)
+
+    return {
+        "f-string + json.dumps": _time(old_path, repeat),
+        f"sse_frame ({'orjson' if HAS_ORJSON else 'stdlib'})": _time(new_path, repeat),
+    }
+
+
+def _print(title: str, results: dict[str, dict]) -> None:
+    print(f"\n{title}")
+    baseline = next(iter(results.values()))["median_ms"]
+    for label, stats in results.items():
+        print(
+            f"  {label:<34} {stats['median_ms']:>9.2f} ms "
+            f"(min {stats['min_ms']:.2f})  x{baseline / stats['median_ms']:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sérialisation JSON")
+    parser.add_argument("--entities", type=int, default=500)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"[BENCH] orjson: {'oui' if HAS_ORJSON else 'non (repli stdlib)'}")
+    if jsonable_encoder is None:
+        print("[BENCH] fastapi absent: jsonable_encoder non mesuré")
+
+    payload = build_tooltip_payload(args.entities)
+    size = len(serialization.dumps_bytes(payload))
+    _print(
+        f"Tooltips: {args.entities} entités, {len(payload['tooltips'])} clés, "
+        f"{size / 1024:.0f} KB",
+        bench_tooltips(payload, args.repeat),
+    )
+
+    events = build_chunk_stream(args.chunks)
+    _print(f"Stream SSE: {args.chunks} chunks", bench_chunks(events, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+LDVELH - Profil de démarrage (imports)
+
+Lance `python -X importtime -c "import main"` dans des processus neufs
+et résume la sortie: temps total médian, modules les plus coûteux
+(cumulé) et temps propre agrégé par paquet de premier niveau.
+
+--max-ms sert de garde-fou de régression (CI, pré-déploiement): code
+de sortie 1 si le temps médian d'import dépasse le seuil.
+
+Usage (depuis backend/):
+    python -m benchmarks.startup --runs 5 --top 25
+    python -m benchmarks.startup --max-ms 1500
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _profile(module: str) -> list[tuple[int, int, str]]:
+    """Une exécution: [(self_us, cumulative_us, module)] dans l'ordre d'import"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} a échoué:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # ligne d'en-tête
+        entries.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+    return entries
+
+
+def _total_ms(entries: list[tuple[int, int, str]]) -> float:
+    """Somme des cumulés des imports de premier niveau (indentation 1)"""
+    top = [cum for _, cum, name in entries if not name[1:].startswith(" ")]
+    return sum(top) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profil d'import au démarrage")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # Premier lancement: compile les .pyc, non compté
+    _profile(args.module)
+    runs = [_profile(args.module) for _ in range(args.runs)]
+    totals = [_total_ms(entries) for entries in runs]
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+    print(f"[BENCH] import {args.module}: médiane {statistics.median(totals):.0f}ms "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}, {args.runs} runs)\n")
+
+    print(f"{'cumulé ms':>10}{'propre ms':>11}  module")
+    for self_us, cum_us, name in sorted(median_run, key=lambda e: -e[1])[: args.top]:
+        print(f"{cum_us / 1000:>10.1f}{self_us / 1000:>11.1f}  {name.strip()}")
+
+    by_package: dict[str, int] = defaultdict(int)
+    for self_us, _, name in median_run:
+        by_package[name.strip().split(".")[0]] += self_us
+    print(f"\n{'propre ms':>10}  paquet")
+    for package, self_us in sorted(by_package.items(), key=lambda e: -e[1])[: args.top]:
+        print(f"{self_us / 1000:>10.1f}  {package}")
+
+    if args.max_ms is not None and statistics.median(totals) > args.max_ms:
+        print(f"\n[BENCH] Régression: {statistics.median(totals):.0f}ms > {args.max_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
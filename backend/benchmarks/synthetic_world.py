@@ -0,0 +1,677 @@
+"""
+LDVELH - Générateur de parties synthétiques (benchmarks KG)
+
+Crée une partie de taille réglable, déterministe pour une graine donnée
+(mêmes noms, valeurs, cycles; seuls les UUID générés par la base
+changent). Le monde de départ passe par WorldPopulator, à partir des
+entités de prompts/example_world_generation.json dupliquées et renommées:
+mêmes tables typées et mêmes clés d'attributs qu'une vraie partie.
+L'historique est ensuite inséré en masse (COPY): versions d'attributs,
+relations terminées, faits et participants, messages, résumés de cycle,
+jauges, engagements et événements.
+
+Les parties créées sont nommées "[synthetic] ..." (--purge les supprime).
+
+Usage (depuis backend/):
+    python -m benchmarks.synthetic_world --tier medium
+    python -m benchmarks.synthetic_world --tier large --npcs 300 --cycles 500
+    python -m benchmarks.synthetic_world --purge
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import asyncpg
+
+from benchmarks.world_fixture import assemble_world, clones, load_example
+from config import get_settings
+from kg.specialized_populator import WorldPopulator
+from schema import WorldGeneration
+
+SYNTHETIC_PREFIX = "[synthetic]"
+
+
+@dataclass(frozen=True)
+class WorldSize:
+    """Volumes d'une partie synthétique"""
+
+    npcs: int
+    locations: int
+    organizations: int
+    objects: int
+    cycles: int
+    messages_per_cycle: int  # Paires joueur/narrateur
+    facts_per_cycle: int
+    attribute_versions: int  # Versions par attribut versionné
+    versioned_share: float  # Part des PNJs dont mood/occupation évoluent
+    relations_per_npc: int  # Relations PNJ-PNJ + historique de lieux fréquentés
+    commitments: int
+    events: int
+
+
+TIERS = {
+    "small": WorldSize(20, 15, 5, 10, 20, 4, 3, 3, 0.5, 1, 5, 5),
+    "medium": WorldSize(100, 60, 15, 40, 100, 6, 4, 8, 0.5, 2, 20, 20),
+    "large": WorldSize(300, 150, 30, 100, 500, 6, 5, 20, 0.5, 3, 60, 60),
+    "xl": WorldSize(1000, 400, 80, 300, 1500, 6, 5, 40, 0.5, 3, 150, 150),
+}
+
+# Valeurs des enums de schema.sql
+FACT_TYPES = [
+    "action",
+    "npc_action",
+    "statement",
+    "revelation",
+    "observation",
+    "atmosphere",
+    "encounter",
+    "interaction",
+    "decision",
+    "realization",
+]
+PARTICIPANT_ROLES = ["actor", "witness", "target", "mentioned"]
+COMMITMENT_TYPES = ["foreshadowing", "secret", "setup", "chekhov_gun", "arc"]
+EVENT_TYPES = ["appointment", "deadline", "celebration", "recurring"]
+VERSIONED_KEYS = ["mood", "occupation"]
+# Lieu d'arrivée: premier lieu cloné par build_world
+ARRIVAL_LOCATION = "Lieu 0000"
+
+MESSAGE_COLUMNS = [
+    "game_id",
+    "role",
+    "content",
+    "cycle",
+    "time",
+    "date",
+    "location_id",
+    "npcs_present",
+    "summary",
+    "created_at",
+]
+ATTRIBUTE_COLUMNS = [
+    "game_id",
+    "entity_id",
+    "key",
+    "value",
+    "known_by_protagonist",
+    "start_cycle",
+    "end_cycle",
+]
+RELATION_COLUMNS = [
+    "id",
+    "game_id",
+    "source_id",
+    "target_id",
+    "type",
+    "start_cycle",
+    "end_cycle",
+    "end_reason",
+    "known_by_protagonist",
+]
+FACT_COLUMNS = [
+    "id",
+    "game_id",
+    "cycle",
+    "time",
+    "type",
+    "description",
+    "location_id",
+    "importance",
+    "semantic_key",
+]
+GAUGE_COLUMNS = [
+    "game_id",
+    "gauge",
+    "cycle",
+    "old_value",
+    "new_value",
+    "description",
+    "created_at",
+]
+COMMITMENT_COLUMNS = [
+    "id",
+    "game_id",
+    "type",
+    "description",
+    "created_cycle",
+    "deadline_cycle",
+    "resolved",
+]
+EVENT_COLUMNS = [
+    "id",
+    "game_id",
+    "type",
+    "title",
+    "description",
+    "planned_cycle",
+    "time",
+    "location_id",
+    "completed",
+]
+
+DAYS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+MOODS = ["serein", "tendu", "enjoué", "fatigué", "méfiant", "curieux", "las"]
+PLAYER_LINES = [
+    "Je regarde autour de moi.",
+    "Je vais voir ce qui se passe au marché.",
+    "Je lui demande comment s'est passée sa journée.",
+    "Je rentre me reposer.",
+    "Je consulte mes messages.",
+]
+SENTENCES = [
+    "Les néons de la coursive clignotent au rythme des recycleurs d'air.",
+    "Une odeur de café synthétique flotte près du kiosque.",
+    "Quelqu'un rit trop fort à une table voisine, puis se tait.",
+    "La baie d'observation découpe la planète en tranches bleues.",
+    "Un drone de maintenance passe en sifflotant une mélodie désaccordée.",
+    "Le sol vibre légèrement quand une navette s'amarre au quai.",
+    "Les conversations baissent d'un ton à ton passage.",
+    "Une affiche annonce la fête des récoltes hydroponiques.",
+]
+
+
+# =============================================================================
+# MONDE DE DÉPART (via WorldPopulator)
+# =============================================================================
+
+
+def build_world(size: WorldSize, rng: random.Random) -> WorldGeneration:
+    """
+    Monde aux volumes de size, références toutes valides (assemblé par
+    benchmarks.world_fixture).
+    """
+    data = load_example()
+    protagonist = data["protagonist"]["name"]
+
+    locations = clones(data["locations"], size.locations, "name", "Lieu")
+    for i, loc in enumerate(locations):
+        # Arborescence: le parent est toujours un lieu créé avant
+        parent = i and rng.random() < 0.6
+        loc["parent_location_ref"] = (
+            locations[rng.randrange(i)]["name"] if parent else None
+        )
+    location_names = [loc["name"] for loc in locations]
+
+    organizations = clones(data["organizations"], size.organizations, "name", "Org")
+    for org in organizations:
+        org["headquarters_ref"] = rng.choice(location_names)
+    org_names = [org["name"] for org in organizations]
+
+    characters = clones(data["characters"], size.npcs, "name", "PNJ")
+    for char in characters:
+        char["workplace_ref"] = rng.choice(location_names)
+        char["residence_ref"] = rng.choice(location_names)
+    npc_names = [char["name"] for char in characters]
+
+    inventory = clones(data["inventory"], size.objects, "name", "Objet")
+
+    relations = []
+    for name in npc_names:
+        if rng.random() < 0.7:
+            relations.append(
+                {
+                    "source_ref": protagonist,
+                    "target_ref": name,
+                    "relation_type": "knows",
+                    "social": {"level": rng.randint(1, 10), "context": "Rencontre"},
+                }
+            )
+        for _ in range(size.relations_per_npc):
+            other = rng.choice(npc_names)
+            if other != name:
+                relations.append(
+                    {
+                        "source_ref": name,
+                        "target_ref": other,
+                        "relation_type": "knows",
+                        "social": {"level": rng.randint(0, 10)},
+                    }
+                )
+        if org_names and rng.random() < 0.5:
+            relations.append(
+                {
+                    "source_ref": name,
+                    "target_ref": rng.choice(org_names),
+                    "relation_type": "employed_by",
+                }
+            )
+
+    arc = data["narrative_arcs"][0]
+    arcs = [
+        {
+            **arc,
+            "title": f"Arc {i:04d}",
+            "involved_entities": [protagonist, rng.choice(npc_names)],
+        }
+        for i in range(max(1, size.commitments // 4))
+    ]
+    arrival = {
+        **data["arrival_event"],
+        "arrival_location_ref": ARRIVAL_LOCATION,
+        "first_npc_encountered": None,
+    }
+
+    return assemble_world(
+        data,
+        characters=characters,
+        locations=locations,
+        organizations=organizations,
+        inventory=inventory,
+        narrative_arcs=arcs,
+        initial_relations=relations,
+        arrival_event=arrival,
+    )
+
+
+# =============================================================================
+# HISTORIQUE (COPY)
+# =============================================================================
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _date(cycle: int) -> str:
+    return f"{DAYS[(cycle - 1) % 7]} {cycle} du cycle de Méridienne"
+
+
+def _time(turn: int, turns: int) -> str:
+    minutes = 8 * 60 + turn * (14 * 60 // max(1, turns))
+    return f"{minutes // 60:02d}h{minutes % 60:02d}"
+
+
+def _narrative(rng: random.Random) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(12, 24)))
+
+
+async def _copy(conn: asyncpg.Connection, table: str, columns: list[str], rows) -> int:
+    if rows:
+        await conn.copy_records_to_table(table, records=rows, columns=columns)
+    return len(rows)
+
+
+@dataclass
+class _Game:
+    """Partie en cours de génération: ids par type d'entité, horloge"""
+
+    id: UUID
+    size: WorldSize
+    rng: random.Random
+    protagonist: UUID
+    npcs: list[UUID]
+    locations: list[UUID]
+    tick: int = 0
+
+    @property
+    def people(self) -> list[UUID]:
+        return [self.protagonist] + self.npcs
+
+    def timestamp(self) -> datetime:
+        """created_at croissant (ordre des messages et de l'historique)"""
+        self.tick += 1
+        return datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=self.tick)
+
+    def some(self, entities: list[UUID], low: int, high: int) -> list[UUID]:
+        return self.rng.sample(
+            entities, k=min(len(entities), self.rng.randint(low, high))
+        )
+
+
+async def _insert_messages(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    """Paires joueur/narrateur de chaque cycle et résumés de cycle"""
+    rng, size = game.rng, game.size
+    messages, summaries = [], []
+    for cycle in range(1, size.cycles + 1):
+        for turn in range(size.messages_per_cycle):
+            location = rng.choice(game.locations)
+            present = game.some(game.npcs, 0, 3)
+            hour = _time(turn, size.messages_per_cycle)
+            narrative = _narrative(rng)
+            for role, content, summary in (
+                ("user", rng.choice(PLAYER_LINES), None),
+                ("assistant", narrative, narrative[:140]),
+            ):
+                messages.append(
+                    (game.id, role, content, cycle, hour, _date(cycle), location)
+                    + (present, summary, game.timestamp())
+                )
+        key_events = {"npcs_present": []}
+        if cycle == 1:
+            key_events = {"arrival_location": ARRIVAL_LOCATION, "hour": "08h00"}
+        summary = f"Cycle {cycle}: " + " ".join(rng.sample(SENTENCES, 3))
+        summaries.append(
+            (game.id, cycle, _date(cycle), summary, json.dumps(key_events))
+        )
+    return {
+        "chat_messages": await _copy(conn, "chat_messages", MESSAGE_COLUMNS, messages),
+        "cycle_summaries": await _copy(
+            conn,
+            "cycle_summaries",
+            ["game_id", "cycle", "date", "summary", "key_events"],
+            summaries,
+        ),
+    }
+
+
+async def _insert_attribute_versions(
+    conn: asyncpg.Connection, game: _Game
+) -> dict[str, int]:
+    """
+    Versions successives de mood/occupation: la version courante commence
+    au dernier changement, les précédentes couvrent les cycles antérieurs.
+    """
+    rng, size = game.rng, game.size
+    current = await conn.fetch(
+        """SELECT a.id, a.entity_id, a.key, a.value, a.known_by_protagonist
+           FROM attributes a JOIN entities e ON e.id = a.entity_id
+           WHERE a.game_id = $1 AND a.end_cycle IS NULL
+             AND e.type = 'character' AND a.key = ANY($2::text[])
+           ORDER BY e.name, a.key""",
+        game.id,
+        VERSIONED_KEYS,
+    )
+    versions = min(size.attribute_versions, size.cycles - 1)
+    history, moved = [], []
+    for attr in current:
+        if versions < 1 or rng.random() >= size.versioned_share:
+            continue
+        bounds = [1] + sorted(rng.sample(range(2, size.cycles + 1), versions))
+        for i in range(versions):
+            if attr["key"] == "mood":
+                value = rng.choice(MOODS)
+            else:
+                value = f"{attr['value']} (v{i})"
+            history.append(
+                (game.id, attr["entity_id"], attr["key"], value)
+                + (attr["known_by_protagonist"], bounds[i], bounds[i + 1])
+            )
+        moved.append((attr["id"], bounds[-1]))
+
+    count = await _copy(conn, "attributes", ATTRIBUTE_COLUMNS, history)
+    if moved:
+        await conn.executemany(
+            "UPDATE attributes SET start_cycle = $2 WHERE id = $1", moved
+        )
+    return {"attribute_versions": count}
+
+
+async def _insert_relations(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    """Lieux fréquentés successifs de chaque PNJ (terminés + un actif)"""
+    rng, size = game.rng, game.size
+    relations, spatial = [], []
+    for npc in game.npcs:
+        count = min(size.cycles, size.relations_per_npc)
+        starts = sorted(rng.sample(range(1, size.cycles + 1), count))
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else None
+            relation_id = _uuid(rng)
+            relations.append(
+                (relation_id, game.id, npc, rng.choice(game.locations), "frequents")
+                + (start, end, "A changé d'habitudes" if end else None)
+                + (rng.random() < 0.6,)
+            )
+            spatial.append((relation_id, "often", rng.choice(["matin", "soir"])))
+
+    count = await _copy(conn, "relations", RELATION_COLUMNS, relations)
+    await _copy(
+        conn, "relations_spatial", ["relation_id", "regularity", "time_of_day"], spatial
+    )
+    return {"relations": count}
+
+
+async def _insert_facts(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    rng, size = game.rng, game.size
+    facts, participants = [], []
+    for cycle in range(1, size.cycles + 1):
+        for i in range(size.facts_per_cycle):
+            fact_id = _uuid(rng)
+            facts.append(
+                (fact_id, game.id, cycle, _time(i, size.facts_per_cycle))
+                + (rng.choice(FACT_TYPES), rng.choice(SENTENCES))
+                + (rng.choice(game.locations), rng.randint(1, 5))
+                + (f"synth:c{cycle}:f{i}",)
+            )
+            for entity in game.some(game.people, 1, 3):
+                participants.append((fact_id, entity, rng.choice(PARTICIPANT_ROLES)))
+    return {
+        "facts": await _copy(conn, "facts", FACT_COLUMNS, facts),
+        "fact_participants": await _copy(
+            conn, "fact_participants", ["fact_id", "entity_id", "role"], participants
+        ),
+    }
+
+
+async def _insert_gauges(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    """Une à deux variations de jauge par cycle, valeurs finales à jour"""
+    rng = game.rng
+    gauges = {"energy": 3.0, "morale": 3.0, "health": 3.0, "credits": 1400}
+    history = []
+    for cycle in range(1, game.size.cycles + 1):
+        for _ in range(rng.randint(1, 2)):
+            gauge = rng.choice(list(gauges))
+            old = gauges[gauge]
+            if gauge == "credits":
+                new = max(0, old + rng.randint(-80, 120))
+            else:
+                new = min(5.0, max(0.0, old + rng.choice([-1, -0.5, 0.5, 1])))
+            gauges[gauge] = new
+            history.append(
+                (game.id, gauge, cycle, old, new, "Variation synthétique")
+                + (game.timestamp(),)
+            )
+
+    count = await _copy(conn, "protagonist_gauge_history", GAUGE_COLUMNS, history)
+    await conn.execute(
+        """INSERT INTO protagonist_gauges
+             (game_id, energy, morale, health, credits, updated_cycle)
+           VALUES ($1, $2, $3, $4, $5, $6)
+           ON CONFLICT (game_id) DO UPDATE SET
+             energy = EXCLUDED.energy, morale = EXCLUDED.morale,
+             health = EXCLUDED.health, credits = EXCLUDED.credits,
+             updated_cycle = EXCLUDED.updated_cycle""",
+        game.id,
+        gauges["energy"],
+        gauges["morale"],
+        gauges["health"],
+        gauges["credits"],
+        game.size.cycles,
+    )
+    return {"gauge_history": count}
+
+
+async def _insert_commitments(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    rng, cycles = game.rng, game.size.cycles
+    commitments, arcs, involved = [], [], []
+    for i in range(game.size.commitments):
+        commitment_id = _uuid(rng)
+        kind = rng.choice(COMMITMENT_TYPES)
+        created = rng.randint(1, cycles)
+        deadline = created + rng.randint(5, 50) if rng.random() < 0.5 else None
+        description = f"Engagement {i}: {rng.choice(SENTENCES)}"
+        commitments.append(
+            (commitment_id, game.id, kind, description, created, deadline)
+            + (rng.random() < 0.4,)
+        )
+        if kind == "arc":
+            arcs.append(
+                (commitment_id, "Comprendre", "Le silence", rng.randint(0, 100))
+            )
+        for entity in game.some(game.people, 1, 3):
+            involved.append((commitment_id, entity, "impliqué"))
+
+    count = await _copy(conn, "commitments", COMMITMENT_COLUMNS, commitments)
+    await _copy(
+        conn,
+        "commitment_arcs",
+        ["commitment_id", "objective", "obstacle", "progress"],
+        arcs,
+    )
+    await _copy(
+        conn, "commitment_entities", ["commitment_id", "entity_id", "role"], involved
+    )
+    return {"commitments": count}
+
+
+async def _insert_events(conn: asyncpg.Connection, game: _Game) -> dict[str, int]:
+    """Événements passés (souvent terminés) et à venir"""
+    rng, cycles = game.rng, game.size.cycles
+    events, participants = [], []
+    for i in range(game.size.events):
+        event_id = _uuid(rng)
+        planned = rng.randint(1, cycles + 30)
+        events.append(
+            (event_id, game.id, rng.choice(EVENT_TYPES), f"Événement {i}")
+            + (rng.choice(SENTENCES), planned, _time(rng.randint(0, 6), 7))
+            + (rng.choice(game.locations), planned < cycles and rng.random() < 0.7)
+        )
+        for entity in game.some(game.people, 1, 3):
+            participants.append((event_id, entity, "invité", rng.random() < 0.5))
+
+    count = await _copy(conn, "events", EVENT_COLUMNS, events)
+    await _copy(
+        conn,
+        "event_participants",
+        ["event_id", "entity_id", "role", "confirmed"],
+        participants,
+    )
+    return {"events": count}
+
+
+async def _insert_history(
+    conn: asyncpg.Connection, game_id: UUID, size: WorldSize, rng: random.Random
+) -> dict[str, int]:
+    entities = await conn.fetch(
+        """SELECT id, type::text AS type FROM entities
+           WHERE game_id = $1 ORDER BY type, name""",
+        game_id,
+    )
+    by_type: dict[str, list[UUID]] = defaultdict(list)
+    for row in entities:
+        by_type[row["type"]].append(row["id"])
+    game = _Game(
+        id=game_id,
+        size=size,
+        rng=rng,
+        protagonist=by_type["protagonist"][0],
+        npcs=by_type["character"],
+        locations=by_type["location"],
+    )
+
+    counts = {}
+    for insert in (
+        _insert_messages,
+        _insert_attribute_versions,
+        _insert_relations,
+        _insert_facts,
+        _insert_gauges,
+        _insert_commitments,
+        _insert_events,
+    ):
+        counts.update(await insert(conn, game))
+    return counts
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+async def generate_game(
+    pool: asyncpg.Pool, size: WorldSize, seed: int = 42, label: str = "custom"
+) -> tuple[UUID, dict[str, int]]:
+    """Crée une partie synthétique; retourne (game_id, lignes insérées)"""
+    rng = random.Random(seed)
+    world = build_world(size, rng)
+    game_id = await WorldPopulator(pool).populate(world)
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "UPDATE games SET name = $2 WHERE id = $1",
+                game_id,
+                f"{SYNTHETIC_PREFIX} {label} seed={seed}",
+            )
+            counts = await _insert_history(conn, game_id, size, rng)
+        # Statistiques du planificateur à jour avant toute mesure
+        await conn.execute("ANALYZE")
+
+    counts["entities"] = (
+        1 + size.npcs + size.locations + size.organizations + size.objects
+    )
+    return game_id, counts
+
+
+async def purge_synthetic_games(pool: asyncpg.Pool) -> int:
+    status = await pool.execute(
+        "DELETE FROM games WHERE name LIKE $1", f"{SYNTHETIC_PREFIX}%"
+    )
+    return int(status.rsplit(" ", 1)[-1])
+
+
+def size_from_args(args: argparse.Namespace) -> WorldSize:
+    """Palier --tier, surchargé champ par champ (--npcs, --cycles...)"""
+    size = TIERS[args.tier]
+    overrides = {
+        f.name: getattr(args, f.name)
+        for f in fields(WorldSize)
+        if getattr(args, f.name, None) is not None
+    }
+    return replace(size, **overrides)
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    for f in fields(WorldSize):
+        parser.add_argument(
+            f"--{f.name.replace('_', '-')}",
+            dest=f.name,
+            type=float if f.type in (float, "float") else int,
+            default=None,
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    pool = await asyncpg.create_pool(
+        args.database_url or get_settings().database_url, min_size=1, max_size=4
+    )
+    try:
+        if args.purge:
+            print(f"[SYNTH] {await purge_synthetic_games(pool)} partie(s) supprimée(s)")
+            return
+        size = size_from_args(args)
+        start = time.perf_counter()
+        game_id, counts = await generate_game(pool, size, args.seed, args.tier)
+        print(
+            f"[SYNTH] Partie {game_id} ({args.tier}, seed={args.seed}) en "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+        for table, count in counts.items():
+            print(f"  {table:<22}{count:>10}")
+    finally:
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de parties synthétiques")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tier", choices=list(TIERS), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--purge", action="store_true")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    # Le populator journalise chaque entité
+    logging.getLogger("kg").setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+LDVELH - Mondes synthétiques à partir de l'exemple de génération
+
+Briques communes aux benchmarks qui ont besoin d'un WorldGeneration
+volumineux: les entités de prompts/example_world_generation.json sont
+dupliquées et renommées, puis le monde est assemblé avec model_construct
+(les limites de taille des listes de WorldGeneration empêchent un
+model_validate à cette échelle). Chaque entité reste validée
+individuellement.
+"""
+
+import json
+from pathlib import Path
+
+from schema import WorldGeneration
+from schema.entities import (
+    CharacterData,
+    LocationData,
+    ObjectData,
+    OrganizationData,
+    PersonalAIData,
+    ProtagonistData,
+    WorldData,
+)
+from schema.narrative import NarrativeArcData
+from schema.relations import RelationData
+from schema.world_generation import ArrivalEventData
+
+EXAMPLE = (
+    Path(__file__).resolve().parent.parent / "prompts" / "example_world_generation.json"
+)
+
+
+def load_example() -> dict:
+    """Exemple de génération, brut (dict JSON)"""
+    return json.loads(EXAMPLE.read_text(encoding="utf-8"))
+
+
+def clones(items: list[dict], count: int, key: str, prefix: str) -> list[dict]:
+    """count copies des exemples, renommées de façon unique"""
+    copies = []
+    for i in range(count):
+        item = json.loads(json.dumps(items[i % len(items)]))
+        item[key] = f"{prefix} {i:04d}"
+        copies.append(item)
+    return copies
+
+
+def assemble_world(
+    data: dict,
+    *,
+    characters: list[dict],
+    locations: list[dict],
+    organizations: list[dict],
+    inventory: list[dict],
+    narrative_arcs: list[dict],
+    initial_relations: list[dict],
+    arrival_event: dict,
+) -> WorldGeneration:
+    """
+    WorldGeneration sans validation de modèle (ni limites de taille, ni
+    validateurs mode="after"). Monde, protagoniste et IA viennent de data.
+    """
+    return WorldGeneration.model_construct(
+        generation_seed_words=data["generation_seed_words"],
+        world=WorldData.model_validate(data["world"]),
+        protagonist=ProtagonistData.model_validate(data["protagonist"]),
+        personal_ai=PersonalAIData.model_validate(data["personal_ai"]),
+        characters=[CharacterData.model_validate(c) for c in characters],
+        locations=[LocationData.model_validate(loc) for loc in locations],
+        organizations=[OrganizationData.model_validate(o) for o in organizations],
+        inventory=[ObjectData.model_validate(item) for item in inventory],
+        narrative_arcs=[NarrativeArcData.model_validate(a) for a in narrative_arcs],
+        initial_relations=[RelationData.model_validate(r) for r in initial_relations],
+        arrival_event=ArrivalEventData.model_validate(arrival_event),
+    )
@@ -18,6 +18,9 @@ class Settings(BaseSettings):
 
     # Anthropic
     anthropic_api_key: str = os.getenv("ANTHROPIC_API_KEY", "")
+    # API alternative (vide = api.anthropic.com), ex. le faux serveur des
+    # tests de charge: python -m benchmarks.fake_anthropic
+    anthropic_base_url: str = os.getenv("ANTHROPIC_BASE_URL", "")
 
     # Models
     model_main: str = "claude-sonnet-4-5"
@@ -34,9 +37,65 @@ class Settings(BaseSettings):
     temperature: float = 0.8
     temperature_extraction: float = 0.3
 
+    # SSE: coalescence des chunks narratifs (0 ms = un événement par delta).
+    # Valeurs par défaut, surchargeables par le client dans la requête.
+    sse_chunk_flush_ms: int = int(os.getenv("SSE_CHUNK_FLUSH_MS", "40"))
+    sse_chunk_flush_bytes: int = int(os.getenv("SSE_CHUNK_FLUSH_BYTES", "512"))
+    # Délai pendant lequel un tour survit à une déconnexion (reprise via
+    # GET /api/chat/{turn_id}/stream); 0 = abandon immédiat
+    sse_resume_grace_seconds: float = float(
+        os.getenv("SSE_RESUME_GRACE_SECONDS", "30")
+    )
+
+    # Tracing des tours: none | console | file (OTLP/JSON dans trace_file).
+    # Les tours plus longs que trace_slow_turn_ms (0 = jamais) sont
+    # journalisés avec leur arbre de spans quel que soit l'exporteur.
+    trace_exporter: str = os.getenv("TRACE_EXPORTER", "none")
+    trace_file: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    trace_slow_turn_ms: float = float(os.getenv("TRACE_SLOW_TURN_MS", "0"))
+
+    # Requêtes SQL: seuil du journal des requêtes lentes (0 = désactivé) et
+    # plan EXPLAIN (ANALYZE, BUFFERS) joint au log. EXPLAIN rejoue les
+    # lectures lentes: à n'activer qu'en debug.
+    db_slow_query_ms: float = float(os.getenv("DB_SLOW_QUERY_MS", "250"))
+    db_explain_slow_queries: bool = (
+        os.getenv("DB_EXPLAIN_SLOW_QUERIES", "false").lower() == "true"
+    )
+
+    # Boucle asyncio: échantillonnage du retard (0 = pas de surveillance) et
+    # seuil au-delà duquel la pile du code bloquant est capturée (0 = jamais).
+    # Les payloads JSON plus gros que offload_min_bytes sont sérialisés et
+    # validés dans le pool de threads.
+    loop_lag_interval_ms: float = float(os.getenv("LOOP_LAG_INTERVAL_MS", "250"))
+    loop_block_ms: float = float(os.getenv("LOOP_BLOCK_MS", "200"))
+    offload_min_bytes: int = int(os.getenv("OFFLOAD_MIN_BYTES", "32768"))
+
+    # Enregistrement des tours (requête + sorties LLM brutes), une ligne
+    # JSON par tour, rejouable par benchmarks.replay. Vide = désactivé.
+    llm_record_file: str = os.getenv("LLM_RECORD_FILE", "")
+
+    # Maintenance périodique
+    maintenance_interval_hours: float = 6.0
+
+    # Cold storage (0 = désactivé)
+    archive_inactive_days: int = int(os.getenv("ARCHIVE_INACTIVE_DAYS", "0"))
+
+    # Compaction des attributs: versions remplacées depuis plus de N cycles
+    # (0 = désactivé). "history" les conserve dans attributes_history,
+    # "drop" les supprime (rollback impossible au-delà de l'horizon).
+    attribute_rollback_horizon: int = int(
+        os.getenv("ATTRIBUTE_ROLLBACK_HORIZON", "0")
+    )
+    attribute_retention: str = os.getenv("ATTRIBUTE_RETENTION", "history")
+
     # App
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
 
+    # Endpoints de diagnostic (/metrics, /api/debug/*: SQL brut, plans
+    # EXPLAIN, piles de la boucle): ouverts en debug, sinon réservés au
+    # jeton "Authorization: Bearer <ADMIN_TOKEN>" (vide = inaccessibles).
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+
     class Config:
         env_file = ".env"
 
@@ -6,6 +6,7 @@ Architecture:
 - reader.py: Lecture seule (SELECT)
 - populator.py: Écriture (INSERT/UPDATE/DELETE)
 - specialized_populator.py: WorldPopulator, ExtractionPopulator
+- archive.py: Export/import binaire d'une partie, cold storage
 - context_builder.py: Construction contexte narrateur
 """
 
@@ -26,6 +27,16 @@ from kg.specialized_populator import (
     ExtractionPopulator,
 )
 
+# Archive (export/import)
+from kg.archive import (
+    ArchiveError,
+    archive_game,
+    export_game,
+    find_archivable_games,
+    import_game,
+    restore_game,
+)
+
 __all__ = [
     # Reader
     "KnowledgeGraphReader",
@@ -35,6 +46,13 @@ __all__ = [
     "KnowledgeGraphPopulator",
     "WorldPopulator",
     "ExtractionPopulator",
+    # Archive
+    "ArchiveError",
+    "export_game",
+    "import_game",
+    "archive_game",
+    "restore_game",
+    "find_archivable_games",
     # Context
     "ContextBuilder",
 ]
@@ -0,0 +1,726 @@
+"""
+LDVELH - Game Archive (export / import binaire)
+
+Sérialise toutes les lignes d'une partie dans une archive compressée
+et versionnée, et la réimporte (éventuellement dans une autre base)
+avec remapping complet des UUID.
+
+Format (flux gzip):
+    MAGIC (8 octets) | version (uint16)
+    header   : frame JSON (game_id, nom, date d'export...)
+    sections : b"T" | frame JSON {table, columns}
+               | frames de données COPY BINARY | frame vide (fin de table)
+    fin      : b"E"
+
+Une frame = longueur (uint32 big-endian) + contenu.
+
+Export via `copy_from_query(format="binary")`, import via
+`copy_records_to_table` : les deux côtés travaillent en flux, une partie
+volumineuse n'est jamais chargée entièrement en mémoire (seule la table
+de remapping des UUID l'est).
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import struct
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+from uuid import UUID, uuid4
+
+if TYPE_CHECKING:
+    from asyncpg import Connection
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# FORMAT
+# =============================================================================
+
+ARCHIVE_MAGIC = b"LDVELH\x00A"
+ARCHIVE_FORMAT_VERSION = 1
+
+_TAG_TABLE = b"T"
+_TAG_END = b"E"
+
+_FRAME_LEN = struct.Struct("!I")
+_VERSION = struct.Struct("!H")
+
+_GAME_FILTER = "game_id = $1"
+
+
+def _child_filter(fk: str, parent: str) -> str:
+    return f"{fk} IN (SELECT id FROM {parent} WHERE game_id = $1)"
+
+
+# Ordre d'export = ordre d'import (respecte les clés étrangères)
+ARCHIVE_TABLES: tuple[tuple[str, str], ...] = (
+    ("games", "id = $1"),
+    # Entités + tables typées
+    ("entities", _GAME_FILTER),
+    ("entity_locations", _child_filter("entity_id", "entities")),
+    ("entity_ais", _child_filter("entity_id", "entities")),
+    ("entity_organizations", _child_filter("entity_id", "entities")),
+    ("attributes", _GAME_FILTER),
+    ("attributes_history", _GAME_FILTER),
+    ("skills", _GAME_FILTER),
+    ("protagonist_gauges", _GAME_FILTER),
+    ("protagonist_gauge_history", _GAME_FILTER),
+    # Relations + tables typées
+    ("relations", _GAME_FILTER),
+    ("relations_social", _child_filter("relation_id", "relations")),
+    ("relations_professional", _child_filter("relation_id", "relations")),
+    ("relations_spatial", _child_filter("relation_id", "relations")),
+    ("relations_ownership", _child_filter("relation_id", "relations")),
+    # Narration
+    ("facts", _GAME_FILTER),
+    ("fact_participants", _child_filter("fact_id", "facts")),
+    ("contradictions", _GAME_FILTER),
+    ("events", _GAME_FILTER),
+    ("event_participants", _child_filter("event_id", "events")),
+    ("commitments", _GAME_FILTER),
+    ("commitment_arcs", _child_filter("commitment_id", "commitments")),
+    ("commitment_entities", _child_filter("commitment_id", "commitments")),
+    # Historique
+    ("chat_messages", _GAME_FILTER),
+    ("cycle_summaries", _GAME_FILTER),
+    ("extraction_logs", _GAME_FILTER),
+)
+
+_ARCHIVE_TABLE_NAMES = frozenset(table for table, _ in ARCHIVE_TABLES)
+
+
+class ArchiveError(ValueError):
+    """Archive invalide, tronquée ou incompatible"""
+
+
+# =============================================================================
+# DÉCODAGE COPY BINARY
+# =============================================================================
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_HEADER_SIZE = len(_COPY_SIGNATURE) + 8
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+_INT16 = struct.Struct("!h")
+_INT32 = struct.Struct("!i")
+
+
+def _decode_text(data: bytes) -> str:
+    return data.decode("utf-8")
+
+
+def _decode_timestamptz(data: bytes) -> datetime:
+    return _PG_EPOCH + timedelta(microseconds=struct.unpack("!q", data)[0])
+
+
+def _decode_timestamp(data: bytes) -> datetime:
+    return _decode_timestamptz(data).replace(tzinfo=None)
+
+
+# numeric binaire: ndigits, weight, sign, dscale puis ndigits chiffres en
+# base 10000 (le premier pondéré par 10000^weight)
+_NUMERIC_HEADER = struct.Struct("!hhHH")
+_NUMERIC_SPECIAL = {
+    0xC000: Decimal("NaN"),
+    0xD000: Decimal("Infinity"),
+    0xF000: Decimal("-Infinity"),
+}
+_NUMERIC_NEG = 0x4000
+
+
+def _decode_numeric(data: bytes) -> Decimal:
+    """Decimal exact, à l'échelle d'affichage (dscale) de PostgreSQL"""
+    ndigits, weight, sign, dscale = _NUMERIC_HEADER.unpack_from(data)
+    if sign in _NUMERIC_SPECIAL:
+        return _NUMERIC_SPECIAL[sign]
+    groups = struct.unpack_from(f"!{ndigits}H", data, _NUMERIC_HEADER.size)
+    digits = "".join(f"{group:04d}" for group in groups) or "0"
+    # Exposant du dernier chiffre décimal, ramené à -dscale (les chiffres
+    # au-delà de dscale sont des zéros de bourrage du groupe)
+    exponent = 4 * (weight - ndigits + 1)
+    if exponent > -dscale:
+        digits += "0" * (exponent + dscale)
+    elif exponent < -dscale:
+        digits = digits[: exponent + dscale] or "0"
+    return Decimal((sign == _NUMERIC_NEG, tuple(map(int, digits)), -dscale))
+
+
+_SCALAR_DECODERS: dict[str, Callable[[bytes], Any]] = {
+    "uuid": lambda data: UUID(bytes=data),
+    "text": _decode_text,
+    "varchar": _decode_text,
+    "bpchar": _decode_text,
+    "name": _decode_text,
+    "enum": _decode_text,
+    "int2": lambda data: _INT16.unpack(data)[0],
+    "int4": lambda data: _INT32.unpack(data)[0],
+    "int8": lambda data: struct.unpack("!q", data)[0],
+    "float4": lambda data: struct.unpack("!f", data)[0],
+    "float8": lambda data: struct.unpack("!d", data)[0],
+    # Decimal: réencodé tel quel par copy_records_to_table à l'import
+    "numeric": _decode_numeric,
+    "bool": lambda data: data != b"\x00",
+    "timestamptz": _decode_timestamptz,
+    "timestamp": _decode_timestamp,
+    # jsonb binaire = octet de version + texte JSON
+    "jsonb": lambda data: data[1:].decode("utf-8"),
+    "json": _decode_text,
+}
+
+
+def _array_decoder(element: Callable[[bytes], Any]) -> Callable[[bytes], list]:
+    def decode(data: bytes) -> list:
+        ndim, _flags, _oid = struct.unpack_from("!iiI", data, 0)
+        if ndim == 0:
+            return []
+        if ndim > 1:
+            raise ArchiveError("Tableaux multi-dimensionnels non supportés")
+        size, _lower_bound = struct.unpack_from("!ii", data, 12)
+        pos = 20
+        values = []
+        for _ in range(size):
+            (length,) = _INT32.unpack_from(data, pos)
+            pos += 4
+            if length == -1:
+                values.append(None)
+                continue
+            values.append(element(data[pos : pos + length]))
+            pos += length
+        return values
+
+    return decode
+
+
+def _column_decoder(column: dict) -> Callable[[bytes], Any]:
+    decoder = _SCALAR_DECODERS.get(column["type"])
+    if decoder is None:
+        raise ArchiveError(
+            f"Type non supporté pour la colonne {column['name']}: {column['type']}"
+        )
+    return _array_decoder(decoder) if column["array"] else decoder
+
+
+class _CopyBinaryDecoder:
+    """
+    Décodeur incrémental du format COPY BINARY de PostgreSQL.
+    Accepte des morceaux arbitraires et ne renvoie que les tuples complets.
+    """
+
+    def __init__(self, decoders: list[Callable[[bytes], Any]]):
+        self._decoders = decoders
+        self._buffer = bytearray()
+        self._header_done = False
+        self.finished = False
+
+    def feed(self, data: bytes) -> list[tuple]:
+        buf = self._buffer
+        buf += data
+        pos = 0
+
+        if not self._header_done:
+            if len(buf) < _COPY_HEADER_SIZE:
+                return []
+            if bytes(buf[: len(_COPY_SIGNATURE)]) != _COPY_SIGNATURE:
+                raise ArchiveError("Signature COPY BINARY invalide")
+            (extension_len,) = _INT32.unpack_from(buf, len(_COPY_SIGNATURE) + 4)
+            if len(buf) < _COPY_HEADER_SIZE + extension_len:
+                return []
+            pos = _COPY_HEADER_SIZE + extension_len
+            self._header_done = True
+
+        rows = []
+        size = len(buf)
+        while size - pos >= 2:
+            (field_count,) = _INT16.unpack_from(buf, pos)
+            if field_count == -1:
+                self.finished = True
+                pos += 2
+                break
+
+            cursor = pos + 2
+            values = []
+            for index in range(field_count):
+                if size - cursor < 4:
+                    break
+                (length,) = _INT32.unpack_from(buf, cursor)
+                cursor += 4
+                if length == -1:
+                    values.append(None)
+                    continue
+                if size - cursor < length:
+                    break
+                values.append(self._decoders[index](bytes(buf[cursor : cursor + length])))
+                cursor += length
+            else:
+                rows.append(tuple(values))
+                pos = cursor
+                continue
+            # Tuple incomplet: attendre le morceau suivant
+            break
+
+        del buf[:pos]
+        return rows
+
+
+# =============================================================================
+# I/O ARCHIVE
+# =============================================================================
+
+
+def _write_frame(f: BinaryIO, data: bytes) -> None:
+    f.write(_FRAME_LEN.pack(len(data)))
+    if data:
+        f.write(data)
+
+
+def _write_json(f: BinaryIO, payload: dict) -> None:
+    _write_frame(f, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ArchiveError("Archive tronquée")
+    return data
+
+
+def _read_frame(f: BinaryIO) -> bytes:
+    (length,) = _FRAME_LEN.unpack(_read_exact(f, _FRAME_LEN.size))
+    return _read_exact(f, length) if length else b""
+
+
+def _read_json(f: BinaryIO) -> dict:
+    return json.loads(_read_frame(f).decode("utf-8"))
+
+
+def _iter_frames(f: BinaryIO) -> Iterator[bytes]:
+    """Itère sur les frames de données d'une section jusqu'à la frame vide"""
+    while True:
+        frame = _read_frame(f)
+        if not frame:
+            return
+        yield frame
+
+
+@contextmanager
+def _open_archive(target: str | Path | BinaryIO, mode: str, compresslevel: int = 6):
+    if isinstance(target, (str, Path)):
+        with gzip.open(target, mode, compresslevel=compresslevel) as f:
+            yield f
+    else:
+        with gzip.GzipFile(
+            fileobj=target, mode=mode, compresslevel=compresslevel
+        ) as f:
+            yield f
+
+
+def read_archive_header(f: BinaryIO) -> tuple[int, dict]:
+    """Lit et valide l'en-tête d'une archive (flux décompressé)"""
+    if _read_exact(f, len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+        raise ArchiveError("Ce fichier n'est pas une archive de partie LDVELH")
+    (version,) = _VERSION.unpack(_read_exact(f, _VERSION.size))
+    if version > ARCHIVE_FORMAT_VERSION:
+        raise ArchiveError(
+            f"Version d'archive {version} non supportée "
+            f"(max {ARCHIVE_FORMAT_VERSION})"
+        )
+    return version, _read_json(f)
+
+
+# =============================================================================
+# INTROSPECTION
+# =============================================================================
+
+
+async def _get_table_columns(conn: Connection, table: str) -> list[dict]:
+    """Colonnes d'une table avec leur type de base (enum générique)"""
+    rows = await conn.fetch(
+        """SELECT a.attname AS name,
+                  CASE WHEN t.typcategory = 'A' THEN et.typname ELSE t.typname END
+                    AS type_name,
+                  t.typcategory = 'A' AS is_array,
+                  CASE WHEN t.typcategory = 'A' THEN et.typtype ELSE t.typtype END = 'e'
+                    AS is_enum
+           FROM pg_attribute a
+           JOIN pg_type t ON t.oid = a.atttypid
+           LEFT JOIN pg_type et ON et.oid = t.typelem
+           WHERE a.attrelid = $1::regclass
+             AND a.attnum > 0 AND NOT a.attisdropped
+           ORDER BY a.attnum""",
+        table,
+    )
+    return [
+        {
+            "name": r["name"],
+            "type": "enum" if r["is_enum"] else r["type_name"],
+            "array": r["is_array"],
+        }
+        for r in rows
+    ]
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _parse_copy_status(status: str) -> int:
+    try:
+        return int(status.split()[-1])
+    except (AttributeError, IndexError, ValueError):
+        return 0
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+
+async def export_game(
+    conn: Connection,
+    game_id: UUID,
+    destination: str | Path | BinaryIO,
+    compresslevel: int = 6,
+) -> dict:
+    """
+    Exporte une partie complète dans une archive compressée.
+    Lecture dans un snapshot REPEATABLE READ pour une archive cohérente
+    (ou dans la transaction de l'appelant si elle existe déjà).
+
+    Returns:
+        Stats {game_id, tables: {table: nb_lignes}}
+    """
+    game = await conn.fetchrow(
+        "SELECT id, name, active, updated_at FROM games WHERE id = $1", game_id
+    )
+    if not game:
+        raise ValueError(f"Partie {game_id} introuvable")
+
+    table_counts: dict[str, int] = {}
+
+    with _open_archive(destination, "wb", compresslevel) as f:
+        f.write(ARCHIVE_MAGIC)
+        f.write(_VERSION.pack(ARCHIVE_FORMAT_VERSION))
+        _write_json(
+            f,
+            {
+                "game_id": str(game["id"]),
+                "name": game["name"],
+                "active": game["active"],
+                "updated_at": game["updated_at"].isoformat()
+                if game["updated_at"]
+                else None,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+                "tables": [table for table, _ in ARCHIVE_TABLES],
+            },
+        )
+
+        async def write_chunk(chunk: bytes) -> None:
+            _write_frame(f, bytes(chunk))
+
+        snapshot = (
+            nullcontext()
+            if conn.is_in_transaction()
+            else conn.transaction(isolation="repeatable_read", readonly=True)
+        )
+        async with snapshot:
+            for table, where in ARCHIVE_TABLES:
+                columns = await _get_table_columns(conn, table)
+                for column in columns:
+                    _column_decoder(column)  # Échoue tôt si type inconnu
+
+                f.write(_TAG_TABLE)
+                _write_json(f, {"table": table, "columns": columns})
+
+                column_list = ", ".join(_quote_ident(c["name"]) for c in columns)
+                status = await conn.copy_from_query(
+                    f"SELECT {column_list} FROM {table} WHERE {where}",
+                    game_id,
+                    output=write_chunk,
+                    format="binary",
+                )
+                _write_frame(f, b"")
+                table_counts[table] = _parse_copy_status(status)
+
+        f.write(_TAG_END)
+
+    logger.info(
+        f"[ARCHIVE] Export {game_id}: {sum(table_counts.values())} lignes "
+        f"({len(table_counts)} tables)"
+    )
+    return {"game_id": game_id, "tables": table_counts}
+
+
+# =============================================================================
+# IMPORT
+# =============================================================================
+
+
+class _UUIDRemapper:
+    """Associe chaque UUID de l'archive à un nouvel UUID (stable)"""
+
+    def __init__(self):
+        self.mapping: dict[UUID, UUID] = {}
+
+    def __call__(self, value: UUID | None) -> UUID | None:
+        if value is None:
+            return None
+        new_value = self.mapping.get(value)
+        if new_value is None:
+            new_value = self.mapping[value] = uuid4()
+        return new_value
+
+    def array(self, values: list | None) -> list | None:
+        if values is None:
+            return None
+        return [self(v) for v in values]
+
+
+class _UUIDIdentity(_UUIDRemapper):
+    """Conserve les UUID d'origine (restauration en place)"""
+
+    def __call__(self, value: UUID | None) -> UUID | None:
+        return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+async def _iter_section_records(
+    f: BinaryIO,
+    decoder: _CopyBinaryDecoder,
+    converters: list[tuple[int, Callable[[Any], Any]]],
+    counter: list[int],
+) -> AsyncIterator[tuple]:
+    for frame in _iter_frames(f):
+        for row in decoder.feed(frame):
+            counter[0] += 1
+            yield tuple(convert(row[index]) for index, convert in converters)
+    if not decoder.finished:
+        raise ArchiveError("Section COPY incomplète")
+
+
+async def import_game(
+    conn: Connection,
+    source: str | Path | BinaryIO,
+    name: str | None = None,
+    active: bool | None = None,
+    into_existing_game: bool = False,
+) -> dict:
+    """
+    Importe une archive comme nouvelle partie.
+    Tous les UUID (id, clés étrangères, npcs_present...) sont remappés:
+    l'import ne peut jamais entrer en collision avec une partie existante.
+    Les colonnes absentes du schéma cible sont ignorées.
+
+    Avec into_existing_game=True (restauration depuis le cold storage),
+    les UUID d'origine sont conservés et la ligne games, toujours
+    présente, n'est pas réinsérée.
+
+    Returns:
+        Stats {game_id, source_game_id, tables: {table: nb_lignes}}
+    """
+    remap = _UUIDIdentity() if into_existing_game else _UUIDRemapper()
+    table_counts: dict[str, int] = {}
+
+    with _open_archive(source, "rb") as f:
+        _version, header = read_archive_header(f)
+        source_game_id = UUID(header["game_id"])
+
+        async with conn.transaction():
+            while True:
+                tag = _read_exact(f, 1)
+                if tag == _TAG_END:
+                    break
+                if tag != _TAG_TABLE:
+                    raise ArchiveError(f"Section inconnue: {tag!r}")
+
+                section = _read_json(f)
+                table = section["table"]
+                columns = section["columns"]
+                if table not in _ARCHIVE_TABLE_NAMES:
+                    raise ArchiveError(f"Table inattendue dans l'archive: {table}")
+
+                if into_existing_game and table == "games":
+                    for _ in _iter_frames(f):
+                        pass
+                    remap.mapping[source_game_id] = source_game_id
+                    continue
+
+                target_names = {c["name"] for c in await _get_table_columns(conn, table)}
+                skipped = [c["name"] for c in columns if c["name"] not in target_names]
+                if skipped:
+                    logger.warning(f"[ARCHIVE] {table}: colonnes ignorées {skipped}")
+
+                converters: list[tuple[int, Callable[[Any], Any]]] = []
+                for index, column in enumerate(columns):
+                    if column["name"] not in target_names:
+                        continue
+                    convert = _identity
+                    if column["type"] == "uuid":
+                        convert = remap.array if column["array"] else remap
+                    elif table == "games" and column["name"] == "name" and name:
+                        convert = lambda _value, _name=name: _name  # noqa: E731
+                    elif (
+                        table == "games"
+                        and column["name"] == "active"
+                        and active is not None
+                    ):
+                        convert = lambda _value, _active=active: _active  # noqa: E731
+                    converters.append((index, convert))
+
+                decoder = _CopyBinaryDecoder([_column_decoder(c) for c in columns])
+                counter = [0]
+                await conn.copy_records_to_table(
+                    table,
+                    records=_iter_section_records(f, decoder, converters, counter),
+                    columns=[columns[index]["name"] for index, _ in converters],
+                )
+                table_counts[table] = counter[0]
+
+            new_game_id = remap.mapping.get(source_game_id)
+            if new_game_id is None:
+                raise ArchiveError("L'archive ne contient pas la ligne games")
+
+    logger.info(
+        f"[ARCHIVE] Import {source_game_id} → {new_game_id}: "
+        f"{sum(table_counts.values())} lignes"
+    )
+    return {
+        "game_id": new_game_id,
+        "source_game_id": source_game_id,
+        "tables": table_counts,
+    }
+
+
+# =============================================================================
+# COLD STORAGE
+# =============================================================================
+
+# Tables portant game_id, dans l'ordre de purge (enfants d'abord).
+# Les tables typées / participants partent en CASCADE.
+_PURGE_TABLES = tuple(
+    table for table, where in reversed(ARCHIVE_TABLES) if where == _GAME_FILTER
+)
+
+
+async def find_archivable_games(conn: Connection, inactive_days: int) -> list[UUID]:
+    """Parties sans activité depuis inactive_days jours et pas encore archivées"""
+    rows = await conn.fetch(
+        """SELECT g.id FROM games g
+           WHERE g.updated_at < now() - make_interval(days => $1)
+             AND NOT EXISTS (SELECT 1 FROM game_archives ga WHERE ga.game_id = g.id)
+           ORDER BY g.updated_at""",
+        inactive_days,
+    )
+    return [r["id"] for r in rows]
+
+
+async def archive_game(
+    conn: Connection, game_id: UUID, compresslevel: int = 9
+) -> dict | None:
+    """
+    Déplace une partie vers le cold storage:
+    export compressé dans game_archives puis purge des tables chaudes.
+    La ligne games est conservée (liste des parties, restauration).
+
+    En REPEATABLE READ, export et purge voient le même instantané: une
+    ligne ne peut pas être purgée sans avoir été exportée. Une écriture
+    concurrente sur la partie (qui incrémente games.kg_version) fait
+    échouer le verrou (SerializationError), et la transaction est annulée
+    si des lignes chaudes subsistent après la purge.
+
+    Returns:
+        Stats de l'archive, ou None si la partie est déjà archivée
+    """
+    async with conn.transaction(isolation="repeatable_read"):
+        # Verrou: empêche un archivage/restauration concurrent
+        game = await conn.fetchrow(
+            "SELECT id FROM games WHERE id = $1 FOR UPDATE", game_id
+        )
+        if not game:
+            raise ValueError(f"Partie {game_id} introuvable")
+        if await conn.fetchval(
+            "SELECT EXISTS(SELECT 1 FROM game_archives WHERE game_id = $1)", game_id
+        ):
+            return None
+
+        last = await conn.fetchrow(
+            """SELECT
+                 (SELECT MAX(cycle) FROM chat_messages WHERE game_id = $1) AS cycle,
+                 (SELECT date FROM cycle_summaries
+                  WHERE game_id = $1 ORDER BY cycle DESC LIMIT 1) AS date""",
+            game_id,
+        )
+
+        buffer = io.BytesIO()
+        stats = await export_game(conn, game_id, buffer, compresslevel=compresslevel)
+        data = buffer.getvalue()
+
+        await conn.execute(
+            """INSERT INTO game_archives
+                 (game_id, format_version, last_cycle, last_date, size_bytes, data)
+               VALUES ($1, $2, $3, $4, $5, $6)""",
+            game_id,
+            ARCHIVE_FORMAT_VERSION,
+            last["cycle"] or 0,
+            last["date"],
+            len(data),
+            data,
+        )
+
+        for table in _PURGE_TABLES:
+            await conn.execute(f"DELETE FROM {table} WHERE game_id = $1", game_id)
+
+        remaining = [
+            table
+            for table in _PURGE_TABLES
+            if await conn.fetchval(
+                f"SELECT EXISTS(SELECT 1 FROM {table} WHERE game_id = $1)", game_id
+            )
+        ]
+        if remaining:
+            raise ArchiveError(
+                f"Lignes restantes après purge ({', '.join(remaining)}), "
+                f"archivage de {game_id} annulé"
+            )
+
+    logger.info(
+        f"[ARCHIVE] Partie {game_id} archivée: "
+        f"{sum(stats['tables'].values())} lignes, {len(data) / 1024:.1f} Ko"
+    )
+    return {**stats, "size_bytes": len(data)}
+
+
+async def restore_game(conn: Connection, game_id: UUID) -> dict | None:
+    """
+    Restaure une partie depuis le cold storage (UUID d'origine conservés).
+
+    Returns:
+        Stats d'import, ou None si la partie n'était pas archivée
+    """
+    async with conn.transaction():
+        data = await conn.fetchval(
+            "SELECT data FROM game_archives WHERE game_id = $1 FOR UPDATE", game_id
+        )
+        if data is None:
+            return None
+
+        stats = await import_game(conn, io.BytesIO(data), into_existing_game=True)
+        await conn.execute("DELETE FROM game_archives WHERE game_id = $1", game_id)
+        # Sinon la partie, toujours inactive, repart au prochain archivage
+        await conn.execute("UPDATE games SET updated_at = NOW() WHERE id = $1", game_id)
+
+    logger.info(
+        f"[ARCHIVE] Partie {game_id} restaurée: {sum(stats['tables'].values())} lignes"
+    )
+    return stats
@@ -95,6 +95,9 @@ class KnowledgeGraphPopulator:
         self.pool = pool
         self.game_id = game_id
         self.registry = EntityRegistry()
+        # Entités dont le nom, les attributs ou les relations ont changé
+        # (index des tooltips à mettre à jour après commit)
+        self.touched_entities: set[UUID] = set()
 
     # =========================================================================
     # REGISTRY (utilise reader pour charger)
@@ -142,7 +145,9 @@ class KnowledgeGraphPopulator:
         """Renomme une partie"""
         target_id = game_id or self.game_id
         await conn.execute(
-            "UPDATE games SET name = $1, updated_at = NOW() WHERE id = $2",
+            """UPDATE games SET name = $1, updated_at = NOW(),
+                      kg_version = kg_version + 1
+               WHERE id = $2""",
             name,
             target_id,
         )
@@ -192,6 +197,7 @@ class KnowledgeGraphPopulator:
             unknown_name,
         )
         self.registry.register(name, entity_id, entity_type)
+        self.touched_entities.add(entity_id)
 
         # Insert into typed table (FK only)
         await self._insert_typed_entity_row(conn, entity_type, entity_id)
@@ -226,6 +232,7 @@ class KnowledgeGraphPopulator:
             reason,
             entity_id,
         )
+        self.touched_entities.add(entity_id)
         return True
 
     # =========================================================================
@@ -299,6 +306,7 @@ class KnowledgeGraphPopulator:
                 known,
             )
             count += 1
+            self.touched_entities.add(entity_id)
             logger.debug(
                 f"[ATTR] {attr.key.value}={attr.value[:50]}... (known={known})"
             )
@@ -334,6 +342,9 @@ class KnowledgeGraphPopulator:
         )
         for skill in data.skills:
             await self.set_skill(conn, entity_id, skill, cycle)
+
+        # Jauges typées initialisées depuis les attributs de départ
+        await conn.execute("SELECT ensure_protagonist_gauges($1)", self.game_id)
         return entity_id
 
     async def create_character(
@@ -515,6 +526,7 @@ class KnowledgeGraphPopulator:
         )
 
         await self._insert_typed_relation_data(conn, rel_id, data)
+        self.touched_entities.update((source_id, target_id))
         return rel_id
 
     async def _insert_typed_relation_data(
@@ -592,6 +604,14 @@ class KnowledgeGraphPopulator:
         reason: str | None = None,
     ) -> bool:
         """End an existing relation via la fonction SQL end_relation"""
+        self.touched_entities.update(
+            entity_id
+            for entity_id in (
+                self.registry.resolve(source_ref),
+                self.registry.resolve(target_ref),
+            )
+            if entity_id
+        )
         return await conn.fetchval(
             "SELECT end_relation($1, $2, $3, $4, $5, $6)",
             self.game_id,
@@ -624,6 +644,7 @@ class KnowledgeGraphPopulator:
             target_id,
             relation_type.value,
         )
+        self.touched_entities.update((source_id, target_id))
         return True
 
     # =========================================================================
@@ -785,7 +806,9 @@ class KnowledgeGraphPopulator:
         if not message_ids:
             return 0
         result = await conn.execute(
-            "DELETE FROM chat_messages WHERE id = ANY($1)", message_ids
+            "DELETE FROM chat_messages WHERE game_id = $1 AND id = ANY($2)",
+            self.game_id,
+            message_ids,
         )
         return int(result.split()[-1])
 
@@ -846,6 +869,18 @@ class KnowledgeGraphPopulator:
 
         return stats
 
+    async def compact_attributes(
+        self, conn: Connection, horizon: int, drop: bool = False
+    ) -> int:
+        """
+        Sort de la table attributes les versions remplacées depuis plus de
+        `horizon` cycles (historique ou suppression selon `drop`).
+        Retourne le nombre de versions déplacées.
+        """
+        return await conn.fetchval(
+            "SELECT compact_attributes($1, $2, $3)", self.game_id, horizon, drop
+        )
+
     # =========================================================================
     # ENTITY UPDATES
     # =========================================================================
@@ -862,11 +897,13 @@ class KnowledgeGraphPopulator:
             new_aliases,
             entity_id,
         )
+        self.touched_entities.add(entity_id)
 
     async def mark_entity_known(
         self, conn: Connection, entity_id: UUID, real_name: str | None = None
     ) -> None:
         """Marque une entité comme connue par le protagoniste"""
+        self.touched_entities.add(entity_id)
         if real_name:
             await conn.execute(
                 """UPDATE entities 
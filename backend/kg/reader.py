@@ -42,9 +42,11 @@ class KnowledgeGraphReader:
         query = """
             SELECT 
                 g.id, g.name, g.active, g.created_at, g.updated_at,
-                COALESCE(msg.max_cycle, 0) AS current_cycle,
-                cs.date AS current_date
+                COALESCE(msg.max_cycle, ga.last_cycle, 0) AS current_cycle,
+                COALESCE(cs.date, ga.last_date) AS current_date,
+                ga.game_id IS NOT NULL AS archived
             FROM games g
+            LEFT JOIN game_archives ga ON ga.game_id = g.id
             LEFT JOIN LATERAL (
                 SELECT MAX(cycle) as max_cycle 
                 FROM chat_messages WHERE game_id = g.id
@@ -67,7 +69,10 @@ class KnowledgeGraphReader:
         """Récupère une partie par ID"""
         target_id = game_id or self.game_id
         row = await conn.fetchrow(
-            "SELECT id, name, active, created_at, updated_at FROM games WHERE id = $1",
+            """SELECT g.id, g.name, g.active, g.created_at, g.updated_at,
+                      EXISTS(SELECT 1 FROM game_archives ga WHERE ga.game_id = g.id)
+                        AS archived
+               FROM games g WHERE g.id = $1""",
             target_id,
         )
         return dict(row) if row else None
@@ -105,6 +110,24 @@ class KnowledgeGraphReader:
         )
         return result or 0
 
+    async def get_rollback_floor(self, conn: Connection) -> int:
+        """Cycle minimal atteignable par rollback (versions supprimées en deçà)"""
+        result = await conn.fetchval(
+            "SELECT attributes_rollback_floor FROM games WHERE id = $1",
+            self.game_id,
+        )
+        return result or 0
+
+    async def get_kg_version(self, conn: Connection) -> int | None:
+        """
+        Version du KG (incrémentée à chaque transaction d'écriture).
+        None si la partie n'existe pas ou est désactivée.
+        """
+        return await conn.fetchval(
+            "SELECT kg_version FROM games WHERE id = $1 AND active = true",
+            self.game_id,
+        )
+
     async def get_date_for_cycle(self, conn: Connection, cycle: int) -> str | None:
         """Récupère la date pour un cycle donné"""
         return await conn.fetchval(
@@ -274,10 +297,14 @@ class KnowledgeGraphReader:
         )
         return [dict(r) for r in rows]
 
+    # Relations qui situent un personnage, par ordre de priorité
+    _LOCATION_RELATIONS = ("works_at", "lives_at", "frequents")
+
     async def get_known_characters(self, conn: Connection) -> list[dict]:
         """
         Récupère les PNJs connus du protagoniste via v_characters_context.
-        Inclut la localisation via v_active_relations.
+        Inclut la localisation (works_at > lives_at > frequents) en une
+        seule requête: jointure sur l'ensemble des relations de lieu.
         Triés par niveau de relation décroissant.
         """
         rows = await conn.fetch(
@@ -293,33 +320,48 @@ class KnowledgeGraphReader:
                 cc.mood,
                 cc.relation_level,
                 cc.relation_context,
-                (SELECT ar.target_name 
-                 FROM v_active_relations ar
-                 WHERE ar.source_id = cc.entity_id
-                   AND ar.relation_type IN ('works_at', 'lives_at', 'frequents')
-                 LIMIT 1) as location
+                loc.location
             FROM v_characters_context cc
+            LEFT JOIN (
+                SELECT DISTINCT ON (r.source_id)
+                    r.source_id, t.name as location
+                FROM relations r
+                JOIN entities t ON t.id = r.target_id AND t.removed_cycle IS NULL
+                WHERE r.game_id = $1
+                  AND r.end_cycle IS NULL
+                  AND r.type = ANY($2::relation_type[])
+                ORDER BY r.source_id, array_position($2::relation_type[], r.type),
+                         r.start_cycle DESC
+            ) loc ON loc.source_id = cc.entity_id
             WHERE cc.game_id = $1
             ORDER BY COALESCE(cc.relation_level, 0) DESC, cc.name ASC
             """,
             self.game_id,
+            list(self._LOCATION_RELATIONS),
         )
         return [dict(r) for r in rows]
 
     async def get_character_location(
         self, conn: Connection, character_id: UUID
     ) -> str | None:
-        """Récupère le lieu associé à un personnage (works_at, lives_at, frequents)"""
+        """
+        Récupère le lieu associé à un personnage (works_at > lives_at > frequents).
+        Pour une liste de personnages, préférer get_known_characters.
+        """
         return await conn.fetchval(
             """
-            SELECT target_name FROM v_active_relations
-            WHERE game_id = $1 
-              AND source_id = $2
-              AND relation_type IN ('works_at', 'lives_at', 'frequents')
+            SELECT t.name FROM relations r
+            JOIN entities t ON t.id = r.target_id AND t.removed_cycle IS NULL
+            WHERE r.game_id = $1
+              AND r.source_id = $2
+              AND r.end_cycle IS NULL
+              AND r.type = ANY($3::relation_type[])
+            ORDER BY array_position($3::relation_type[], r.type), r.start_cycle DESC
             LIMIT 1
             """,
             self.game_id,
             character_id,
+            list(self._LOCATION_RELATIONS),
         )
 
     async def get_top_related_npcs(
@@ -556,13 +598,25 @@ class KnowledgeGraphReader:
         return dict(row) if row else None
 
     async def get_protagonist_stats(self, conn: Connection) -> dict | None:
-        """Récupère seulement les stats du protagoniste"""
+        """Récupère seulement les stats du protagoniste (lookup par clé primaire)"""
         row = await conn.fetchrow(
-            "SELECT energy, morale, health, credits FROM v_protagonist WHERE game_id = $1",
+            """SELECT energy, morale, health, credits
+               FROM protagonist_gauges WHERE game_id = $1""",
             self.game_id,
         )
         return dict(row) if row else None
 
+    async def get_gauge_history(self, conn: Connection) -> list[dict]:
+        """Historique des jauges et crédits, ordre chronologique"""
+        rows = await conn.fetch(
+            """SELECT gauge, cycle, old_value, new_value, description, created_at
+               FROM protagonist_gauge_history
+               WHERE game_id = $1
+               ORDER BY cycle, created_at""",
+            self.game_id,
+        )
+        return [dict(r) for r in rows]
+
     async def get_protagonist_with_skills(self, conn: Connection) -> dict | None:
         """
         Récupère le protagoniste avec skills et employer.
@@ -1065,3 +1119,79 @@ class KnowledgeGraphReader:
             limit,
         )
         return [dict(r) for r in rows]
+
+    # =========================================================================
+    # TOOLTIPS
+    # =========================================================================
+
+    async def get_tooltip_entities(
+        self,
+        conn: Connection,
+        entity_ids: list[UUID] | None = None,
+        known_only: bool = True,
+    ) -> list[dict]:
+        """
+        Entités avec leurs attributs actifs et leur relation au protagoniste.
+        entity_ids restreint le calcul (mise à jour incrémentale de l'index).
+        Sans game_id, interroge par ID seul (entity_ids requis).
+        """
+        params: list = []
+        conditions = []
+        if self.game_id is not None:
+            params.append(self.game_id)
+            conditions.append(f"e.game_id = ${len(params)}")
+        if entity_ids is not None:
+            params.append(entity_ids)
+            conditions.append(f"e.id = ANY(${len(params)})")
+        if known_only:
+            conditions.append("e.known_by_protagonist = true")
+            conditions.append("e.removed_cycle IS NULL")
+        if not conditions:
+            raise ValueError("game_id ou entity_ids requis")
+
+        known_filter = "AND a.known_by_protagonist = true" if known_only else ""
+        rows = await conn.fetch(
+            f"""SELECT
+                e.id AS entite_id,
+                e.type AS entite_type,
+                e.name AS entite_nom,
+                e.aliases AS alias,
+                COALESCE(attrs.connaissances, '{{}}'::jsonb) AS connaissances,
+                rel.relation_valentin
+               FROM entities e
+               LEFT JOIN LATERAL (
+                 SELECT jsonb_object_agg(a.key, a.value) AS connaissances
+                 FROM attributes a
+                 WHERE a.game_id = e.game_id
+                   AND a.entity_id = e.id
+                   AND a.end_cycle IS NULL
+                   {known_filter}
+               ) attrs ON true
+               LEFT JOIN LATERAL (
+                 SELECT jsonb_build_object('type', r.type) AS relation_valentin
+                 FROM relations r
+                 JOIN entities p ON p.id = r.target_id AND p.type = 'protagonist'
+                 WHERE r.game_id = e.game_id
+                   AND r.source_id = e.id
+                   AND r.end_cycle IS NULL
+                 ORDER BY r.start_cycle DESC
+                 LIMIT 1
+               ) rel ON true
+               WHERE {" AND ".join(conditions)}""",
+            *params,
+        )
+        return [
+            {
+                **dict(r),
+                "connaissances": _json_object(r["connaissances"]),
+                "relation_valentin": _json_object(r["relation_valentin"]) or None,
+            }
+            for r in rows
+        ]
+
+
+def _json_object(value) -> dict:
+    """jsonb renvoyé en str (sans codec) ou déjà décodé"""
+    if value is None:
+        return {}
+    return json.loads(value) if isinstance(value, str) else dict(value)
@@ -28,6 +28,8 @@ from schema import (
     RelationType,
 )
 
+from utils.tracing import span
+
 from .populator import KnowledgeGraphPopulator
 from .reader import KnowledgeGraphReader
 
@@ -295,110 +297,158 @@ class ExtractionPopulator(KnowledgeGraphPopulator):
                     await self.load_registry(conn)
 
                 # 1. Create new entities (unified EAV format)
-                for entity in extraction.entities_created:
-                    try:
-                        await self._process_entity_creation(conn, entity, cycle)
-                        stats["entities_created"] += 1
-                    except Exception as e:
-                        logger.error(f"Entity creation error: {e}")
-                        stats["errors"].append(f"Entity creation: {e}")
+                with span(
+                    "populate.entities_created", count=len(extraction.entities_created)
+                ):
+                    for entity in extraction.entities_created:
+                        try:
+                            await self._process_entity_creation(conn, entity, cycle)
+                            stats["entities_created"] += 1
+                        except Exception as e:
+                            logger.error(f"Entity creation error: {e}")
+                            stats["errors"].append(f"Entity creation: {e}")
 
                 # 2. Create objects from acquisition
-                for obj_creation in extraction.objects_created:
-                    try:
-                        await self._process_object_creation(conn, obj_creation, cycle)
-                        stats["objects_created"] += 1
-                    except Exception as e:
-                        logger.error(f"Object creation error: {e}")
-                        stats["errors"].append(f"Object creation: {e}")
+                with span(
+                    "populate.objects_created", count=len(extraction.objects_created)
+                ):
+                    for obj_creation in extraction.objects_created:
+                        try:
+                            await self._process_object_creation(
+                                conn, obj_creation, cycle
+                            )
+                            stats["objects_created"] += 1
+                        except Exception as e:
+                            logger.error(f"Object creation error: {e}")
+                            stats["errors"].append(f"Object creation: {e}")
 
                 # 3. Process entity updates
-                for update in extraction.entities_updated:
-                    try:
-                        await self._process_entity_update(conn, update, cycle)
-                        stats["entities_updated"] += 1
-                    except Exception as e:
-                        stats["errors"].append(f"Entity update: {e}")
+                with span(
+                    "populate.entities_updated", count=len(extraction.entities_updated)
+                ):
+                    for update in extraction.entities_updated:
+                        try:
+                            await self._process_entity_update(conn, update, cycle)
+                            stats["entities_updated"] += 1
+                        except Exception as e:
+                            stats["errors"].append(f"Entity update: {e}")
 
                 # 4. Process entity removals
-                for removal in extraction.entities_removed:
-                    await self.remove_entity(
-                        conn, removal.entity_ref, removal.cycle, removal.reason
-                    )
+                with span(
+                    "populate.entities_removed", count=len(extraction.entities_removed)
+                ):
+                    for removal in extraction.entities_removed:
+                        await self.remove_entity(
+                            conn, removal.entity_ref, removal.cycle, removal.reason
+                        )
 
                 # 5. Create facts
-                for fact in extraction.facts:
-                    result = await self.create_fact(conn, fact)
-                    if result:
-                        stats["facts_created"] += 1
+                with span("populate.facts", count=len(extraction.facts)):
+                    for fact in extraction.facts:
+                        result = await self.create_fact(conn, fact)
+                        if result:
+                            stats["facts_created"] += 1
 
                 # 6. Create new relations (NO owns)
-                for rel_creation in extraction.relations_created:
-                    if rel_creation.relation.relation_type == RelationType.OWNS:
-                        continue
-                    result = await self.create_relation(
-                        conn, rel_creation.relation, rel_creation.cycle
-                    )
-                    if result:
-                        stats["relations_created"] += 1
+                with span(
+                    "populate.relations_created",
+                    count=len(extraction.relations_created),
+                ):
+                    for rel_creation in extraction.relations_created:
+                        if rel_creation.relation.relation_type == RelationType.OWNS:
+                            continue
+                        result = await self.create_relation(
+                            conn, rel_creation.relation, rel_creation.cycle
+                        )
+                        if result:
+                            stats["relations_created"] += 1
 
                 # 7. End relations
-                for rel_end in extraction.relations_ended:
-                    await self.end_relation(
-                        conn,
-                        rel_end.source_ref,
-                        rel_end.target_ref,
-                        rel_end.relation_type,
-                        rel_end.cycle,
-                        rel_end.reason,
-                    )
-                    stats["relations_ended"] += 1
+                with span(
+                    "populate.relations_ended", count=len(extraction.relations_ended)
+                ):
+                    for rel_end in extraction.relations_ended:
+                        await self.end_relation(
+                            conn,
+                            rel_end.source_ref,
+                            rel_end.target_ref,
+                            rel_end.relation_type,
+                            rel_end.cycle,
+                            rel_end.reason,
+                        )
+                        stats["relations_ended"] += 1
 
                 # 8. Process gauge changes
-                for gauge in extraction.gauge_changes:
-                    success, _, _ = await self.update_gauge(
-                        conn, gauge.gauge, gauge.delta, cycle
-                    )
-                    if success:
-                        stats["gauges_changed"] += 1
+                with span(
+                    "populate.gauge_changes", count=len(extraction.gauge_changes)
+                ):
+                    for gauge in extraction.gauge_changes:
+                        success, _, _ = await self.update_gauge(
+                            conn, gauge.gauge, gauge.delta, cycle
+                        )
+                        if success:
+                            stats["gauges_changed"] += 1
 
                 # 9. Process credit transactions
-                for tx in extraction.credit_transactions:
-                    success, _, error = await self.credit_transaction(
-                        conn, tx.amount, cycle, tx.description
-                    )
-                    if success:
-                        stats["credits_changed"] += 1
-                    elif error:
-                        stats["errors"].append(f"Credits: {error}")
+                with span(
+                    "populate.credit_transactions",
+                    count=len(extraction.credit_transactions),
+                ):
+                    for tx in extraction.credit_transactions:
+                        success, _, error = await self.credit_transaction(
+                            conn, tx.amount, cycle, tx.description
+                        )
+                        if success:
+                            stats["credits_changed"] += 1
+                        elif error:
+                            stats["errors"].append(f"Credits: {error}")
 
                 # 10. Process inventory changes
-                for inv in extraction.inventory_changes:
-                    await self._process_inventory_change(conn, inv, cycle)
+                with span(
+                    "populate.inventory_changes",
+                    count=len(extraction.inventory_changes),
+                ):
+                    for inv in extraction.inventory_changes:
+                        await self._process_inventory_change(conn, inv, cycle)
 
                 # 11. Create commitments
-                for commit in extraction.commitments_created:
-                    await self._create_extraction_commitment(conn, commit, cycle)
-                    stats["commitments_created"] += 1
+                with span(
+                    "populate.commitments_created",
+                    count=len(extraction.commitments_created),
+                ):
+                    for commit in extraction.commitments_created:
+                        await self._create_extraction_commitment(conn, commit, cycle)
+                        stats["commitments_created"] += 1
 
                 # 12. Resolve commitments
-                for resolution in extraction.commitments_resolved:
-                    await self._resolve_extraction_commitment(conn, resolution, cycle)
+                with span(
+                    "populate.commitments_resolved",
+                    count=len(extraction.commitments_resolved),
+                ):
+                    for resolution in extraction.commitments_resolved:
+                        await self._resolve_extraction_commitment(
+                            conn, resolution, cycle
+                        )
 
                 # 13. Schedule events
-                for event in extraction.events_scheduled:
-                    await self._schedule_extraction_event(conn, event, cycle)
+                with span(
+                    "populate.events_scheduled", count=len(extraction.events_scheduled)
+                ):
+                    for event in extraction.events_scheduled:
+                        await self._schedule_extraction_event(conn, event, cycle)
 
                 # 14. Store extraction log
-                await self.log_extraction(conn, cycle, stats)
+                with span("populate.extraction_log"):
+                    await self.log_extraction(conn, cycle, stats)
 
                 # 15. Store cycle summary
-                await self.save_cycle_summary(
-                    conn,
-                    cycle,
-                    summary=extraction.segment_summary,
-                    key_events={"npcs_present": extraction.key_npcs_present},
-                )
+                with span("populate.cycle_summary"):
+                    await self.save_cycle_summary(
+                        conn,
+                        cycle,
+                        summary=extraction.segment_summary,
+                        key_events={"npcs_present": extraction.key_npcs_present},
+                    )
 
         return stats
 
@@ -3,21 +3,85 @@ LDVELH - FastAPI Application
 Point d'entrée principal
 """
 
+import asyncio
 import os
+import time
 from contextlib import asynccontextmanager
 
 import asyncpg
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.dependencies import require_admin
+from api.responses import FastJSONResponse
 from config import get_settings
+from utils.llm_recording import configure_recording
+from utils.loop_monitor import start_loop_monitor
+from utils.metrics import CONTENT_TYPE, registry
+from utils.offload import configure_offload
+from utils.pool import InstrumentedPool
+from utils.query_stats import query_stats
+from utils.tracing import configure_tracing
 
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
-# Pool de connexions global
-db_pool: asyncpg.Pool | None = None
+# Pool de connexions global (instrumenté pour /metrics)
+db_pool: InstrumentedPool | None = None
+
+
+async def _maintenance_loop(pool: asyncpg.Pool, settings) -> None:
+    """
+    Job périodique:
+    - déplace les parties inactives vers le cold storage
+    - compacte les versions d'attributs au-delà de l'horizon de rollback
+    """
+    from services.game_service import GameService
+
+    service = GameService(pool)
+    while True:
+        if settings.archive_inactive_days > 0:
+            try:
+                archived = await service.archive_inactive_games(
+                    settings.archive_inactive_days
+                )
+                if archived:
+                    print(f"[ARCHIVE] {len(archived)} partie(s) archivée(s)")
+            except Exception as e:
+                print(f"[ARCHIVE] Erreur job d'archivage: {e}")
+
+        if settings.attribute_rollback_horizon > 0:
+            try:
+                compacted = await service.compact_attributes(
+                    settings.attribute_rollback_horizon,
+                    drop=settings.attribute_retention == "drop",
+                )
+                if compacted:
+                    print(f"[COMPACTION] {compacted} version(s) d'attributs compactée(s)")
+            except Exception as e:
+                print(f"[COMPACTION] Erreur job de compaction: {e}")
+
+        await asyncio.sleep(settings.maintenance_interval_hours * 3600)
+
+
+async def _warm_up() -> None:
+    """
+    Charge en arrière-plan ce qui a été rendu paresseux (client anthropic,
+    tables de normalisation) et exerce les modèles Pydantic chauds, pour
+    que la première requête n'en paie pas le coût. Dans un thread: imports
+    et validations bloqueraient la boucle.
+    """
+    from services.llm_service import get_llm_service
+    from services.warmup import warm_up
+
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(get_llm_service)
+        await asyncio.to_thread(warm_up)
+        print(f"[STARTUP] Warm-up terminé en {(time.perf_counter() - start) * 1000:.0f}ms")
+    except Exception as e:
+        print(f"[STARTUP] Erreur warm-up: {e}")
 
 
 @asynccontextmanager
@@ -26,16 +90,45 @@ async def lifespan(app: FastAPI):
     global db_pool
 
     settings = get_settings()
+    configure_tracing(
+        settings.trace_exporter, settings.trace_file, settings.trace_slow_turn_ms
+    )
+    query_stats.configure(settings.db_slow_query_ms, settings.db_explain_slow_queries)
+    configure_offload(settings.offload_min_bytes)
+    configure_recording(settings.llm_record_file)
+    loop_monitor_task = start_loop_monitor(
+        settings.loop_lag_interval_ms, settings.loop_block_ms
+    )
 
     # Startup: créer le pool de connexions
     print("[STARTUP] Connexion à la base de données...")
-    db_pool = await asyncpg.create_pool(
-        settings.database_url, min_size=2, max_size=10, command_timeout=60
+    db_pool = InstrumentedPool(
+        await asyncpg.create_pool(
+            settings.database_url, min_size=2, max_size=10, command_timeout=60
+        )
     )
+    registry.register_collector(db_pool.collect_metrics)
     print("[STARTUP] Pool de connexions créé")
 
+    maintenance_task = None
+    if settings.archive_inactive_days > 0 or settings.attribute_rollback_horizon > 0:
+        maintenance_task = asyncio.create_task(_maintenance_loop(db_pool, settings))
+        print(
+            f"[STARTUP] Maintenance activée (cold storage: "
+            f"{settings.archive_inactive_days} j, horizon attributs: "
+            f"{settings.attribute_rollback_horizon} cycles)"
+        )
+
+    warm_up_task = asyncio.create_task(_warm_up())
+
     yield
 
+    warm_up_task.cancel()
+    if maintenance_task:
+        maintenance_task.cancel()
+    if loop_monitor_task:
+        loop_monitor_task.cancel()
+
     # Shutdown: fermer le pool
     print("[SHUTDOWN] Fermeture du pool de connexions...")
     if db_pool:
@@ -49,6 +142,7 @@ app = FastAPI(
     description="API pour le jeu de rôle narratif LDVELH",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS
@@ -58,6 +152,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Trace-Id"],
 )
 
 
@@ -70,8 +165,10 @@ def get_db_pool() -> asyncpg.Pool:
 
 # Import des routes après la création de l'app pour éviter les imports circulaires
 from api.routes import router
+from api.tooltips import router as tooltips_router
 
 app.include_router(router, prefix="/api")
+app.include_router(tooltips_router, prefix="/api")
 
 
 @app.get("/health")
@@ -80,6 +177,14 @@ async def health_check():
     return {"status": "healthy", "service": "ldvelh-api"}
 
 
+@app.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(require_admin)]
+)
+async def metrics():
+    """Métriques Prometheus (LLM, pool, SSE, extraction), debug ou jeton admin"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
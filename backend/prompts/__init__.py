@@ -3,41 +3,33 @@ LDVELH - Prompts Module
 System prompts pour Claude
 """
 
-from prompts.narrator_prompt import (
-    NARRATOR_SYSTEM_PROMPT,
-    build_narrator_context_prompt,
-)
-from prompts.world_generation_prompt import (
-    get_full_generation_prompt,
-    WORLD_GENERATION_SYSTEM_PROMPT,
-)
-from prompts.extractor_prompts import (
-    # Résumé
-    SUMMARY_SYSTEM,
-    build_summary_prompt,
-    # État protagoniste
-    PROTAGONIST_STATE_SYSTEM,
-    build_protagonist_state_prompt,
-    # Entités
-    ENTITIES_SYSTEM,
-    build_entities_prompt,
-    # Objets acquis
-    OBJECTS_SYSTEM,
-    build_objects_prompt,
-    # Faits
-    FACTS_SYSTEM,
-    build_facts_prompt,
-    # Relations
-    RELATIONS_SYSTEM,
-    build_relations_prompt,
-    # Engagements
-    COMMITMENTS_SYSTEM,
-    build_commitments_prompt,
-    # Helpers
-    should_run_extraction,
-    get_minimal_extraction,
-    extract_object_hints,
-)
+import importlib
+
+# Nom exporté -> sous-module. Chargement à la demande (__getattr__):
+# importer un seul prompt ne charge plus les trois modules.
+_EXPORTS = {
+    "NARRATOR_SYSTEM_PROMPT": "narrator_prompt",
+    "build_narrator_context_prompt": "narrator_prompt",
+    "get_full_generation_prompt": "world_generation_prompt",
+    "WORLD_GENERATION_SYSTEM_PROMPT": "world_generation_prompt",
+    "SUMMARY_SYSTEM": "extractor_prompts",
+    "build_summary_prompt": "extractor_prompts",
+    "PROTAGONIST_STATE_SYSTEM": "extractor_prompts",
+    "build_protagonist_state_prompt": "extractor_prompts",
+    "ENTITIES_SYSTEM": "extractor_prompts",
+    "build_entities_prompt": "extractor_prompts",
+    "OBJECTS_SYSTEM": "extractor_prompts",
+    "build_objects_prompt": "extractor_prompts",
+    "FACTS_SYSTEM": "extractor_prompts",
+    "build_facts_prompt": "extractor_prompts",
+    "RELATIONS_SYSTEM": "extractor_prompts",
+    "build_relations_prompt": "extractor_prompts",
+    "COMMITMENTS_SYSTEM": "extractor_prompts",
+    "build_commitments_prompt": "extractor_prompts",
+    "should_run_extraction": "extractor_prompts",
+    "get_minimal_extraction": "extractor_prompts",
+    "extract_object_hints": "extractor_prompts",
+}
 
 __all__ = [
     # Narrateur
@@ -66,3 +58,12 @@ __all__ = [
     "get_minimal_extraction",
     "extract_object_hints",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = globals()[name] = getattr(module, name)
+    return value
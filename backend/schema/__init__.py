@@ -51,8 +51,6 @@ from .core import (
     # Mappings
     ATTRIBUTE_NORMALIZERS,
     ATTRIBUTE_DEFAULT_VISIBILITY,
-    ATTRIBUTE_SYNONYMS_BY_ENTITY,
-    ALL_ATTRIBUTE_SYNONYMS,
     VALID_ATTRIBUTE_KEYS_BY_ENTITY,
     # Normalizers - generic
     normalize_attribute_key,
@@ -76,36 +74,42 @@ from .core import (
     normalize_participant_role,
     normalize_relation_type,
 )
+from .normalizer import normalization_stats
 
 # =============================================================================
 # SYNONYMS - LLM output normalization dictionaries
 # =============================================================================
-from .synonyms import (
+# Loaded on first access (module __getattr__, see end of file): ~3000 lines
+# of dict literals that only the normalizers need.
+_LAZY_SYNONYMS = {
     # Enum synonyms
-    ARC_DOMAIN_SYNONYMS,
-    CERTAINTY_SYNONYMS,
-    COMMITMENT_TYPE_SYNONYMS,
-    DEPARTURE_REASON_SYNONYMS,
-    ENTITY_TYPE_SYNONYMS,
-    FACT_TYPE_SYNONYMS,
-    MOMENT_SYNONYMS,
-    ORG_SIZE_SYNONYMS,
-    PARTICIPANT_ROLE_SYNONYMS,
-    RELATION_TYPE_SYNONYMS,
+    "ARC_DOMAIN_SYNONYMS",
+    "CERTAINTY_SYNONYMS",
+    "COMMITMENT_TYPE_SYNONYMS",
+    "DEPARTURE_REASON_SYNONYMS",
+    "ENTITY_TYPE_SYNONYMS",
+    "FACT_TYPE_SYNONYMS",
+    "MOMENT_SYNONYMS",
+    "ORG_SIZE_SYNONYMS",
+    "PARTICIPANT_ROLE_SYNONYMS",
+    "RELATION_TYPE_SYNONYMS",
     # Attribute synonyms by entity type
-    SHARED_ATTRIBUTE_SYNONYMS,
-    CHARACTER_ATTRIBUTE_SYNONYMS,
-    LOCATION_ATTRIBUTE_SYNONYMS,
-    OBJECT_ATTRIBUTE_SYNONYMS,
-    ORGANIZATION_ATTRIBUTE_SYNONYMS,
-    PROTAGONIST_ATTRIBUTE_SYNONYMS,
-    AI_ATTRIBUTE_SYNONYMS,
+    "SHARED_ATTRIBUTE_SYNONYMS",
+    "CHARACTER_ATTRIBUTE_SYNONYMS",
+    "LOCATION_ATTRIBUTE_SYNONYMS",
+    "OBJECT_ATTRIBUTE_SYNONYMS",
+    "ORGANIZATION_ATTRIBUTE_SYNONYMS",
+    "PROTAGONIST_ATTRIBUTE_SYNONYMS",
+    "AI_ATTRIBUTE_SYNONYMS",
     # JSON key synonyms
-    KEY_SYNONYMS,
+    "KEY_SYNONYMS",
     # Utility functions
-    normalize_key,
-    normalize_dict_keys,
-)
+    "normalize_key",
+    "normalize_dict_keys",
+}
+
+# Merged attribute synonyms (built by core on first access)
+_LAZY_CORE = {"ATTRIBUTE_SYNONYMS_BY_ENTITY", "ALL_ATTRIBUTE_SYNONYMS"}
 
 # =============================================================================
 # ENTITIES - Entity data models (EAV-based)
@@ -290,6 +294,7 @@ __all__ = [
     "normalize_org_size",
     "normalize_participant_role",
     "normalize_relation_type",
+    "normalization_stats",
     # =========================================================================
     # SYNONYMS
     # =========================================================================
@@ -399,3 +404,14 @@ __all__ = [
     "ArrivalEventData",
     "WorldGeneration",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SYNONYMS:
+        from . import synonyms as module
+    elif name in _LAZY_CORE:
+        from . import core as module
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(module, name)
+    return value
@@ -5,6 +5,7 @@ Enums, primitive types, base models, attribute definitions
 
 import logging
 from enum import Enum
+from functools import cache
 from typing import Annotated, Any
 
 from pydantic import (
@@ -16,24 +17,7 @@ from pydantic import (
     model_validator,
 )
 
-from .synonyms import (
-    ARC_DOMAIN_SYNONYMS,
-    COMMITMENT_TYPE_SYNONYMS,
-    DEPARTURE_REASON_SYNONYMS,
-    ENTITY_TYPE_SYNONYMS,
-    FACT_TYPE_SYNONYMS,
-    MOMENT_SYNONYMS,
-    ORG_SIZE_SYNONYMS,
-    PARTICIPANT_ROLE_SYNONYMS,
-    RELATION_TYPE_SYNONYMS,
-    SHARED_ATTRIBUTE_SYNONYMS,
-    CHARACTER_ATTRIBUTE_SYNONYMS,
-    LOCATION_ATTRIBUTE_SYNONYMS,
-    OBJECT_ATTRIBUTE_SYNONYMS,
-    ORGANIZATION_ATTRIBUTE_SYNONYMS,
-    PROTAGONIST_ATTRIBUTE_SYNONYMS,
-    AI_ATTRIBUTE_SYNONYMS,
-)
+from .normalizer import CompiledNormalizer, fold_key, normalization_stats
 
 logger = logging.getLogger(__name__)
 
@@ -347,44 +331,73 @@ class AttributeVisibility(str, Enum):
 # =============================================================================
 # ATTRIBUTE SYNONYMS MAPPING BY ENTITY TYPE
 # =============================================================================
-
-ATTRIBUTE_SYNONYMS_BY_ENTITY: dict[EntityType, dict[str, str]] = {
-    EntityType.CHARACTER: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **CHARACTER_ATTRIBUTE_SYNONYMS,
-    },
-    EntityType.LOCATION: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **LOCATION_ATTRIBUTE_SYNONYMS,
-    },
-    EntityType.OBJECT: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **OBJECT_ATTRIBUTE_SYNONYMS,
-    },
-    EntityType.ORGANIZATION: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **ORGANIZATION_ATTRIBUTE_SYNONYMS,
-    },
-    EntityType.PROTAGONIST: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **PROTAGONIST_ATTRIBUTE_SYNONYMS,
-    },
-    EntityType.AI: {
-        **SHARED_ATTRIBUTE_SYNONYMS,
-        **AI_ATTRIBUTE_SYNONYMS,
-    },
+# Built on first access (module __getattr__): the synonyms module is only
+# imported when something actually normalizes, not at startup.
+
+
+def _attribute_synonyms_by_entity() -> dict[EntityType, dict[str, str]]:
+    from . import synonyms as s
+
+    return {
+        EntityType.CHARACTER: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.CHARACTER_ATTRIBUTE_SYNONYMS,
+        },
+        EntityType.LOCATION: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.LOCATION_ATTRIBUTE_SYNONYMS,
+        },
+        EntityType.OBJECT: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.OBJECT_ATTRIBUTE_SYNONYMS,
+        },
+        EntityType.ORGANIZATION: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.ORGANIZATION_ATTRIBUTE_SYNONYMS,
+        },
+        EntityType.PROTAGONIST: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.PROTAGONIST_ATTRIBUTE_SYNONYMS,
+        },
+        EntityType.AI: {
+            **s.SHARED_ATTRIBUTE_SYNONYMS,
+            **s.AI_ATTRIBUTE_SYNONYMS,
+        },
+    }
+
+
+def _all_attribute_synonyms() -> dict[str, str]:
+    """Fallback: all synonyms merged (for when entity type is unknown)"""
+    from . import synonyms as s
+
+    return {
+        **s.SHARED_ATTRIBUTE_SYNONYMS,
+        **s.CHARACTER_ATTRIBUTE_SYNONYMS,
+        **s.LOCATION_ATTRIBUTE_SYNONYMS,
+        **s.OBJECT_ATTRIBUTE_SYNONYMS,
+        **s.ORGANIZATION_ATTRIBUTE_SYNONYMS,
+        **s.PROTAGONIST_ATTRIBUTE_SYNONYMS,
+        **s.AI_ATTRIBUTE_SYNONYMS,
+    }
+
+
+_LAZY_ATTRIBUTES = {
+    "ATTRIBUTE_SYNONYMS_BY_ENTITY": _attribute_synonyms_by_entity,
+    "ALL_ATTRIBUTE_SYNONYMS": _all_attribute_synonyms,
 }
 
-# Fallback: all synonyms merged (for when entity type is unknown)
-ALL_ATTRIBUTE_SYNONYMS: dict[str, str] = {
-    **SHARED_ATTRIBUTE_SYNONYMS,
-    **CHARACTER_ATTRIBUTE_SYNONYMS,
-    **LOCATION_ATTRIBUTE_SYNONYMS,
-    **OBJECT_ATTRIBUTE_SYNONYMS,
-    **ORGANIZATION_ATTRIBUTE_SYNONYMS,
-    **PROTAGONIST_ATTRIBUTE_SYNONYMS,
-    **AI_ATTRIBUTE_SYNONYMS,
-}
+
+def __getattr__(name: str) -> Any:
+    builder = _LAZY_ATTRIBUTES.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builder()
+    return value
+
+
+def _lazy_attribute(name: str) -> Any:
+    """Lazy module attribute, built once."""
+    return globals()[name] if name in globals() else __getattr__(name)
 
 
 # =============================================================================
@@ -551,6 +564,63 @@ VALID_ATTRIBUTE_KEYS_BY_ENTITY: dict[EntityType, set[AttributeKey]] = {
 }
 
 
+# =============================================================================
+# COMPILED NORMALIZERS
+# =============================================================================
+
+_ATTRIBUTE_KEY_VALUES = [k.value for k in AttributeKey]
+
+
+def _compile_attribute_synonyms(synonyms: dict[str, str]) -> CompiledNormalizer:
+    """Synonyms pointing to an unknown key are dropped (direct match instead)."""
+    valid = set(_ATTRIBUTE_KEY_VALUES)
+    return CompiledNormalizer(
+        {k: v for k, v in synonyms.items() if v in valid}, _ATTRIBUTE_KEY_VALUES
+    )
+
+
+@cache
+def _attribute_normalizers() -> dict[EntityType | None, CompiledNormalizer]:
+    """Per entity type, plus None for the merged fallback."""
+    normalizers = {
+        entity_type: _compile_attribute_synonyms(synonyms)
+        for entity_type, synonyms in _lazy_attribute(
+            "ATTRIBUTE_SYNONYMS_BY_ENTITY"
+        ).items()
+    }
+    normalizers[None] = _compile_attribute_synonyms(
+        _lazy_attribute("ALL_ATTRIBUTE_SYNONYMS")
+    )
+    return normalizers
+
+
+@cache
+def _enum_normalizers() -> dict[type[Enum], CompiledNormalizer]:
+    from . import synonyms as s
+
+    tables = {
+        EntityType: s.ENTITY_TYPE_SYNONYMS,
+        RelationType: s.RELATION_TYPE_SYNONYMS,
+        FactType: s.FACT_TYPE_SYNONYMS,
+        ParticipantRole: s.PARTICIPANT_ROLE_SYNONYMS,
+        CommitmentType: s.COMMITMENT_TYPE_SYNONYMS,
+        ArcDomain: s.ARC_DOMAIN_SYNONYMS,
+        DepartureReason: s.DEPARTURE_REASON_SYNONYMS,
+        Moment: s.MOMENT_SYNONYMS,
+        OrgSize: s.ORG_SIZE_SYNONYMS,
+    }
+    return {
+        enum_class: CompiledNormalizer(synonyms, [e.value for e in enum_class])
+        for enum_class, synonyms in tables.items()
+    }
+
+
+def warm_up_normalizers() -> None:
+    """Build every compiled table now (startup) instead of on first use."""
+    _attribute_normalizers()
+    _enum_normalizers()
+
+
 # =============================================================================
 # NORMALIZATION FUNCTIONS
 # =============================================================================
@@ -566,29 +636,24 @@ def normalize_attribute_key(
     if isinstance(key, AttributeKey):
         return key
 
-    normalized = key.lower().strip().replace(" ", "_").replace("-", "_")
-
-    # Choose synonym dict based on entity type
-    if entity_type is not None:
-        synonyms = ATTRIBUTE_SYNONYMS_BY_ENTITY.get(entity_type, ALL_ATTRIBUTE_SYNONYMS)
-    else:
-        synonyms = ALL_ATTRIBUTE_SYNONYMS
-
-    # Try synonym lookup
-    canonical = synonyms.get(normalized)
-    if canonical:
-        try:
-            return AttributeKey(canonical)
-        except ValueError:
-            pass
-
-    # Try direct enum match
-    try:
-        return AttributeKey(normalized)
-    except ValueError:
-        pass
+    # Choose compiled table based on entity type (None = merged fallback)
+    normalizers = _attribute_normalizers()
+    normalizer = normalizers.get(entity_type) or normalizers[None]
+
+    # Synonyms, direct enum values and their variants, then fuzzy tier
+    raw = str(key)
+    found = normalizer.match(raw)
+    if found is not None:
+        if found.distance:
+            normalization_stats.record_fuzzy("attribute_key", raw, found.value)
+            logger.info(
+                f"[Normalizer] attribute_key: '{key}' ≈ '{found.value}' "
+                f"(distance {found.distance})"
+            )
+        return AttributeKey(found.value)
 
     # Fallback: log warning and raise
+    normalization_stats.record_miss("attribute_key", raw)
     logger.warning(
         f"[Normalizer] Unknown attribute key: '{key}' (entity_type={entity_type})"
     )
@@ -638,7 +703,6 @@ ATTRIBUTE_NORMALIZERS: dict[EntityType, callable] = {
 
 def _normalize_enum_value(
     value: Any,
-    synonyms: dict[str, str],
     enum_class: type[Enum],
     field_name: str,
 ) -> str:
@@ -649,67 +713,64 @@ def _normalize_enum_value(
     if isinstance(value, enum_class):
         return value.value
 
-    key = str(value).lower().strip().replace(" ", "_").replace("-", "_")
-    result = synonyms.get(key)
+    raw = str(value)
+    found = _enum_normalizers()[enum_class].match(raw)
 
-    if result is None:
-        valid_values = {e.value for e in enum_class}
-        if key in valid_values:
-            return key
-        fallback = list(enum_class)[0].value
+    if found is None:
+        normalization_stats.record_miss(field_name, raw)
+        fallback = next(iter(enum_class)).value
         logger.warning(
             f"[Normalizer] Unknown {field_name}='{value}' → fallback '{fallback}'"
         )
         return fallback
 
-    if key != result:
+    result = found.value
+    if found.distance:
+        normalization_stats.record_fuzzy(field_name, raw, result)
+        logger.info(
+            f"[Normalizer] {field_name}: '{value}' ≈ '{result}' "
+            f"(distance {found.distance})"
+        )
+    elif logger.isEnabledFor(logging.INFO) and fold_key(raw) != result:
         logger.info(f"[Normalizer] {field_name}: '{value}' → '{result}'")
 
     return result
 
 
 def normalize_entity_type(value: Any) -> str:
-    return _normalize_enum_value(value, ENTITY_TYPE_SYNONYMS, EntityType, "entity_type")
+    return _normalize_enum_value(value, EntityType, "entity_type")
 
 
 def normalize_relation_type(value: Any) -> str:
-    return _normalize_enum_value(
-        value, RELATION_TYPE_SYNONYMS, RelationType, "relation_type"
-    )
+    return _normalize_enum_value(value, RelationType, "relation_type")
 
 
 def normalize_fact_type(value: Any) -> str:
-    return _normalize_enum_value(value, FACT_TYPE_SYNONYMS, FactType, "fact_type")
+    return _normalize_enum_value(value, FactType, "fact_type")
 
 
 def normalize_participant_role(value: Any) -> str:
-    return _normalize_enum_value(
-        value, PARTICIPANT_ROLE_SYNONYMS, ParticipantRole, "participant_role"
-    )
+    return _normalize_enum_value(value, ParticipantRole, "participant_role")
 
 
 def normalize_commitment_type(value: Any) -> str:
-    return _normalize_enum_value(
-        value, COMMITMENT_TYPE_SYNONYMS, CommitmentType, "commitment_type"
-    )
+    return _normalize_enum_value(value, CommitmentType, "commitment_type")
 
 
 def normalize_arc_domain(value: Any) -> str:
-    return _normalize_enum_value(value, ARC_DOMAIN_SYNONYMS, ArcDomain, "arc_domain")
+    return _normalize_enum_value(value, ArcDomain, "arc_domain")
 
 
 def normalize_departure_reason(value: Any) -> str:
-    return _normalize_enum_value(
-        value, DEPARTURE_REASON_SYNONYMS, DepartureReason, "departure_reason"
-    )
+    return _normalize_enum_value(value, DepartureReason, "departure_reason")
 
 
 def normalize_moment(value: Any) -> str:
-    return _normalize_enum_value(value, MOMENT_SYNONYMS, Moment, "moment")
+    return _normalize_enum_value(value, Moment, "moment")
 
 
 def normalize_org_size(value: Any) -> str:
-    return _normalize_enum_value(value, ORG_SIZE_SYNONYMS, OrgSize, "org_size")
+    return _normalize_enum_value(value, OrgSize, "org_size")
 
 
 def get_attribute_visibility(key: AttributeKey) -> AttributeVisibility:
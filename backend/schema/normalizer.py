@@ -0,0 +1,253 @@
+"""
+LDVELH - Compiled Normalizers
+Precomputed lookup tables for LLM value normalization (synonyms + canonical
+values + accent/plural variants), with an LRU memo on raw inputs.
+Unknown values fall back to a fuzzy match (edit distance, deletion index).
+"""
+
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+# Memo size per normalizer (distinct raw LLM values seen)
+MEMO_SIZE = 4096
+
+# Fuzzy matching: absolute cap, and one edit allowed per FUZZY_CHARS_PER_EDIT chars
+# (short keys are too close to each other: "hood" is one edit from "mood")
+FUZZY_MAX_DISTANCE = 2
+FUZZY_CHARS_PER_EDIT = 6
+
+
+def fold_key(value: str) -> str:
+    """Canonical key form: lowercase, trimmed, spaces/hyphens as underscores."""
+    return value.lower().strip().replace(" ", "_").replace("-", "_")
+
+
+def strip_accents(value: str) -> str:
+    """Remove diacritics ('équipé' -> 'equipe')."""
+    if value.isascii():
+        return value
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _plural_variants(key: str) -> Iterable[str]:
+    """Naive singular/plural forms, on the last word only."""
+    if key.endswith("s") and len(key) > 3:
+        yield key[:-1]
+    elif not key.endswith(("s", "x", "_")):
+        yield key + "s"
+
+
+# =============================================================================
+# FUZZY MATCHING
+# =============================================================================
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance (insertions, deletions, substitutions)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        previous = current
+    return previous[-1]
+
+
+def _deletions(word: str, depth: int) -> set[str]:
+    """word and every string obtained by deleting up to depth characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+class DeletionIndex:
+    """
+    Symmetric-deletion index (SymSpell): two strings within d edits share a
+    variant obtained by at most d deletions on each side. A query costs a
+    few dozen dict lookups plus levenshtein on the few candidates, instead
+    of a distance computation against every key.
+    """
+
+    def __init__(self, keys: Iterable[str], max_distance: int = FUZZY_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._index: dict[str, list[str]] = {}
+        for key in keys:
+            for variant in _deletions(key, max_distance):
+                self._index.setdefault(variant, []).append(key)
+
+    def search(self, query: str, tolerance: int) -> list[tuple[int, str]]:
+        """Keys within tolerance edits, as (distance, key)."""
+        tolerance = min(tolerance, self.max_distance)
+        candidates = set()
+        for variant in _deletions(query, tolerance):
+            candidates.update(self._index.get(variant, ()))
+        found = []
+        for key in candidates:
+            if abs(len(key) - len(query)) > tolerance:
+                continue
+            distance = levenshtein(query, key)
+            if distance <= tolerance:
+                found.append((distance, key))
+        return found
+
+
+def fuzzy_tolerance(key: str) -> int:
+    """Edits allowed for a key: none below FUZZY_CHARS_PER_EDIT chars."""
+    return min(FUZZY_MAX_DISTANCE, len(key) // FUZZY_CHARS_PER_EDIT)
+
+
+class Match(NamedTuple):
+    """Normalization result: canonical value and edit distance (0 = exact)."""
+
+    value: str
+    distance: int
+
+
+# =============================================================================
+# TELEMETRY
+# =============================================================================
+
+
+class NormalizationStats:
+    """
+    Counters for values that needed the fuzzy tier or matched nothing.
+    Misses are what the synonym tables should learn next.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.fuzzy: Counter[tuple[str, str, str]] = Counter()
+        self.misses: Counter[tuple[str, str]] = Counter()
+        self._lock = threading.Lock()
+
+    def record_fuzzy(self, field: str, raw: str, value: str) -> None:
+        with self._lock:
+            if len(self.fuzzy) < self.max_entries or (field, raw, value) in self.fuzzy:
+                self.fuzzy[(field, raw, value)] += 1
+
+    def record_miss(self, field: str, raw: str) -> None:
+        with self._lock:
+            if len(self.misses) < self.max_entries or (field, raw) in self.misses:
+                self.misses[(field, raw)] += 1
+
+    def snapshot(self, limit: int = 50) -> dict:
+        """Most frequent fuzzy matches and misses (JSON-friendly)."""
+        with self._lock:
+            return {
+                "fuzzy_total": sum(self.fuzzy.values()),
+                "miss_total": sum(self.misses.values()),
+                "fuzzy": [
+                    {"field": f, "raw": r, "value": v, "count": n}
+                    for (f, r, v), n in self.fuzzy.most_common(limit)
+                ],
+                "misses": [
+                    {"field": f, "raw": r, "count": n}
+                    for (f, r), n in self.misses.most_common(limit)
+                ],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.fuzzy.clear()
+            self.misses.clear()
+
+
+normalization_stats = NormalizationStats()
+
+
+# =============================================================================
+# COMPILED NORMALIZER
+# =============================================================================
+
+
+class CompiledNormalizer:
+    """
+    Single precomputed map raw-key -> canonical value.
+
+    Priority (first wins): exact synonyms, canonical values, then the accent
+    and plural variants of both. Unknown keys go through a fuzzy tier
+    (deletion index, built on first use) and are accepted only if the
+    closest keys within tolerance all agree on the value. Results are
+    memoized on the raw input.
+    """
+
+    def __init__(
+        self,
+        synonyms: dict[str, str],
+        canonical: Iterable[str],
+        memo_size: int = MEMO_SIZE,
+        fuzzy: bool = True,
+    ):
+        table: dict[str, str] = {}
+        for key, value in synonyms.items():
+            table.setdefault(fold_key(key), value)
+        for value in canonical:
+            table.setdefault(value, value)
+
+        # Variants never override an explicit entry
+        for key, value in list(table.items()):
+            bare = strip_accents(key)
+            table.setdefault(bare, value)
+            for variant in _plural_variants(bare):
+                table.setdefault(variant, value)
+
+        self.table = table
+        self.fuzzy = fuzzy
+        self._index: DeletionIndex | None = None
+        self.match = lru_cache(maxsize=memo_size)(self._match)
+
+    def lookup(self, raw: str) -> str | None:
+        """Canonical value for a raw string, None if unknown."""
+        found = self.match(raw)
+        return found.value if found is not None else None
+
+    def _match(self, raw: str) -> Match | None:
+        key = fold_key(raw)
+        result = self.table.get(key)
+        if result is None and not key.isascii():
+            key = strip_accents(key)
+            result = self.table.get(key)
+        if result is not None:
+            return Match(result, 0)
+        if self.fuzzy:
+            return self._fuzzy_match(key)
+        return None
+
+    def _fuzzy_match(self, key: str) -> Match | None:
+        tolerance = fuzzy_tolerance(key)
+        if tolerance == 0:
+            return None
+        if self._index is None:
+            self._index = DeletionIndex(k for k in self.table if k.isascii())
+
+        # Typos rarely hit the first letter; a different one means another word
+        candidates = [
+            (distance, k)
+            for distance, k in self._index.search(key, tolerance)
+            if k[0] == key[0]
+        ]
+        if not candidates:
+            return None
+        best = min(distance for distance, _ in candidates)
+        values = {self.table[k] for distance, k in candidates if distance == best}
+        # Ambiguous: closest keys disagree
+        if len(values) != 1:
+            return None
+        return Match(values.pop(), best)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def cache_info(self):
+        return self.match.cache_info()
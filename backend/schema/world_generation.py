@@ -359,145 +359,131 @@ class WorldGeneration(BaseModel, TemporalValidationMixin):
         - Optional refs: set to None if invalid
         - List refs: filter invalid entries
         - Only filter entity if required refs are invalid or list becomes empty
-        """
-        max_passes = 5
-        pass_num = 0
 
-        while pass_num < max_passes:
-            pass_num += 1
-            changed = False
-            known_names = self._build_name_registry()
+        Single pass: fixes only clear refs or drop relations/arcs, never an
+        entity, so the name registry cannot change while it runs.
+        """
+        known = self._build_name_registry()
+        fixes = 0
+        # Messages built only if emitted: a world with many invalid refs
+        # would otherwise spend most of the pass formatting them
+        warn = logger.isEnabledFor(logging.WARNING)
 
-            # --- Characters: nullify invalid optional refs ---
-            for char in self.characters:
-                if char.workplace_ref and char.workplace_ref.lower() not in known_names:
+        # --- Characters: nullify invalid optional refs ---
+        for char in self.characters:
+            if char.workplace_ref and char.workplace_ref.lower() not in known:
+                if warn:
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: Character '{char.name}' "
+                        f"[SoftRef] Character '{char.name}' "
                         f"- nullifying invalid workplace_ref '{char.workplace_ref}'"
                     )
-                    char.workplace_ref = None
-                    changed = True
-                if char.residence_ref and char.residence_ref.lower() not in known_names:
+                char.workplace_ref = None
+                fixes += 1
+            if char.residence_ref and char.residence_ref.lower() not in known:
+                if warn:
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: Character '{char.name}' "
+                        f"[SoftRef] Character '{char.name}' "
                         f"- nullifying invalid residence_ref '{char.residence_ref}'"
                     )
-                    char.residence_ref = None
-                    changed = True
-
-            # --- Locations: nullify invalid optional parent refs ---
-            for loc in self.locations:
-                if (
-                    loc.parent_location_ref
-                    and loc.parent_location_ref.lower() not in known_names
-                ):
+                char.residence_ref = None
+                fixes += 1
+
+        # --- Locations: nullify invalid optional parent refs ---
+        for loc in self.locations:
+            if loc.parent_location_ref and loc.parent_location_ref.lower() not in known:
+                if warn:
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: Location '{loc.name}' "
+                        f"[SoftRef] Location '{loc.name}' "
                         f"- nullifying invalid parent_ref '{loc.parent_location_ref}'"
                     )
-                    loc.parent_location_ref = None
-                    changed = True
-
-            # --- Organizations: nullify invalid optional HQ refs ---
-            for org in self.organizations:
-                if (
-                    org.headquarters_ref
-                    and org.headquarters_ref.lower() not in known_names
-                ):
+                loc.parent_location_ref = None
+                fixes += 1
+
+        # --- Organizations: nullify invalid optional HQ refs ---
+        for org in self.organizations:
+            if org.headquarters_ref and org.headquarters_ref.lower() not in known:
+                if warn:
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: Organization '{org.name}' "
+                        f"[SoftRef] Organization '{org.name}' "
                         f"- nullifying invalid HQ ref '{org.headquarters_ref}'"
                     )
-                    org.headquarters_ref = None
-                    changed = True
-
-            # --- Relations: filter those with invalid required refs ---
-            valid_rels = []
-            for rel in self.initial_relations:
-                source_valid = rel.source_ref.lower() in known_names
-                target_valid = rel.target_ref.lower() in known_names
-
-                if not source_valid or not target_valid:
-                    invalid_refs = []
-                    if not source_valid:
-                        invalid_refs.append(f"source '{rel.source_ref}'")
-                    if not target_valid:
-                        invalid_refs.append(f"target '{rel.target_ref}'")
+                org.headquarters_ref = None
+                fixes += 1
+
+        # --- Relations: filter those with invalid required refs ---
+        valid_rels = []
+        for rel in self.initial_relations:
+            source_valid = rel.source_ref.lower() in known
+            target_valid = rel.target_ref.lower() in known
+            if source_valid and target_valid:
+                valid_rels.append(rel)
+                continue
+            invalid_refs = []
+            if not source_valid:
+                invalid_refs.append(f"source '{rel.source_ref}'")
+            if not target_valid:
+                invalid_refs.append(f"target '{rel.target_ref}'")
+            if warn:
+                logger.warning(
+                    f"[SoftRef] Filtering Relation {rel.relation_type.value} "
+                    f"- invalid {', '.join(invalid_refs)}"
+                )
+            fixes += 1
+        if len(valid_rels) != len(self.initial_relations):
+            self.initial_relations = valid_rels
+
+        # --- Narrative arcs: filter invalid refs from involved_entities ---
+        valid_arcs = []
+        for arc in self.narrative_arcs:
+            valid_entities = [e for e in arc.involved_entities if e.lower() in known]
+            if len(valid_entities) == len(arc.involved_entities):
+                valid_arcs.append(arc)
+                continue
+            fixes += 1
+            if valid_entities:
+                if warn:
+                    invalid = [
+                        e for e in arc.involved_entities if e.lower() not in known
+                    ]
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: Filtering Relation {rel.relation_type.value} "
-                        f"- invalid {', '.join(invalid_refs)}"
+                        f"[SoftRef] Arc '{arc.title}' "
+                        f"- removing invalid entities: {invalid}"
                     )
-                    changed = True
-                else:
-                    valid_rels.append(rel)
-
-            if len(valid_rels) != len(self.initial_relations):
-                self.initial_relations = valid_rels
-
-            # --- Narrative arcs: filter invalid refs from involved_entities ---
-            valid_arcs = []
-            for arc in self.narrative_arcs:
-                valid_entities = [
-                    e for e in arc.involved_entities if e.lower() in known_names
-                ]
-                invalid_entities = [
-                    e for e in arc.involved_entities if e.lower() not in known_names
-                ]
-
-                if invalid_entities:
-                    if valid_entities:
-                        logger.warning(
-                            f"[SoftRef] Pass {pass_num}: Arc '{arc.title}' "
-                            f"- removing invalid entities: {invalid_entities}"
-                        )
-                        arc.involved_entities = valid_entities
-                        valid_arcs.append(arc)
-                        changed = True
-                    else:
-                        logger.warning(
-                            f"[SoftRef] Pass {pass_num}: Filtering Arc '{arc.title}' "
-                            f"- no valid entities remain"
-                        )
-                        changed = True
-                else:
-                    valid_arcs.append(arc)
-
-            if len(valid_arcs) != len(self.narrative_arcs):
-                self.narrative_arcs = valid_arcs
-
-            # --- Fix arrival_event refs ---
-            if self.arrival_event.arrival_location_ref.lower() not in known_names:
-                fallback = self._find_arrival_location_fallback()
-                if fallback:
+                arc.involved_entities = valid_entities
+                valid_arcs.append(arc)
+            elif warn:
+                logger.warning(
+                    f"[SoftRef] Filtering Arc '{arc.title}' "
+                    f"- no valid entities remain"
+                )
+        if len(valid_arcs) != len(self.narrative_arcs):
+            self.narrative_arcs = valid_arcs
+
+        # --- Fix arrival_event refs ---
+        if self.arrival_event.arrival_location_ref.lower() not in known:
+            fallback = self._find_arrival_location_fallback()
+            if fallback:
+                if warn:
                     logger.warning(
-                        f"[SoftRef] Pass {pass_num}: arrival_location_ref "
+                        f"[SoftRef] arrival_location_ref "
                         f"'{self.arrival_event.arrival_location_ref}' not found "
                         f"→ fallback to '{fallback}'"
                     )
-                    self.arrival_event.arrival_location_ref = fallback
-                    changed = True
+                self.arrival_event.arrival_location_ref = fallback
+                fixes += 1
 
-            if self.arrival_event.first_npc_encountered:
-                if self.arrival_event.first_npc_encountered.lower() not in known_names:
-                    logger.warning(
-                        f"[SoftRef] Pass {pass_num}: first_npc_encountered "
-                        f"'{self.arrival_event.first_npc_encountered}' not found "
-                        f"→ setting to None"
-                    )
-                    self.arrival_event.first_npc_encountered = None
-                    changed = True
-
-            if not changed:
-                if pass_num > 1:
-                    logger.info(
-                        f"[SoftRef] Validation stabilized after {pass_num} passes"
-                    )
-                break
+        first_npc = self.arrival_event.first_npc_encountered
+        if first_npc and first_npc.lower() not in known:
+            if warn:
+                logger.warning(
+                    f"[SoftRef] first_npc_encountered '{first_npc}' not found "
+                    f"→ setting to None"
+                )
+            self.arrival_event.first_npc_encountered = None
+            fixes += 1
 
-        if pass_num >= max_passes:
-            logger.warning(
-                f"[SoftRef] Reached max passes ({max_passes}), may have remaining issues"
-            )
+        if fixes:
+            logger.info(f"[SoftRef] {fixes} invalid reference(s) fixed")
 
         self._check_minimums_after_filtering()
         return self
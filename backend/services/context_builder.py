@@ -28,6 +28,7 @@ from schema.narration import (
 from schema import ArcDomain
 
 from kg.reader import KnowledgeGraphReader
+from utils.tracing import span, traced
 
 if TYPE_CHECKING:
     from asyncpg import Connection, Pool
@@ -52,10 +53,11 @@ class ContextBuilder:
         """Build complete context for narrator"""
 
         # World info
-        world_info = await self.reader.get_root_location(conn) or {}
+        with span("context.world"):
+            world_info = await self.reader.get_root_location(conn) or {}
 
-        # Date: utilise get_current_date existant
-        date = await self.reader.get_current_date(conn) or "Jour 1"
+            # Date: utilise get_current_date existant
+            date = await self.reader.get_current_date(conn) or "Jour 1"
 
         # Protagonist avec skills
         protagonist = await self._build_protagonist_state(conn)
@@ -128,6 +130,7 @@ class ContextBuilder:
     # PROTAGONIST
     # =========================================================================
 
+    @traced("context.protagonist_state")
     async def _build_protagonist_state(self, conn: Connection) -> ProtagonistState:
         """Build protagonist state from reader"""
         row = await self.reader.get_protagonist_with_skills(conn)
@@ -149,6 +152,7 @@ class ContextBuilder:
             employer=row.get("employer"),
         )
 
+    @traced("context.inventory")
     async def _build_inventory(self, conn: Connection) -> list[InventoryItem]:
         """Build inventory from existing get_inventory"""
         rows = await self.reader.get_inventory(conn)
@@ -162,6 +166,7 @@ class ContextBuilder:
             for r in rows
         ]
 
+    @traced("context.personal_ai")
     async def _build_personal_ai(self, conn: Connection) -> PersonalAISummary | None:
         """Build AI companion from existing method"""
         row = await self.reader.get_ai_companion(conn)
@@ -180,6 +185,7 @@ class ContextBuilder:
     # LOCATIONS
     # =========================================================================
 
+    @traced("context.current_location")
     async def _build_current_location(
         self, conn: Connection, name: str
     ) -> LocationSummary:
@@ -197,6 +203,7 @@ class ContextBuilder:
             accessible=row.get("accessible", True),
         )
 
+    @traced("context.connected_locations")
     async def _build_connected_locations(
         self, conn: Connection, current_location: str
     ) -> list[LocationSummary]:
@@ -217,6 +224,7 @@ class ContextBuilder:
     # NPCs
     # =========================================================================
 
+    @traced("context.all_npcs_light_summary")
     async def _build_all_npcs_light_summary(
         self, conn: Connection
     ) -> list[NPCLightSummary]:
@@ -236,6 +244,7 @@ class ContextBuilder:
             for r in rows
         ]
 
+    @traced("context.npcs_at_location")
     async def _build_npcs_at_location(
         self, conn: Connection, location_name: str
     ) -> list[NPCSummary]:
@@ -243,6 +252,7 @@ class ContextBuilder:
         rows = await self.reader.get_npcs_at_location(conn, location_name)
         return [self._row_to_npc_summary(r) for r in rows]
 
+    @traced("context.relevant_npcs")
     async def _build_relevant_npcs(self, conn: Connection) -> list[NPCSummary]:
         """Build relevant NPCs (highest relationship)"""
         rows = await self.reader.get_top_related_npcs(conn, limit=5)
@@ -292,6 +302,7 @@ class ContextBuilder:
     # ORGANIZATIONS
     # =========================================================================
 
+    @traced("context.organizations")
     async def _build_organizations(self, conn: Connection) -> list[OrganizationSummary]:
         """Build organizations summary"""
         rows = await self.reader.get_known_organizations(conn)
@@ -309,6 +320,7 @@ class ContextBuilder:
     # COMMITMENTS & EVENTS
     # =========================================================================
 
+    @traced("context.commitments")
     async def _build_commitments(self, conn: Connection) -> list[CommitmentSummary]:
         """Build commitments from detailed query"""
         rows = await self.reader.get_commitments_detailed(conn)
@@ -333,6 +345,7 @@ class ContextBuilder:
             )
         return result
 
+    @traced("context.events")
     async def _build_events(
         self, conn: Connection, current_cycle: int
     ) -> list[EventSummary]:
@@ -354,6 +367,7 @@ class ContextBuilder:
     # FACTS
     # =========================================================================
 
+    @traced("context.facts")
     async def _build_facts(
         self,
         conn: Connection,
@@ -416,6 +430,7 @@ class ContextBuilder:
     # HISTORY
     # =========================================================================
 
+    @traced("context.cycle_summaries")
     async def _build_cycle_summaries(
         self, conn: Connection, current_cycle: int, limit: int = 15
     ) -> list[str]:
@@ -423,6 +438,7 @@ class ContextBuilder:
         rows = await self.reader.get_cycle_summaries(conn, current_cycle, limit)
         return [CycleSummary(cycle=r["cycle"], summary=r["summary"]) for r in rows]
 
+    @traced("context.conversation_context")
     async def _build_conversation_context(
         self, conn: Connection, current_cycle: int, recent_limit: int = 10
     ) -> tuple[list[MessageSummary], list[MessageSummary]]:
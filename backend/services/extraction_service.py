@@ -4,7 +4,6 @@ Extraction des données narratives en arrière-plan
 Utilise kg/reader.py et kg/populator.py pour l'accès BDD
 """
 
-import time
 import logging
 from uuid import UUID
 import asyncpg
@@ -33,6 +32,11 @@ from prompts.extractor_prompts import (
 )
 from schema import NarrationHints, NarrativeExtraction
 from services.llm_service import get_llm_service
+from services.tooltip_service import tooltip_index
+from utils.metrics import EXTRACTION_FAILURES
+from utils.offload import validate_model_offloaded
+from utils.tracing import span, traced
+from utils.validation import validate_model
 
 logger = logging.getLogger(__name__)
 
@@ -158,14 +162,17 @@ class ParallelExtractionService:
     # EXTRACTEURS INDIVIDUELS (LLM - inchangés)
     # =========================================================================
 
+    @traced("extract.summary")
     async def extract_summary(self, narrative_text: str) -> dict:
         """Extracteur résumé (Haiku)"""
         result = await self.llm.extract_light(
             system_prompt=SUMMARY_SYSTEM,
             user_message=build_summary_prompt(narrative_text),
+            extractor="summary",
         )
         return result or {"segment_summary": ""}
 
+    @traced("extract.protagonist_state")
     async def extract_protagonist_state(
         self, narrative_text: str, known_objects: list[str] | None = None
     ) -> dict:
@@ -173,6 +180,7 @@ class ParallelExtractionService:
         result = await self.llm.extract_light(
             system_prompt=PROTAGONIST_STATE_SYSTEM,
             user_message=build_protagonist_state_prompt(narrative_text, known_objects),
+            extractor="protagonist_state",
         )
         return result or {
             "gauge_changes": [],
@@ -180,6 +188,7 @@ class ParallelExtractionService:
             "inventory_changes": [],
         }
 
+    @traced("extract.entities")
     async def extract_entities(
         self,
         narrative_text: str,
@@ -192,9 +201,11 @@ class ParallelExtractionService:
             user_message=build_entities_prompt(
                 narrative_text, new_entities_hints, known_entities
             ),
+            extractor="entities",
         )
         return result or {"entities_created": [], "entities_updated": []}
 
+    @traced("extract.objects")
     async def extract_objects(
         self,
         narrative_text: str,
@@ -207,9 +218,11 @@ class ParallelExtractionService:
         result = await self.llm.extract_heavy(
             system_prompt=OBJECTS_SYSTEM,
             user_message=build_objects_prompt(narrative_text, object_hints),
+            extractor="objects",
         )
         return result or {"objects_created": []}
 
+    @traced("extract.facts")
     async def extract_facts(
         self,
         narrative_text: str,
@@ -223,9 +236,11 @@ class ParallelExtractionService:
             user_message=build_facts_prompt(
                 narrative_text, cycle, location, known_entities
             ),
+            extractor="facts",
         )
         return result or {"facts": []}
 
+    @traced("extract.relations")
     async def extract_relations(
         self,
         narrative_text: str,
@@ -236,9 +251,11 @@ class ParallelExtractionService:
         result = await self.llm.extract_light(
             system_prompt=RELATIONS_SYSTEM,
             user_message=build_relations_prompt(narrative_text, cycle, known_entities),
+            extractor="relations",
         )
         return result or {"relations_created": [], "relations_updated": []}
 
+    @traced("extract.commitments")
     async def extract_commitments(
         self,
         narrative_text: str,
@@ -251,6 +268,7 @@ class ParallelExtractionService:
             user_message=build_commitments_prompt(
                 narrative_text, known_entities, commitment_hints
             ),
+            extractor="commitments",
         )
         return result or {
             "commitments_created": [],
@@ -262,6 +280,7 @@ class ParallelExtractionService:
     # CHARGEMENT CONTEXTE (via reader)
     # =========================================================================
 
+    @traced("extraction.known_entities")
     async def _load_known_entities(
         self, conn, game_id: UUID
     ) -> tuple[list[str], list[str]]:
@@ -306,8 +325,15 @@ class ParallelExtractionService:
         # Si pas besoin d'extraction
         if not should_run_extraction(hints):
             if summary_task:
-                summary_result = await summary_task
-                result.merge(summary_result)
+                # gather: un résumé annulé (client parti) n'annule pas l'appelant
+                (summary_result,) = await asyncio.gather(
+                    summary_task, return_exceptions=True
+                )
+                if isinstance(summary_result, BaseException):
+                    logger.error(f"[EXTRACTION] Erreur summary: {summary_result!r}")
+                    EXTRACTION_FAILURES.inc(extractor="summary")
+                elif summary_result:
+                    result.merge(summary_result)
             return result
 
         # Récupérer les entités et objets connus via reader
@@ -331,7 +357,7 @@ class ParallelExtractionService:
 
         # État protagoniste (si hint)
         if hints.protagonist_state_changed:
-            phase1_tasks["protagonist"] = asyncio.create_task(
+            phase1_tasks["protagonist_state"] = asyncio.create_task(
                 self.extract_protagonist_state(narrative_text, known_objects)
             )
 
@@ -346,18 +372,18 @@ class ParallelExtractionService:
             )
 
         # Attendre phase 1
-        t0 = time.perf_counter()
-        phase1_results = await asyncio.gather(
-            *phase1_tasks.values(),
-            return_exceptions=True,
-        )
-        t1 = time.perf_counter()
-        logger.debug(f"[EXTRACTION] Phase 1 terminée en {t1 - t0:.2f}s")
+        with span("extraction.phase1", extractors=",".join(phase1_tasks)):
+            phase1_results = await asyncio.gather(
+                *phase1_tasks.values(),
+                return_exceptions=True,
+            )
 
-        # Merger les résultats de phase 1
+        # Merger les résultats de phase 1 (CancelledError: résumé anticipé
+        # annulé par le départ du client)
         for key, res in zip(phase1_tasks.keys(), phase1_results):
-            if isinstance(res, Exception):
-                logger.error(f"[EXTRACTION] Erreur {key}: {res}")
+            if isinstance(res, BaseException):
+                logger.error(f"[EXTRACTION] Erreur {key}: {res!r}")
+                EXTRACTION_FAILURES.inc(extractor=key)
             elif res:
                 result.merge(res)
 
@@ -413,18 +439,16 @@ class ParallelExtractionService:
 
         # Attendre phase 2
         if phase2_tasks:
-            t0 = time.perf_counter()
-            phase2_results = await asyncio.gather(
-                *phase2_tasks.values(),
-                return_exceptions=True,
-            )
-
-            t1 = time.perf_counter()
-            logger.debug(f"[EXTRACTION] Phase 2 terminée en {t1 - t0:.2f}s")
+            with span("extraction.phase2", extractors=",".join(phase2_tasks)):
+                phase2_results = await asyncio.gather(
+                    *phase2_tasks.values(),
+                    return_exceptions=True,
+                )
 
             for key, res in zip(phase2_tasks.keys(), phase2_results):
                 if isinstance(res, Exception):
                     logger.error(f"[EXTRACTION] Erreur {key}: {res}")
+                    EXTRACTION_FAILURES.inc(extractor=key)
                 elif res:
                     result.merge(res)
 
@@ -434,6 +458,7 @@ class ParallelExtractionService:
     # POINT D'ENTRÉE PRINCIPAL
     # =========================================================================
 
+    @traced("extraction")
     async def extract_and_populate(
         self,
         game_id: UUID,
@@ -483,23 +508,29 @@ class ParallelExtractionService:
                     rel["cycle"] = cycle
 
             try:
-                extraction = NarrativeExtraction.model_validate(extraction_data)
+                # Taille inconnue sans sérialiser: toujours hors de la boucle
+                extraction = await validate_model_offloaded(
+                    NarrativeExtraction, extraction_data, size=None
+                )
             except Exception as e:
                 logger.warning(f"[EXTRACTION] Validation error: {e}")
+                EXTRACTION_FAILURES.inc(extractor="validation")
                 extraction = None
 
             # Peupler le KG via ExtractionPopulator
-            async with self.pool.acquire() as conn:
-                populator = ExtractionPopulator(self.pool, game_id)
-                await populator.load_registry(conn)
-
-                if extraction:
-                    stats = await populator.process_extraction(extraction)
-                else:
-                    stats = await self._process_raw_extraction(
-                        populator, conn, extraction_data, cycle
-                    )
-
+            with span("populate", validated=extraction is not None):
+                async with self.pool.acquire() as conn:
+                    populator = ExtractionPopulator(self.pool, game_id)
+                    await populator.load_registry(conn)
+
+                    if extraction:
+                        stats = await populator.process_extraction(extraction)
+                    else:
+                        stats = await self._process_raw_extraction(
+                            populator, conn, extraction_data, cycle
+                        )
+
+            tooltip_index.mark_dirty(game_id, populator.touched_entities)
             return {"success": True, "stats": stats}
 
         except Exception as e:
@@ -531,7 +562,7 @@ class ParallelExtractionService:
                 if "cycle" not in fact_data:
                     fact_data["cycle"] = cycle
 
-                fact = FactData.model_validate(fact_data)
+                fact = validate_model(FactData, fact_data)
                 result = await populator.create_fact(conn, fact)
                 if result:
                     stats["facts_created"] += 1
@@ -573,7 +604,7 @@ class ParallelExtractionService:
             try:
                 from schema import EntityCreation
 
-                entity = EntityCreation.model_validate(entity_data)
+                entity = validate_model(EntityCreation, entity_data)
                 await populator._process_entity_creation(conn, entity, cycle)
                 stats["entities_created"] += 1
             except Exception as e:
@@ -584,7 +615,7 @@ class ParallelExtractionService:
             try:
                 from schema import ObjectCreation
 
-                obj = ObjectCreation.model_validate(obj_data)
+                obj = validate_model(ObjectCreation, obj_data)
                 await populator._process_object_creation(conn, obj, cycle)
                 stats["objects_created"] += 1
             except Exception as e:
@@ -598,7 +629,7 @@ class ParallelExtractionService:
                 relation_dict = rel_data.get("relation", rel_data)
                 rel_cycle = rel_data.get("cycle", cycle)
 
-                relation = RelationData.model_validate(relation_dict)
+                relation = validate_model(RelationData, relation_dict)
                 result = await populator.create_relation(conn, relation, rel_cycle)
                 if result:
                     stats["relations_created"] += 1
@@ -10,10 +10,21 @@ from uuid import UUID
 import asyncpg
 
 from config import STATS_DEFAUT
+from kg.archive import archive_game, find_archivable_games, restore_game
 from kg.reader import KnowledgeGraphReader
 from kg.populator import KnowledgeGraphPopulator
 from kg.specialized_populator import WorldPopulator
 from schema import WorldGeneration, NarrationOutput
+from services.tooltip_service import tooltip_index
+from utils.tracing import traced
+
+# Jauge SQL → clé de stats côté client
+GAUGE_STATS_KEYS = {
+    "energy": "energie",
+    "morale": "moral",
+    "health": "sante",
+    "credits": "credits",
+}
 
 
 class GameService:
@@ -63,6 +74,7 @@ class GameService:
         populator = self._get_populator(game_id)
         async with self.pool.acquire() as conn:
             await populator.delete_game(conn)
+        tooltip_index.invalidate(game_id)
 
     async def rename_game(self, game_id: UUID, name: str) -> None:
         """Renomme une partie"""
@@ -74,6 +86,13 @@ class GameService:
     # CHARGEMENT ÉTAT
     # =========================================================================
 
+    async def get_kg_version(self, game_id: UUID) -> int | None:
+        """Version courante du KG (sert d'ETag aux lectures de la partie)"""
+        reader = self._get_reader(game_id)
+        async with self.pool.acquire() as conn:
+            return await reader.get_kg_version(conn)
+
+    @traced("load_game_state")
     async def load_game_state(self, game_id: UUID) -> dict:
         """Charge l'état complet d'une partie"""
         reader = self._get_reader(game_id)
@@ -84,6 +103,10 @@ class GameService:
             if not game or not game["active"]:
                 raise ValueError(f"Partie {game_id} introuvable")
 
+            # Partie en cold storage: restauration à la demande
+            if game["archived"] and await restore_game(conn, game_id):
+                tooltip_index.invalidate(game_id)
+
             # Vérifier si le monde est créé
             monde_cree = await reader.is_world_created(conn)
 
@@ -320,25 +343,21 @@ class GameService:
         reader = self._get_reader(game_id)
 
         async with self.pool.acquire() as conn:
+            # Localisation incluse (une seule requête, pas de N+1)
             characters = await reader.get_known_characters(conn)
 
-            # Enrichir avec la localisation de chaque personnage
-            result = []
-            for c in characters:
-                location = await reader.get_character_location(conn, c["id"])
-                result.append(
-                    {
-                        "id": str(c["id"]),
-                        "nom": c["name"],
-                        "profession": c["profession"],
-                        "lieu": location,
-                        "relation": self._get_relation_label(c["relation_level"]),
-                        "relation_level": c["relation_level"],
-                        "description": c["physical_description"],
-                    }
-                )
-
-        return result
+        return [
+            {
+                "id": str(c["id"]),
+                "nom": c["name"],
+                "profession": c["profession"],
+                "lieu": c["location"],
+                "relation": self._get_relation_label(c["relation_level"]),
+                "relation_level": c["relation_level"],
+                "description": c["physical_description"],
+            }
+            for c in characters
+        ]
 
     async def load_locations(self, game_id: UUID) -> list[dict]:
         """Charge les lieux connus du protagoniste"""
@@ -398,6 +417,37 @@ class GameService:
             for org in organizations
         ]
 
+    async def load_stats_history(self, game_id: UUID) -> dict:
+        """
+        Évolution des stats du protagoniste (graphique).
+        Une série par jauge: [{cycle, valeur, delta, description}]
+        """
+        reader = self._get_reader(game_id)
+
+        async with self.pool.acquire() as conn:
+            if not await reader.game_exists(conn):
+                raise ValueError(f"Partie {game_id} introuvable")
+            history = await reader.get_gauge_history(conn)
+
+        series = {key: [] for key in STATS_DEFAUT}
+        for h in history:
+            key = GAUGE_STATS_KEYS.get(h["gauge"])
+            if key is None:
+                continue
+            value = int(h["new_value"]) if key == "credits" else float(h["new_value"])
+            series[key].append(
+                {
+                    "cycle": h["cycle"],
+                    "valeur": value,
+                    "delta": float(h["new_value"] - h["old_value"])
+                    if h["old_value"] is not None
+                    else None,
+                    "description": h["description"],
+                }
+            )
+
+        return series
+
     async def load_chat_messages(self, game_id: UUID) -> list[dict]:
         """Charge l'historique des messages"""
         reader = self._get_reader(game_id)
@@ -414,10 +464,12 @@ class GameService:
     # PROCESS INIT (World Generation)
     # =========================================================================
 
+    @traced("process_init")
     async def process_init(self, game_id: UUID, world_gen: WorldGeneration) -> dict:
         """Peuple le Knowledge Graph avec la génération du monde"""
         populator = WorldPopulator(self.pool, game_id)
         await populator.populate(world_gen)
+        tooltip_index.invalidate(game_id)
 
         arrival = world_gen.arrival_event
 
@@ -483,6 +535,7 @@ class GameService:
     # PROCESS LIGHT (Narration)
     # =========================================================================
 
+    @traced("process_light")
     async def process_light(
         self, game_id: UUID, narration: NarrationOutput, current_cycle: int
     ) -> dict:
@@ -523,6 +576,7 @@ class GameService:
     # MESSAGES
     # =========================================================================
 
+    @traced("save_messages")
     async def save_messages(
         self,
         game_id: UUID,
@@ -575,6 +629,7 @@ class GameService:
         async with self.pool.acquire() as conn:
             # Récupérer tous les messages ordonnés
             messages = await reader.get_messages(conn, order="asc")
+            rollback_floor = await reader.get_rollback_floor(conn)
 
             if keep_until_index >= len(messages):
                 return {"deleted": 0, "target_cycle": None, "rollback_result": {}}
@@ -591,6 +646,13 @@ class GameService:
             else:
                 target_cycle = 0
 
+            # Versions d'attributs supprimées par la compaction
+            if target_cycle < rollback_floor:
+                raise ValueError(
+                    f"Rollback impossible avant le cycle {rollback_floor} "
+                    f"(historique compacté)"
+                )
+
             # 1. Supprimer les messages concernés
             ids_to_delete = [m["id"] for m in messages_to_delete]
             await populator.delete_messages_by_ids(conn, ids_to_delete)
@@ -601,12 +663,66 @@ class GameService:
             # 3. Mettre à jour le timestamp
             await populator.update_game_timestamp(conn)
 
+        tooltip_index.invalidate(game_id)
+
         return {
             "deleted": len(messages_to_delete),
             "target_cycle": target_cycle,
             "rollback_result": rollback_result,
         }
 
+    # =========================================================================
+    # COLD STORAGE
+    # =========================================================================
+
+    async def archive_inactive_games(self, inactive_days: int) -> list[dict]:
+        """
+        Archive les parties sans activité depuis inactive_days jours.
+        Une transaction par partie: un échec n'interrompt pas le lot.
+        """
+        async with self.pool.acquire() as conn:
+            game_ids = await find_archivable_games(conn, inactive_days)
+
+        archived = []
+        for game_id in game_ids:
+            try:
+                async with self.pool.acquire() as conn:
+                    stats = await archive_game(conn, game_id)
+                if stats:
+                    archived.append(stats)
+                    tooltip_index.invalidate(game_id)
+            except Exception as e:
+                print(f"[ARCHIVE] Erreur archivage {game_id}: {e}")
+
+        return archived
+
+    async def restore_game(self, game_id: UUID) -> bool:
+        """Restaure une partie archivée (True si restaurée)"""
+        async with self.pool.acquire() as conn:
+            restored = await restore_game(conn, game_id) is not None
+        if restored:
+            tooltip_index.invalidate(game_id)
+        return restored
+
+    async def compact_attributes(self, horizon: int, drop: bool = False) -> int:
+        """Compacte les versions d'attributs de toutes les parties actives"""
+        reader = KnowledgeGraphReader(self.pool)
+        async with self.pool.acquire() as conn:
+            games = await reader.list_games(conn, active_only=True)
+
+        total = 0
+        for game in games:
+            if game["archived"]:
+                continue
+            populator = self._get_populator(game["id"])
+            try:
+                async with self.pool.acquire() as conn:
+                    total += await populator.compact_attributes(conn, horizon, drop)
+            except Exception as e:
+                print(f"[COMPACTION] Erreur partie {game['id']}: {e}")
+
+        return total
+
     # =========================================================================
     # HELPERS (privés)
     # =========================================================================
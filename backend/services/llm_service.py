@@ -5,25 +5,71 @@ Gestion des appels à Claude
 
 from collections.abc import Awaitable, Callable
 
-import json
 import logging
-import anthropic
-from schema.world_generation import WorldGeneration
-
-from api.streaming import SSEWriter, build_display_text, extract_narrative_from_partial
+import time
+from typing import TYPE_CHECKING
+
+from api.streaming import (
+    SSEWriter,
+    WorldGenProgressTracker,
+    build_display_text,
+    extract_narrative_from_partial,
+)
 from config import get_settings
 from utils import parse_json_response
+from utils.llm_recording import record_call
+from utils.metrics import (
+    CONTEXT_PROMPT_TOKENS,
+    EXTRACTION_FAILURES,
+    LLM_LATENCY,
+    LLM_TOKENS,
+    LLM_TTFT,
+)
+from utils.offload import log_json, run_cpu, validate_model_offloaded
+from utils.tracing import span, start_span
+
+if TYPE_CHECKING:
+    from schema.world_generation import WorldGeneration
 
 logger = logging.getLogger(__name__)
 
 
+def _record_usage(model: str, extractor: str, usage) -> int:
+    """
+    Tokens d'un appel (usage Anthropic) dans /metrics.
+    Retourne la taille du prompt, cache compris.
+    """
+    if usage is None:
+        return 0
+    input_tokens = (
+        (usage.input_tokens or 0)
+        + (getattr(usage, "cache_read_input_tokens", None) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+    )
+    LLM_TOKENS.observe(
+        input_tokens, model=model, extractor=extractor, direction="input"
+    )
+    LLM_TOKENS.observe(
+        usage.output_tokens or 0, model=model, extractor=extractor, direction="output"
+    )
+    return input_tokens
+
+
 class LLMService:
     """Service pour les appels Claude"""
 
     def __init__(self):
+        # Import différé: anthropic (httpx, modèles pydantic) pèse lourd au
+        # démarrage; chargé au premier service créé (warm-up du lifespan)
+        import anthropic
+
         settings = get_settings()
-        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+        )
         self.settings = settings
+        self._api_error = anthropic.APIError
 
     # =========================================================================
     # STREAMING NARRATEUR
@@ -61,55 +107,97 @@ class LLMService:
         last_sent_length = 0
         last_progress_length = 0
         narrative_callback_fired = False
+        progress_tracker = WorldGenProgressTracker() if is_init_mode else None
+        extractor = "world_builder" if is_init_mode else "narrator"
+
+        async def send_progress_delta() -> None:
+            nonlocal last_progress_length
+            delta = full_json[last_progress_length:]
+            progress_tracker.feed(delta)
+            await sse_writer.send_progress(
+                delta, last_progress_length, progress_tracker.milestones()
+            )
+            last_progress_length = len(full_json)
 
         try:
-            async with self.client.messages.stream(
-                model=settings.model_main,
-                max_tokens=max_tokens,
-                temperature=settings.temperature
-                if temperature is None
-                else temperature,
-                system=[
-                    {
-                        "type": "text",
-                        "text": system_prompt,
-                        "cache_control": {"type": "ephemeral"},
-                    }
-                ],
-                messages=[{"role": "user", "content": user_message}],
-            ) as stream:
-                async for event in stream:
-                    if hasattr(event, "delta") and hasattr(event.delta, "text"):
-                        full_json += event.delta.text
-
-                        if is_init_mode:
-                            if len(full_json) - last_progress_length > 500:
-                                await sse_writer.send_progress(full_json)
-                                last_progress_length = len(full_json)
-                        else:
-                            displayable = extract_narrative_from_partial(full_json)
-                            if displayable and len(displayable) > last_sent_length:
-                                delta = displayable[last_sent_length:]
-                                await sse_writer.send_chunk(delta)
-                                last_sent_length = len(displayable)
-
-                                # Détecter la fin du narrative_text
-                                # On cherche la fermeture du champ narrative_text
-                                if (
-                                    not narrative_callback_fired
-                                    and on_narrative_ready
-                                    and self._is_narrative_complete(full_json)
-                                ):
-                                    narrative_callback_fired = True
-                                    await on_narrative_ready(displayable)
+            with span(
+                "llm.stream",
+                **{"llm.model": settings.model_main, "llm.init": is_init_mode},
+            ) as stream_span:
+                # Temps jusqu'au premier token: de l'envoi au premier delta
+                ttft_span = start_span("llm.ttft")
+                started = time.perf_counter()
+                recording = record_call(extractor, settings.model_main)
+                async with self.client.messages.stream(
+                    model=settings.model_main,
+                    max_tokens=max_tokens,
+                    temperature=settings.temperature
+                    if temperature is None
+                    else temperature,
+                    system=[
+                        {
+                            "type": "text",
+                            "text": system_prompt,
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                    messages=[{"role": "user", "content": user_message}],
+                ) as stream:
+                    async for event in stream:
+                        if hasattr(event, "delta") and hasattr(event.delta, "text"):
+                            if not full_json:
+                                ttft_span.end()
+                                LLM_TTFT.observe(
+                                    time.perf_counter() - started,
+                                    model=settings.model_main,
+                                )
+                            full_json += event.delta.text
+                            if recording:
+                                recording.delta(event.delta.text)
+
+                            if is_init_mode:
+                                if len(full_json) - last_progress_length > 500:
+                                    await send_progress_delta()
+                            else:
+                                displayable = extract_narrative_from_partial(full_json)
+                                if displayable and len(displayable) > last_sent_length:
+                                    delta = displayable[last_sent_length:]
+                                    await sse_writer.send_chunk(delta)
+                                    last_sent_length = len(displayable)
+
+                                    # Détecter la fin du narrative_text
+                                    # On cherche la fermeture du champ narrative_text
+                                    if (
+                                        not narrative_callback_fired
+                                        and on_narrative_ready
+                                        and self._is_narrative_complete(full_json)
+                                    ):
+                                        narrative_callback_fired = True
+                                        await on_narrative_ready(displayable)
+
+                    final_message = await stream.get_final_message()
+
+                if recording:
+                    recording.finish(full_json, final_message.usage)
+                ttft_span.end()
+                stream_span.set_attribute("llm.output_chars", len(full_json))
+                LLM_LATENCY.observe(
+                    time.perf_counter() - started,
+                    model=settings.model_main,
+                    extractor=extractor,
+                )
+                prompt_tokens = _record_usage(
+                    settings.model_main, extractor, final_message.usage
+                )
+                if not is_init_mode:
+                    CONTEXT_PROMPT_TOKENS.observe(prompt_tokens)
+                stream_span.set_attribute("llm.input_tokens", prompt_tokens)
 
             if is_init_mode and len(full_json) > last_progress_length:
-                await sse_writer.send_progress(full_json)
+                await send_progress_delta()
 
-            parsed = parse_json_response(full_json)
-            logger.info(
-                f"[LLM] JSON généré:\n{json.dumps(parsed, indent=2, ensure_ascii=False)}"
-            )
+            parsed = await run_cpu(parse_json_response, full_json, size=len(full_json))
+            await log_json(logger, "[LLM] JSON généré", parsed, size=len(full_json))
 
             display_text = None
             if not is_init_mode and parsed:
@@ -122,7 +210,7 @@ class LLMService:
             if on_complete:
                 await on_complete(parsed, display_text, full_json)
 
-        except anthropic.APIError as e:
+        except self._api_error as e:
             print(f"[LLM] Erreur API: {e}")
             await sse_writer.send_error(
                 f"Erreur API Claude: {e.message}", recoverable=True
@@ -150,25 +238,39 @@ class LLMService:
         self,
         system_prompt: str,
         user_message: str,
+        extractor: str = "light",
     ) -> dict | None:
         """
         Extraction légère avec Haiku.
         Pour: résumé, état protagoniste, faits, relations, croyances.
         """
+        model = self.settings.model_extraction_light
+        started = time.perf_counter()
+        recording = record_call(extractor, model)
         try:
             response = await self.client.messages.create(
-                model=self.settings.model_extraction_light,
+                model=model,
                 max_tokens=self.settings.max_tokens_extraction_light,
                 temperature=self.settings.temperature_extraction,
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_message}],
             )
+            LLM_LATENCY.observe(
+                time.perf_counter() - started, model=model, extractor=extractor
+            )
+            _record_usage(model, extractor, response.usage)
 
             content = response.content[0].text
-            return parse_json_response(content)
+            if recording:
+                recording.finish(content, response.usage)
+            parsed = await run_cpu(parse_json_response, content, size=len(content))
+            if parsed is None:
+                EXTRACTION_FAILURES.inc(extractor=extractor)
+            return parsed
 
         except Exception as e:
             print(f"[LLM] Erreur extraction light: {e}")
+            EXTRACTION_FAILURES.inc(extractor=extractor)
             return None
 
     # =========================================================================
@@ -179,25 +281,39 @@ class LLMService:
         self,
         system_prompt: str,
         user_message: str,
+        extractor: str = "heavy",
     ) -> dict | None:
         """
         Extraction lourde avec Sonnet.
         Pour: entités (avec arcs), engagements narratifs.
         """
+        model = self.settings.model_extraction_heavy
+        started = time.perf_counter()
+        recording = record_call(extractor, model)
         try:
             response = await self.client.messages.create(
-                model=self.settings.model_extraction_heavy,
+                model=model,
                 max_tokens=self.settings.max_tokens_extraction_heavy,
                 temperature=self.settings.temperature_extraction,
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_message}],
             )
+            LLM_LATENCY.observe(
+                time.perf_counter() - started, model=model, extractor=extractor
+            )
+            _record_usage(model, extractor, response.usage)
 
             content = response.content[0].text
-            return parse_json_response(content)
+            if recording:
+                recording.finish(content, response.usage)
+            parsed = await run_cpu(parse_json_response, content, size=len(content))
+            if parsed is None:
+                EXTRACTION_FAILURES.inc(extractor=extractor)
+            return parsed
 
         except Exception as e:
             print(f"[LLM] Erreur extraction heavy: {e}")
+            EXTRACTION_FAILURES.inc(extractor=extractor)
             return None
 
     # =========================================================================
@@ -245,8 +361,12 @@ Résumé (une phrase):""",
         self,
         system_prompt: str,
         user_message: str,
-    ) -> WorldGeneration | None:
+    ) -> "WorldGeneration | None":
         """Génère un monde complet (appel non-streaming)"""
+        # Import différé: le schéma de génération n'est utile qu'à la
+        # création d'une partie
+        from schema.world_generation import WorldGeneration
+
         try:
             response = await self.client.messages.create(
                 model=self.settings.model_main,
@@ -257,13 +377,13 @@ Résumé (une phrase):""",
             )
 
             content = response.content[0].text
-            parsed = parse_json_response(content)
-            logger.info(
-                f"[LLM] JSON généré:\n{json.dumps(parsed, indent=2, ensure_ascii=False)}"
-            )
+            parsed = await run_cpu(parse_json_response, content, size=len(content))
+            await log_json(logger, "[LLM] JSON généré", parsed, size=len(content))
 
             if parsed:
-                return WorldGeneration.model_validate(parsed)
+                return await validate_model_offloaded(
+                    WorldGeneration, parsed, size=len(content)
+                )
             return None
 
         except Exception as e:
@@ -0,0 +1,305 @@
+"""
+LDVELH - Index des tooltips
+Formatage des entités du KG pour les tooltips frontend et index
+matérialisé par partie (servi par api.tooltips, tenu à jour par les
+services après chaque écriture du KG)
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from uuid import UUID
+
+import asyncpg
+from pydantic import BaseModel
+
+from kg.reader import KnowledgeGraphReader
+from utils.serialization import dumps_bytes, etag_for
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# RESPONSE MODELS
+# =============================================================================
+
+
+class TooltipInfo(BaseModel):
+    """Info tooltip formatée pour le frontend"""
+
+    icon: str
+    nom: str
+    type: str
+    infos: list[str]
+    relation: Optional[str] = None
+
+
+class TooltipEntry(BaseModel):
+    """Entrée tooltip complète"""
+
+    entite_id: UUID
+    entite_type: str
+    entite_nom: str
+    alias: list[str]
+    connaissances: dict
+    relation_valentin: Optional[dict] = None
+    formatted: TooltipInfo
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+# Labels pour le formatage
+TYPE_ICONS = {
+    "personnage": "👤",
+    "lieu": "📍",
+    "organisation": "🏢",
+    "objet": "📦",
+    "arc_narratif": "📖",
+    "ia": "🤖",
+    # Types du schéma (entity_type)
+    "character": "👤",
+    "location": "📍",
+    "organization": "🏢",
+    "object": "📦",
+    "ai": "🤖",
+}
+
+TYPE_LABELS = {
+    "personnage": "Personnage",
+    "lieu": "Lieu",
+    "organisation": "Organisation",
+    "objet": "Objet",
+    "ia": "IA",
+    "character": "Personnage",
+    "location": "Lieu",
+    "organization": "Organisation",
+    "object": "Objet",
+    "ai": "IA",
+}
+
+CONNAISSANCE_LABELS = {
+    "metier": "Métier",
+    "physique": "Apparence",
+    "espece": "Espèce",
+    "age": "Âge",
+    "domicile": "Domicile",
+    "hobby": "Hobby",
+    "traits": "Traits",
+    "type_lieu": "Type",
+    "ambiance": "Ambiance",
+    "horaires": "Horaires",
+    "domaine": "Domaine",
+    "type_org": "Type",
+    "voix": "Voix",
+    "occupation": "Occupation",
+}
+
+RELATION_LABELS = {
+    "connait": "Connaissance",
+    "ami_de": "Ami",
+    "collegue_de": "Collègue",
+    "superieur_de": "Supérieur",
+    "employe_de": "Employeur",
+    "travaille_a": "Lieu de travail",
+    "habite": "Domicile",
+    "frequente": "Lieu fréquenté",
+    "possede": "Possédé",
+    # Types du schéma (relation_type)
+    "knows": "Connaissance",
+    "friend_of": "Ami",
+    "enemy_of": "Ennemi",
+    "family_of": "Famille",
+    "romantic": "Relation amoureuse",
+    "employed_by": "Employeur",
+    "colleague_of": "Collègue",
+    "manages": "Supérieur",
+    "works_at": "Lieu de travail",
+    "lives_at": "Domicile",
+    "frequents": "Lieu fréquenté",
+    "owns": "Possédé",
+    "owes_to": "Créancier",
+}
+
+# Ordre de priorité pour l'affichage des connaissances
+PRIORITY_ORDER = [
+    "metier",
+    "physique",
+    "espece",
+    "age",
+    "domicile",
+    "hobby",
+    "traits",
+    "type_lieu",
+    "ambiance",
+    "horaires",
+    "domaine",
+    "type_org",
+]
+
+
+def truncate(text: str, max_len: int = 50) -> str:
+    """Tronque un texte si nécessaire"""
+    if not text or len(text) <= max_len:
+        return text
+    return text[: max_len - 1] + "…"
+
+
+def format_connaissance(key: str, value) -> str:
+    """Formate une connaissance pour affichage"""
+    label = CONNAISSANCE_LABELS.get(key, key.replace("_", " ").title())
+
+    if isinstance(value, list):
+        val = ", ".join(str(v) for v in value)
+    else:
+        val = str(value)
+
+    return f"{label}: {truncate(val)}"
+
+
+def format_tooltip(entity_data: dict) -> TooltipInfo:
+    """
+    Formate les données d'une entité pour affichage tooltip.
+    Equivalent de formatTooltip() dans knowledgeService.js
+    """
+    entite_type = entity_data.get("entite_type", "")
+    entite_nom = entity_data.get("entite_nom", "")
+    connaissances = entity_data.get("connaissances") or {}
+    relation_valentin = entity_data.get("relation_valentin")
+
+    # Icône selon type
+    icon = TYPE_ICONS.get(entite_type, "❓")
+
+    # Relation avec Valentin
+    relation_txt = None
+    if relation_valentin and relation_valentin.get("type"):
+        rel_type = relation_valentin["type"]
+        relation_txt = RELATION_LABELS.get(rel_type, rel_type)
+
+    # Formater les connaissances
+    infos = []
+
+    # D'abord les clés prioritaires
+    for key in PRIORITY_ORDER:
+        if key in connaissances and connaissances[key]:
+            infos.append(format_connaissance(key, connaissances[key]))
+
+    # Puis le reste (sauf 'nom')
+    for key, val in connaissances.items():
+        if key not in PRIORITY_ORDER and key != "nom" and val:
+            infos.append(format_connaissance(key, val))
+
+    return TooltipInfo(
+        icon=icon, nom=entite_nom, type=entite_type, infos=infos, relation=relation_txt
+    )
+
+
+# =============================================================================
+# INDEX PAR PARTIE (cache)
+# =============================================================================
+
+
+def build_tooltip_entry(entity_data: dict) -> dict:
+    """Entrée d'index: données brutes + rendu formaté"""
+    formatted = format_tooltip(entity_data)
+    return {**entity_data, "formatted": formatted.model_dump()}
+
+
+@dataclass
+class _GameTooltips:
+    """Index d'une partie: entrées par entité + réponse sérialisée"""
+
+    entries: dict[UUID, dict] = field(default_factory=dict)
+    dirty: set[UUID] = field(default_factory=set)
+    built: bool = False
+    body: bytes | None = None
+    etag: str | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class TooltipIndex:
+    """
+    Index des tooltips matérialisé par partie.
+
+    Construit une fois, puis seules les entités signalées par le populator
+    (mark_dirty, après commit) sont relues et reformatées. La réponse
+    sérialisée et son ETag sont conservés tant que rien ne change.
+    """
+
+    def __init__(self, max_games: int = 64):
+        self.max_games = max_games
+        self._games: OrderedDict[UUID, _GameTooltips] = OrderedDict()
+
+    def mark_dirty(self, game_id: UUID, entity_ids: Iterable[UUID]) -> None:
+        """Entités modifiées: à recalculer à la prochaine lecture"""
+        state = self._games.get(game_id)
+        if state is None:
+            return
+        ids = set(entity_ids)
+        if ids:
+            state.dirty |= ids
+            state.body = None
+
+    def invalidate(self, game_id: UUID) -> None:
+        """Reconstruction complète à la prochaine lecture"""
+        self._games.pop(game_id, None)
+
+    async def get(self, pool: asyncpg.Pool, game_id: UUID) -> tuple[bytes, str]:
+        """Réponse sérialisée et ETag, recalculés seulement si nécessaire"""
+        state = self._games.get(game_id)
+        if state is None:
+            state = self._games[game_id] = _GameTooltips()
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+        self._games.move_to_end(game_id)
+
+        async with state.lock:
+            if state.body is not None:
+                return state.body, state.etag
+            return await self._refresh(pool, game_id, state)
+
+    async def _refresh(
+        self, pool: asyncpg.Pool, game_id: UUID, state: _GameTooltips
+    ) -> tuple[bytes, str]:
+        full = not state.built
+        dirty = None if full else list(state.dirty)
+        state.dirty = set()
+
+        reader = KnowledgeGraphReader(pool, game_id)
+        async with pool.acquire() as conn:
+            rows = await reader.get_tooltip_entities(conn, dirty)
+
+        if full:
+            state.entries = {}
+        else:
+            for entity_id in dirty:
+                state.entries.pop(entity_id, None)
+        for row in rows:
+            state.entries[row["entite_id"]] = build_tooltip_entry(row)
+
+        # Index par nom puis alias (un alias ne masque pas un nom)
+        tooltips = {}
+        for entry in state.entries.values():
+            for alias in entry["alias"] or []:
+                tooltips[alias.lower()] = entry
+        for entry in state.entries.values():
+            tooltips[entry["entite_nom"].lower()] = entry
+
+        state.built = True
+        body = dumps_bytes({"tooltips": tooltips})
+        etag = etag_for(body)
+        # Entités signalées pendant la lecture: à recalculer au prochain appel
+        if not state.dirty:
+            state.body, state.etag = body, etag
+        logger.debug(
+            f"[TOOLTIPS] Index {game_id}: "
+            f"{'complet' if full else f'{len(dirty)} entité(s) recalculée(s)'}, "
+            f"{len(state.entries)} entités"
+        )
+        return body, etag
+
+
+tooltip_index = TooltipIndex()
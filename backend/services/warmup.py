@@ -0,0 +1,133 @@
+"""
+LDVELH - Warm-up au démarrage
+Construit et exerce les modèles chauds (génération du monde, narration,
+extraction) avec des fixtures figées, avant la première requête.
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from schema import (
+    EntityCreation,
+    FactData,
+    NarrationOutput,
+    NarrativeExtraction,
+    ObjectCreation,
+    RelationData,
+    WorldGeneration,
+)
+from schema.core import warm_up_normalizers
+from utils.validation import warm_up_models
+
+logger = logging.getLogger(__name__)
+
+WORLD_GENERATION_EXAMPLE = (
+    Path(__file__).resolve().parent.parent / "prompts" / "example_world_generation.json"
+)
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+_NARRATION = {
+    "narrative_text": (
+        "La coursive du module C bourdonne doucement. Valentin longe les hublots, "
+        "le café encore tiède entre les mains, et salue d'un signe la mécanicienne "
+        "qui répare un panneau d'éclairage au bout du couloir."
+    ),
+    "time": {"new_time": "08h30"},
+    "current_location": "Coursive C",
+    "npcs_present": ["Mira Okonkwo"],
+    "suggested_actions": ["Aller au travail", "Discuter avec Mira"],
+    "hints": {"new_entities_mentioned": [], "relationships_changed": True},
+    "scene_mood": "calme matinal",
+}
+
+_FACT = {
+    "cycle": 1,
+    "time": "08h30",
+    "fact_type": "interaction",
+    "description": "Valentin salue Mira dans la coursive C.",
+    "location_ref": "Coursive C",
+    "importance": 2,
+    "participants": [
+        {"entity_ref": "Valentin", "role": "actor"},
+        {"entity_ref": "Mira Okonkwo", "role": "witness"},
+    ],
+    "semantic_key": "valentin:salue:mira",
+}
+
+_ENTITY = {
+    "entity_type": "character",
+    "name": "Mira Okonkwo",
+    "attributes": [
+        {"key": "occupation", "value": "Mécanicienne"},
+        {"key": "mood", "value": "concentrée"},
+    ],
+}
+
+_OBJECT = {
+    "name": "Gobelet thermique",
+    "attributes": [{"key": "category", "value": "quotidien"}],
+    "from_hint": "un gobelet thermique offert par Mira",
+}
+
+_RELATION = {
+    "source_ref": "Valentin",
+    "target_ref": "Mira Okonkwo",
+    "relation_type": "knows",
+}
+
+
+def build_fixtures() -> list[tuple[type, object]]:
+    """(modèle, données) pour chaque modèle validé sur le chemin d'un tour"""
+    fixtures = [
+        (NarrationOutput, _NARRATION),
+        (FactData, _FACT),
+        (EntityCreation, _ENTITY),
+        (ObjectCreation, _OBJECT),
+        (RelationData, _RELATION),
+        (
+            NarrativeExtraction,
+            {
+                "cycle": 1,
+                "current_location_ref": "Coursive C",
+                "facts": [_FACT],
+                "entities_created": [_ENTITY],
+                "objects_created": [_OBJECT],
+                "relations_created": [{"relation": _RELATION, "cycle": 1}],
+                "gauge_changes": [
+                    {"gauge": "morale", "delta": 0.5, "reason": "Bonne rencontre"}
+                ],
+            },
+        ),
+    ]
+    try:
+        world = json.loads(WORLD_GENERATION_EXAMPLE.read_text(encoding="utf-8"))
+        fixtures.append((WorldGeneration, world))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"[WARMUP] Exemple de monde illisible: {e}")
+    return fixtures
+
+
+# =============================================================================
+# WARM-UP
+# =============================================================================
+
+
+def warm_up() -> dict[str, float]:
+    """
+    Tables de normalisation puis validation de chaque fixture.
+    Synchrone (CPU): à lancer dans un thread depuis le lifespan.
+    """
+    start = time.perf_counter()
+    warm_up_normalizers()
+    durations = {"normalizers": (time.perf_counter() - start) * 1000}
+    durations.update(warm_up_models(build_fixtures()))
+    logger.info(
+        "[WARMUP] "
+        + ", ".join(f"{name}: {ms:.1f}ms" for name, ms in durations.items())
+    )
+    return durations
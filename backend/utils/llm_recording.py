@@ -0,0 +1,180 @@
+"""
+LDVELH - Enregistrement des tours (record/replay)
+Capture, pour chaque tour de chat, la requête reçue par _handle_chat et
+les sorties brutes des appels LLM: stream du narrateur (deltas horodatés)
+et réponse de chaque extracteur. Une ligne JSON par tour dans
+LLM_RECORD_FILE, rejouée sans réseau par benchmarks.replay.
+
+Hors enregistrement, record_call() ne coûte qu'une lecture de contextvar.
+Les tâches lancées pendant le tour (résumé anticipé, extracteurs en
+parallèle) héritent du contexte et enregistrent dans le même tour.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from utils.offload import run_cpu
+from utils.serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+# Version du format des lignes (vérifiée par benchmarks.replay)
+RECORD_FORMAT = 1
+
+
+class CallRecording:
+    """Un appel LLM: texte brut, deltas du stream, latence et usage"""
+
+    __slots__ = (
+        "kind",
+        "model",
+        "offset_s",
+        "latency_s",
+        "text",
+        "usage",
+        "deltas",
+        "_start",
+    )
+
+    def __init__(self, kind: str, model: str, turn_start: float):
+        self._start = time.perf_counter()
+        self.kind = kind
+        self.model = model
+        self.offset_s = self._start - turn_start
+        self.latency_s: float | None = None
+        self.text: str | None = None  # None: appel en erreur
+        self.usage: dict | None = None
+        self.deltas: list[tuple[float, str]] = []
+
+    def delta(self, text: str) -> None:
+        """Delta de stream, horodaté depuis le début de l'appel"""
+        self.deltas.append((round(time.perf_counter() - self._start, 4), text))
+
+    def finish(self, text: str, usage: Any = None) -> None:
+        self.latency_s = round(time.perf_counter() - self._start, 4)
+        self.text = text
+        if usage is not None:
+            self.usage = {
+                "input_tokens": usage.input_tokens or 0,
+                "output_tokens": usage.output_tokens or 0,
+                "cache_read_input_tokens": getattr(
+                    usage, "cache_read_input_tokens", None
+                ),
+                "cache_creation_input_tokens": getattr(
+                    usage, "cache_creation_input_tokens", None
+                ),
+            }
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "model": self.model,
+            "offset_s": round(self.offset_s, 4),
+            "latency_s": self.latency_s,
+            "text": self.text,
+            "usage": self.usage,
+            "deltas": self.deltas or None,
+        }
+
+
+class TurnRecording:
+    """Requête d'un tour et appels LLM faits pendant ce tour"""
+
+    __slots__ = ("game_id", "request", "recorded_at", "status", "calls", "_start")
+
+    def __init__(self, game_id: UUID, request: dict):
+        self.game_id = game_id
+        self.request = request
+        self.recorded_at = time.time()
+        self.status = "ok"  # ok | cancelled | error
+        self.calls: list[CallRecording] = []
+        self._start = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        return {
+            "format": RECORD_FORMAT,
+            "game_id": str(self.game_id),
+            "recorded_at": self.recorded_at,
+            "duration_s": round(time.perf_counter() - self._start, 4),
+            "status": self.status,
+            "request": self.request,
+            "calls": [call.to_dict() for call in self.calls],
+        }
+
+
+_current_turn: ContextVar[TurnRecording | None] = ContextVar(
+    "ldvelh_turn_recording", default=None
+)
+
+
+def record_call(kind: str, model: str) -> CallRecording | None:
+    """Nouvel appel du tour enregistré courant (None hors enregistrement)"""
+    turn = _current_turn.get()
+    if turn is None:
+        return None
+    call = CallRecording(kind, model, turn._start)
+    turn.calls.append(call)
+    return call
+
+
+# =============================================================================
+# ÉCRITURE
+# =============================================================================
+
+
+class _RecordingConfig:
+    path: str = ""
+
+
+_config = _RecordingConfig()
+_file_lock = threading.Lock()
+
+
+def configure_recording(path: str) -> None:
+    """Fichier des tours enregistrés (vide = pas d'enregistrement)"""
+    _config.path = path
+    if path:
+        logger.info(f"[RECORD] Enregistrement des tours dans {os.path.abspath(path)}")
+
+
+@asynccontextmanager
+async def record_turn(game_id: UUID, request: Any) -> AsyncIterator[None]:
+    """
+    Enregistre le tour exécuté dans le bloc (request: modèle pydantic de
+    la requête). La ligne est écrite à la sortie, même si le tour est
+    annulé ou échoue (status l'indique).
+    """
+    if not _config.path:
+        yield
+        return
+
+    turn = TurnRecording(game_id, request.model_dump(mode="json"))
+    token = _current_turn.set(turn)
+    try:
+        yield
+    except asyncio.CancelledError:
+        turn.status = "cancelled"
+        raise
+    except Exception:
+        turn.status = "error"
+        raise
+    finally:
+        _current_turn.reset(token)
+        # Le monde généré pèse plusieurs centaines de Ko: écriture en thread
+        await run_cpu(_write, turn.to_dict())
+
+
+def _write(record: dict) -> None:
+    try:
+        line = dumps_bytes(record) + b"\n"
+        with _file_lock, open(_config.path, "ab") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning(f"[RECORD] Écriture impossible ({record['game_id']}): {e}")
@@ -0,0 +1,128 @@
+"""
+LDVELH - Surveillance de la boucle asyncio
+Mesure le retard d'ordonnancement (lag) en échantillonnant un sleep, et
+détecte les blocages: un thread de garde vérifie que la boucle se réveille
+à l'heure et, sinon, capture la pile du code qui la bloque (callback ou
+coroutine CPU-bound qui ne rend pas la main).
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from utils.metrics import LOOP_BLOCKED, LOOP_LAG
+from utils.validation import percentile
+
+logger = logging.getLogger(__name__)
+
+# Mesures de lag conservées, blocages gardés pour l'admin
+LAG_SAMPLES = 1200
+BLOCK_HISTORY = 20
+
+
+class LoopLagMonitor:
+    """
+    Tâche d'échantillonnage (toutes les interval secondes) et thread de
+    garde. Un blocage est signalé une fois par réveil manqué, avec la pile
+    du thread de la boucle au moment où le seuil est franchi.
+    """
+
+    def __init__(self, interval: float = 0.25, block_ms: float = 200.0):
+        self.interval = interval
+        self.block_ms = block_ms
+        self._lags: deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._blocks: deque[dict] = deque(maxlen=BLOCK_HISTORY)
+        self._heartbeat = time.perf_counter()
+        self._reported = 0.0
+        self._loop_thread: int | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    async def run(self) -> None:
+        """Boucle d'échantillonnage, à lancer comme tâche (lifespan)"""
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        if self.block_ms > 0:
+            threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            ).start()
+        try:
+            while True:
+                start = time.perf_counter()
+                self._heartbeat = start
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, time.perf_counter() - start - self.interval)
+                LOOP_LAG.observe(lag)
+                with self._lock:
+                    self._lags.append(lag * 1000)
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        """Thread de garde: pile de la boucle si le réveil a trop de retard"""
+        check = max(self.block_ms / 4000, 0.01)
+        while not self._stop.wait(check):
+            heartbeat = self._heartbeat
+            late_ms = (time.perf_counter() - heartbeat - self.interval) * 1000
+            if late_ms < self.block_ms or heartbeat == self._reported:
+                continue
+            self._reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            LOOP_BLOCKED.inc()
+            with self._lock:
+                self._blocks.append(
+                    {
+                        "at": time.time(),
+                        "blocked_ms": round(late_ms, 1),
+                        "stack": stack,
+                    }
+                )
+            logger.warning(
+                f"[LOOP] Boucle bloquée depuis {late_ms:.0f}ms, pile:\n{stack}"
+            )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self) -> dict:
+        """Lag récent (p50/p95/p99/max en ms) et derniers blocages"""
+        with self._lock:
+            lags = sorted(self._lags)
+            blocks = list(self._blocks)
+        stats = {"samples": len(lags)}
+        if lags:
+            stats.update(
+                p50_ms=round(percentile(lags, 0.50), 2),
+                p95_ms=round(percentile(lags, 0.95), 2),
+                p99_ms=round(percentile(lags, 0.99), 2),
+                max_ms=round(lags[-1], 2),
+            )
+        return {
+            "interval_ms": self.interval * 1000,
+            "block_ms": self.block_ms,
+            "lag": stats,
+            "blocks": blocks[::-1],
+        }
+
+
+_loop_monitor: LoopLagMonitor | None = None
+
+
+def get_loop_monitor() -> LoopLagMonitor | None:
+    return _loop_monitor
+
+
+def start_loop_monitor(interval_ms: float, block_ms: float) -> asyncio.Task | None:
+    """Crée le moniteur global et sa tâche (None si interval_ms <= 0)"""
+    global _loop_monitor
+    if interval_ms <= 0:
+        return None
+    _loop_monitor = LoopLagMonitor(interval_ms / 1000, block_ms)
+    return asyncio.create_task(_loop_monitor.run())
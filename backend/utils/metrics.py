@@ -0,0 +1,249 @@
+"""
+LDVELH - Métriques Prometheus
+Compteurs, jauges et histogrammes avec labels, rendus au format texte
+d'exposition Prometheus (GET /metrics). Sans dépendance: les valeurs
+calculées à la lecture (pool, streams SSE) passent par des collecteurs
+appelés au scrape.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Métrique nommée, une série par combinaison de labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labels)
+        self._series: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in sorted(series):
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key: tuple[str, ...], value) -> list[str]:
+        labels = _format_labels(self.labelnames, key)
+        return [f"{self.name}{labels} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._series[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [compte par bucket (non cumulé) ..., +Inf], somme
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def _render_series(self, key: tuple[str, ...], value) -> list[str]:
+        counts, total = value
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(names, key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Métriques déclarées et collecteurs appelés avant chaque rendu"""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def _add(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """Fonction qui met à jour des jauges au moment du scrape"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                # Un collecteur en erreur ne doit pas casser le scrape
+                pass
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# =============================================================================
+# MÉTRIQUES LDVELH
+# =============================================================================
+
+_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+_TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+# LLM (extractor: narrator, summary, facts, entities...)
+LLM_LATENCY = registry.histogram(
+    "ldvelh_llm_request_seconds",
+    "Durée des appels LLM (stream complet pour le narrateur)",
+    ("model", "extractor"),
+    _LATENCY_BUCKETS,
+)
+LLM_TTFT = registry.histogram(
+    "ldvelh_llm_time_to_first_token_seconds",
+    "Délai avant le premier token du narrateur",
+    ("model",),
+    _LATENCY_BUCKETS,
+)
+LLM_TOKENS = registry.histogram(
+    "ldvelh_llm_tokens",
+    "Tokens par appel LLM (direction: input, output)",
+    ("model", "extractor", "direction"),
+    _TOKEN_BUCKETS,
+)
+EXTRACTION_FAILURES = registry.counter(
+    "ldvelh_extraction_failures_total",
+    "Extractions en échec (erreur API, JSON illisible, exception)",
+    ("extractor",),
+)
+CONTEXT_PROMPT_TOKENS = registry.histogram(
+    "ldvelh_context_prompt_tokens",
+    "Taille du prompt du narrateur (système + contexte), en tokens",
+    (),
+    _TOKEN_BUCKETS,
+)
+
+# Pool asyncpg
+DB_POOL_ACQUIRE = registry.histogram(
+    "ldvelh_db_pool_acquire_seconds",
+    "Attente pour obtenir une connexion du pool",
+    (),
+    _WAIT_BUCKETS,
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "ldvelh_db_pool_connections",
+    "Connexions du pool (state: in_use, idle, max)",
+    ("state",),
+)
+
+# SSE
+SSE_ACTIVE_STREAMS = registry.gauge(
+    "ldvelh_sse_active_streams", "Streams SSE ouverts (tour en cours)"
+)
+SSE_QUEUE_DEPTH = registry.gauge(
+    "ldvelh_sse_queue_events", "Événements en attente d'envoi, tous streams confondus"
+)
+SSE_BYTES_SENT = registry.counter(
+    "ldvelh_sse_bytes_sent_total", "Octets envoyés aux clients SSE"
+)
+SSE_EVENTS_SENT = registry.counter(
+    "ldvelh_sse_events_sent_total", "Événements envoyés aux clients SSE"
+)
+
+# Boucle asyncio
+LOOP_LAG = registry.histogram(
+    "ldvelh_event_loop_lag_seconds",
+    "Retard de réveil de la boucle asyncio",
+    (),
+    _WAIT_BUCKETS,
+)
+LOOP_BLOCKED = registry.counter(
+    "ldvelh_event_loop_blocked_total",
+    "Blocages de la boucle au-delà du seuil (pile capturée)",
+)
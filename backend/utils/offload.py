@@ -0,0 +1,62 @@
+"""
+LDVELH - Déport du travail CPU hors de la boucle
+Sérialisation, parsing et validation de gros payloads (génération du
+monde, extraction) exécutés dans le pool de threads au-delà d'un seuil de
+taille: la boucle reprend la main entre deux tranches du GIL au lieu
+d'être bloquée pendant tout le calcul. Les petits payloads restent sur la
+boucle (un aller-retour de thread coûte plus que le travail).
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, TypeVar
+
+from utils.validation import validate_model
+
+T = TypeVar("T")
+
+# Taille (octets de JSON) à partir de laquelle le travail part en thread
+OFFLOAD_MIN_BYTES = 32 * 1024
+
+_threshold = OFFLOAD_MIN_BYTES
+
+
+def configure_offload(min_bytes: int) -> None:
+    """Seuil de déport (0 = toujours en thread)"""
+    global _threshold
+    _threshold = max(0, min_bytes)
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, size: int | None = None) -> T:
+    """
+    func(*args) dans un thread si size >= seuil (size None: toujours),
+    sinon directement. Le contexte (trace courante) suit dans le thread.
+    """
+    if size is not None and size < _threshold:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+async def validate_model_offloaded(
+    model_cls: type[T], data: Any, size: int | None
+) -> T:
+    """validate_model, déporté pour les gros payloads"""
+    return await run_cpu(validate_model, model_cls, data, size=size)
+
+
+def _pretty(obj: Any) -> str:
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False)
+
+
+async def log_json(
+    log: logging.Logger, message: str, obj: Any, size: int | None = None
+) -> None:
+    """
+    Log INFO de obj en JSON indenté. Rien n'est sérialisé si INFO est
+    désactivé; au-delà du seuil, la sérialisation se fait en thread.
+    """
+    if not log.isEnabledFor(logging.INFO):
+        return
+    text = await run_cpu(_pretty, obj, size=size)
+    log.info(f"{message}:\n{text}")
@@ -0,0 +1,122 @@
+"""
+LDVELH - Pool asyncpg instrumenté
+Enveloppe le pool de l'application: attente d'acquisition et occupation
+des connexions exposées dans /metrics, durée et volume de chaque requête
+(empreintes, requêtes lentes) dans utils.query_stats.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import asyncpg
+
+from utils.metrics import DB_POOL_ACQUIRE, DB_POOL_CONNECTIONS
+from utils.query_stats import explain_statement, query_stats
+
+
+class _DiscardExplain(Exception):
+    """Sortie de la transaction du plan: toujours annulée"""
+
+
+def _status_rows(status: str) -> int:
+    """Lignes touchées d'après le statut d'execute ('UPDATE 3', 'INSERT 0 1')"""
+    tail = status.rsplit(" ", 1)[-1] if status else ""
+    return int(tail) if tail.isdigit() else 0
+
+
+class InstrumentedConnection:
+    """
+    Se substitue à asyncpg.Connection: fetch/fetchrow/fetchval/execute/
+    executemany sont chronométrés, le reste (transaction, copy_*, query
+    loggers...) est délégué tel quel.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    async def _timed(self, method: str, query: str, args: tuple, kwargs: dict, rows):
+        start = time.perf_counter()
+        try:
+            result = await getattr(self._conn, method)(query, *args, **kwargs)
+        except Exception:
+            query_stats.record(query, (time.perf_counter() - start) * 1000, 0, ok=False)
+            raise
+        duration_ms = (time.perf_counter() - start) * 1000
+        count = rows(result)
+        key = query_stats.record(query, duration_ms, count)
+        if query_stats.is_slow(duration_ms):
+            plan = None
+            statement = explain_statement(query) if query_stats.explain else None
+            if statement and method != "executemany":
+                plan = await self._explain(statement, args)
+            query_stats.record_slow(key, query, duration_ms, count, plan)
+        return result
+
+    async def _explain(self, statement: str, args: tuple) -> str | None:
+        """
+        Plan de la requête (EXPLAIN ANALYZE la rejoue). Toujours exécuté
+        dans une transaction annulée, savepoint si une transaction est en
+        cours: rien de ce que la requête a pu écrire n'est conservé, et un
+        échec n'annule pas la transaction de l'appelant.
+        """
+        try:
+            async with self._conn.transaction():
+                rows = await self._conn.fetch(statement, *args)
+                plan = "\n".join(row[0] for row in rows)
+                raise _DiscardExplain
+        except _DiscardExplain:
+            return plan
+        except Exception as e:
+            return f"(EXPLAIN impossible: {e})"
+
+    async def fetch(self, query: str, *args: Any, **kwargs: Any) -> list:
+        return await self._timed("fetch", query, args, kwargs, len)
+
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any):
+        return await self._timed(
+            "fetchrow", query, args, kwargs, lambda r: 0 if r is None else 1
+        )
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any):
+        return await self._timed(
+            "fetchval", query, args, kwargs, lambda r: 0 if r is None else 1
+        )
+
+    async def execute(self, query: str, *args: Any, **kwargs: Any) -> str:
+        return await self._timed("execute", query, args, kwargs, _status_rows)
+
+    async def executemany(self, command: str, args, **kwargs: Any) -> None:
+        return await self._timed("executemany", command, (args,), kwargs, lambda r: 0)
+
+
+class InstrumentedPool:
+    """
+    Se substitue à asyncpg.Pool (mêmes méthodes, déléguées). Seul
+    acquire() est chronométré et instrumente la connexion: les
+    pool.fetch/execute directs passent par le pool asyncpg, sans mesure.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    @asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncIterator:
+        start = time.perf_counter()
+        async with self._pool.acquire(timeout=timeout) as conn:
+            DB_POOL_ACQUIRE.observe(time.perf_counter() - start)
+            yield InstrumentedConnection(conn)
+
+    def collect_metrics(self) -> None:
+        """Collecteur /metrics: connexions utilisées, libres, maximum"""
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        DB_POOL_CONNECTIONS.set(size - idle, state="in_use")
+        DB_POOL_CONNECTIONS.set(idle, state="idle")
+        DB_POOL_CONNECTIONS.set(self._pool.get_max_size(), state="max")
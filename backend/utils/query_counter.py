@@ -0,0 +1,85 @@
+"""
+LDVELH - Comptage des requêtes SQL
+Enveloppe un pool asyncpg pour compter les requêtes exécutées par un
+bloc de code et repérer les motifs N+1 (même requête répétée).
+"""
+
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import asyncpg
+
+
+def _normalize(query: str) -> str:
+    """Texte SQL sur une ligne (les paramètres $n sont déjà séparés)"""
+    return " ".join(query.split())
+
+
+class QueryCounter:
+    """Requêtes observées, par texte SQL normalisé"""
+
+    def __init__(self):
+        self.queries: Counter[str] = Counter()
+
+    def __call__(self, record) -> None:
+        # Callback asyncpg (Connection.add_query_logger)
+        self.queries[_normalize(record.query)] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.queries.values())
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """Requêtes exécutées au moins threshold fois (suspicion de N+1)"""
+        return {q: n for q, n in self.queries.items() if n >= threshold}
+
+    def assert_max(self, limit: int, label: str = "bloc") -> None:
+        """Lève AssertionError si le bloc a dépassé limit requêtes"""
+        if self.total > limit:
+            detail = "\n".join(
+                f"  {n}x {q[:120]}" for q, n in self.queries.most_common(5)
+            )
+            raise AssertionError(
+                f"{label}: {self.total} requêtes (max {limit})\n{detail}"
+            )
+
+    def assert_no_repeats(self, label: str = "bloc") -> None:
+        """Lève AssertionError si une même requête a été répétée (N+1)"""
+        repeated = self.repeated()
+        if repeated:
+            detail = "\n".join(f"  {n}x {q[:120]}" for q, n in repeated.items())
+            raise AssertionError(f"{label}: requêtes répétées (N+1 ?)\n{detail}")
+
+
+class CountingPool:
+    """
+    Pool instrumenté: chaque connexion acquise enregistre ses requêtes
+    dans le compteur courant. Se substitue au pool d'un service.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+        self.counter = QueryCounter()
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    @asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncIterator:
+        counter = self.counter
+        async with self._pool.acquire(timeout=timeout) as conn:
+            conn.add_query_logger(counter)
+            try:
+                yield conn
+            finally:
+                conn.remove_query_logger(counter)
+
+    @asynccontextmanager
+    async def count(self) -> AsyncIterator[QueryCounter]:
+        """Compteur neuf pour la durée du bloc"""
+        previous, self.counter = self.counter, QueryCounter()
+        try:
+            yield self.counter
+        finally:
+            self.counter = previous
@@ -0,0 +1,202 @@
+"""
+LDVELH - Statistiques des requêtes SQL
+Empreinte des requêtes (texte normalisé, littéraux remplacés), durées par
+empreinte sur une fenêtre glissante (p50/p95/p99), lignes retournées, et
+journal des requêtes lentes avec leur plan EXPLAIN (ANALYZE, BUFFERS)
+quand le mode debug est actif. Alimenté par InstrumentedConnection.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import deque
+
+from utils.validation import percentile
+
+logger = logging.getLogger(__name__)
+
+# Mesures conservées par empreinte, requêtes lentes gardées pour l'admin
+QUERY_SAMPLES = 512
+SLOW_QUERY_HISTORY = 50
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_CALL = re.compile(r"\b([a-z_][a-z0-9_]*)\s*\(", re.IGNORECASE)
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+# Devant une parenthèse sans être un appel de fonction
+_SQL_KEYWORDS = frozenset(
+    (
+        "all and any array as between by case else exists filter from in is "
+        "join lateral like not on or over row select then using values when "
+        "where with within"
+    ).split()
+)
+
+# Fonctions sans effet de bord: EXPLAIN ANALYZE peut les exécuter. Toute
+# autre fonction (upsert_entity, create_fact... écrivent depuis un SELECT)
+# n'a droit qu'au plan estimé.
+_READ_ONLY_FUNCTIONS = frozenset(
+    (
+        "abs array_agg array_length array_position array_remove avg "
+        "bool_and bool_or cardinality coalesce concat count date_trunc "
+        "dense_rank extract generate_series greatest jsonb_agg "
+        "jsonb_array_elements jsonb_build_object jsonb_each "
+        "jsonb_object_agg json_agg json_build_object least length lower max "
+        "min now nullif rank round row_number string_agg sum to_jsonb trim "
+        "unnest upper"
+    ).split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Texte d'empreinte: une ligne, littéraux remplacés par ?"""
+    text = _STRING_LITERAL.sub("?", query)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _VALUE_LIST.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def explain_statement(query: str) -> str | None:
+    """
+    EXPLAIN d'une requête lente (None: pas de plan possible). EXPLAIN
+    ANALYZE exécute la requête: réservé aux lectures qui n'appellent que
+    des fonctions connues. Une écriture, y compris dans un WITH, ou un
+    appel de fonction applicative n'a que le plan estimé (EXPLAIN seul).
+    """
+    head = query.lstrip().upper()
+    if not head.startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")):
+        return None
+    text = _STRING_LITERAL.sub("?", query)
+    calls = {name.lower() for name in _CALL.findall(text)}
+    read_only = (
+        head.startswith(("SELECT", "WITH"))
+        and not _WRITE.search(text)
+        and calls <= _READ_ONLY_FUNCTIONS | _SQL_KEYWORDS
+    )
+    if read_only:
+        return f"EXPLAIN (ANALYZE, BUFFERS) {query}"
+    return f"EXPLAIN {query}"
+
+
+class _FingerprintStats:
+    __slots__ = ("query", "timings", "calls", "rows", "errors", "total_ms")
+
+    def __init__(self, query: str, samples: int):
+        self.query = query
+        self.timings: deque[float] = deque(maxlen=samples)
+        self.calls = 0
+        self.rows = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+
+class QueryStats:
+    """Durées et volumes par empreinte de requête, requêtes lentes récentes"""
+
+    def __init__(self, samples: int = QUERY_SAMPLES):
+        self.samples = samples
+        self.slow_ms = 250.0
+        self.explain = False
+        self._stats: dict[str, _FingerprintStats] = {}
+        self._slow: deque[dict] = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._lock = threading.Lock()
+
+    def configure(self, slow_ms: float, explain: bool) -> None:
+        """Seuil des requêtes lentes (0 = pas de journal) et EXPLAIN (debug)"""
+        self.slow_ms = slow_ms
+        self.explain = explain
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return self.slow_ms > 0 and duration_ms >= self.slow_ms
+
+    def record(
+        self, query: str, duration_ms: float, rows: int, ok: bool = True
+    ) -> str:
+        """Enregistre une exécution; retourne l'empreinte"""
+        normalized = normalize_query(query)
+        key = fingerprint(normalized)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _FingerprintStats(normalized, self.samples)
+            stats.timings.append(duration_ms)
+            stats.calls += 1
+            stats.rows += rows
+            stats.total_ms += duration_ms
+            if not ok:
+                stats.errors += 1
+        return key
+
+    def record_slow(
+        self, key: str, query: str, duration_ms: float, rows: int, plan: str | None
+    ) -> None:
+        entry = {
+            "fingerprint": key,
+            "duration_ms": round(duration_ms, 1),
+            "rows": rows,
+            "query": _WHITESPACE.sub(" ", query).strip()[:2000],
+            "plan": plan,
+        }
+        with self._lock:
+            self._slow.append(entry)
+        message = (
+            f"[SQL] Requête lente {duration_ms:.0f}ms ({rows} ligne(s)) "
+            f"[{key}]: {entry['query'][:500]}"
+        )
+        if plan:
+            message += f"\n{plan}"
+        logger.warning(message)
+
+    def snapshot(self, limit: int = 50, order: str = "total") -> dict:
+        """
+        Empreintes les plus coûteuses (order: total, p95 ou calls) et
+        requêtes lentes récentes (JSON).
+        """
+        with self._lock:
+            data = [
+                (key, s.query, sorted(s.timings), s.calls, s.rows, s.errors, s.total_ms)
+                for key, s in self._stats.items()
+            ]
+            slow = list(self._slow)
+
+        queries = [
+            {
+                "fingerprint": key,
+                "query": query[:500],
+                "calls": calls,
+                "errors": errors,
+                "rows_total": rows,
+                "rows_avg": round(rows / calls, 1),
+                "total_ms": round(total_ms, 1),
+                "p50_ms": round(percentile(timings, 0.50), 3),
+                "p95_ms": round(percentile(timings, 0.95), 3),
+                "p99_ms": round(percentile(timings, 0.99), 3),
+                "max_ms": round(timings[-1], 3),
+            }
+            for key, query, timings, calls, rows, errors, total_ms in data
+        ]
+        sort_key = {"p95": "p95_ms", "calls": "calls"}.get(order, "total_ms")
+        queries.sort(key=lambda q: q[sort_key], reverse=True)
+        return {
+            "slow_query_ms": self.slow_ms,
+            "explain": self.explain,
+            "fingerprints": len(queries),
+            "queries": queries[:limit],
+            "slow_queries": slow[::-1],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+
+query_stats = QueryStats()
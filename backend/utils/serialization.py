@@ -0,0 +1,71 @@
+"""
+LDVELH - Sérialisation JSON
+Chemin rapide (orjson si installé, sinon stdlib) pour les frames SSE et
+les réponses API volumineuses.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj: Any) -> Any:
+    """Types non gérés nativement (orjson gère déjà UUID et datetime)"""
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).decode("utf-8")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+
+def _dumps_stdlib(obj: Any) -> bytes:
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _dumps_orjson(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Sérialise en JSON UTF-8 compact
+dumps_bytes = _dumps_orjson if HAS_ORJSON else _dumps_stdlib
+
+
+def dumps(obj: Any) -> str:
+    """Sérialise en JSON (str)"""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def etag_for(body: bytes) -> str:
+    """ETag fort dérivé du contenu"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def sse_frame(payload: Any, event_id: int | None = None) -> bytes:
+    """
+    Frame SSE complète, en bytes: le corps JSON est inséré tel quel
+    sans repasser par str.
+    """
+    data = payload if isinstance(payload, bytes) else dumps_bytes(payload)
+    if event_id is None:
+        return b"data: " + data + b"\n\n"
+    return b"id: %d\ndata: %s\n\n" % (event_id, data)
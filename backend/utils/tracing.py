@@ -0,0 +1,358 @@
+"""
+LDVELH - Tracing des tours
+Spans imbriqués (contextvars) au modèle OpenTelemetry: ids W3C (trace 128
+bits, span 64 bits), attributs, événements, statut. Une trace terminée est
+exportée au format OTLP/JSON (resourceSpans), lisible par un collector
+OpenTelemetry (récepteur otlpjsonfile) ou directement dans les logs.
+
+Exporteurs (TRACE_EXPORTER):
+- none: rien n'est exporté (les traces lentes restent journalisées)
+- console: arbre des spans avec durées, dans les logs
+- file: une ligne OTLP/JSON par trace dans TRACE_FILE
+
+Hors d'une trace (requêtes hors tour, warm-up, benchmarks), span() et
+@traced ne coûtent qu'une lecture de contextvar.
+"""
+
+import functools
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from utils.serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "ldvelh-api"
+
+# Codes de statut OTLP
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Span kind OTLP: INTERNAL
+SPAN_KIND_INTERNAL = 1
+
+
+def new_trace_id() -> str:
+    """Identifiant de trace W3C (32 hex)"""
+    return secrets.token_hex(16)
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+# =============================================================================
+# SPANS
+# =============================================================================
+
+
+class Trace:
+    """Spans terminés d'un tour, exportés en bloc à la fin du span racine"""
+
+    __slots__ = ("trace_id", "spans", "exported")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.exported = False
+
+
+class Span:
+    """Opération chronométrée d'une trace"""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "events",
+        "start_ns",
+        "end_ns",
+        "status",
+        "status_message",
+    )
+
+    def __init__(
+        self, trace: Trace, name: str, parent_id: str | None, attributes: dict
+    ):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.events: list[tuple[int, str, dict]] = []
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append((time.time_ns(), name, attributes))
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        trace = self.trace
+        if trace.exported:
+            # Span terminé après l'export de la trace (tâche détachée)
+            _export(trace.trace_id, [self])
+        else:
+            trace.spans.append(self)
+
+    def to_otlp(self) -> dict:
+        data = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        if self.events:
+            data["events"] = [
+                {
+                    "timeUnixNano": str(ts),
+                    "name": name,
+                    "attributes": _otlp_attributes(attrs),
+                }
+                for ts, name, attrs in self.events
+            ]
+        return data
+
+
+class _NoopSpan:
+    """Span inerte renvoyé hors trace"""
+
+    trace_id = None
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Span | None] = ContextVar("ldvelh_span", default=None)
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current_span.get() or NOOP_SPAN
+
+
+def current_trace_id() -> str | None:
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+def start_span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """
+    Span enfant du span courant, sans le rendre courant: pour les durées
+    qui ne suivent pas un bloc (ex: temps jusqu'au premier token).
+    L'appelant doit appeler end().
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Span enfant du span courant pour la durée du bloc"""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(name: str):
+    """Décorateur: span autour d'une coroutine"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def start_trace(
+    name: str, trace_id: str | None = None, **attributes: Any
+) -> Iterator[Span]:
+    """
+    Span racine d'une nouvelle trace (un tour). La trace est exportée
+    à la sortie du bloc.
+    """
+    trace = Trace(trace_id or new_trace_id())
+    root = Span(trace, name, None, attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        root.end()
+        trace.exported = True
+        _finish_trace(root, trace.spans)
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+
+class _TracingConfig:
+    exporter: str = "none"
+    path: str = "traces.jsonl"
+    slow_ms: float = 0.0
+
+
+_config = _TracingConfig()
+_file_lock = threading.Lock()
+
+
+def configure_tracing(exporter: str, path: str, slow_ms: float = 0.0) -> None:
+    """Choisit l'exporteur (none | console | file) et le seuil des tours lents"""
+    exporter = exporter.lower()
+    if exporter not in ("none", "console", "file"):
+        logger.warning(f"[TRACE] Exporteur inconnu '{exporter}' → none")
+        exporter = "none"
+    _config.exporter = exporter
+    _config.path = path
+    _config.slow_ms = slow_ms
+    if exporter == "file":
+        logger.info(f"[TRACE] Export des traces vers {os.path.abspath(path)}")
+
+
+def format_trace(root: Span, spans: list[Span]) -> str:
+    """Arbre des spans d'une trace (durées en ms), pour les logs"""
+    children: dict[str | None, list[Span]] = {}
+    for item in spans:
+        children.setdefault(item.parent_id, []).append(item)
+
+    lines = [f"[TRACE {root.trace_id}] {root.name} {root.duration_ms:.0f}ms"]
+
+    def walk(parent_id: str, depth: int) -> None:
+        for child in sorted(children.get(parent_id, ()), key=lambda s: s.start_ns):
+            offset = (child.start_ns - root.start_ns) / 1e6
+            error = " ERROR" if child.status == STATUS_ERROR else ""
+            lines.append(
+                f"{'  ' * depth}{child.name} {child.duration_ms:.0f}ms "
+                f"(+{offset:.0f}ms){error}"
+            )
+            walk(child.span_id, depth + 1)
+
+    walk(root.span_id, 1)
+    return "\n".join(lines)
+
+
+def _finish_trace(root: Span, spans: list[Span]) -> None:
+    slow = _config.slow_ms > 0 and root.duration_ms >= _config.slow_ms
+    if slow:
+        logger.warning(f"[TRACE] Tour lent\n{format_trace(root, spans)}")
+    elif _config.exporter == "console":
+        logger.info(format_trace(root, spans))
+    if _config.exporter == "file":
+        _export(root.trace_id, spans)
+
+
+def _export(trace_id: str, spans: list[Span]) -> None:
+    if _config.exporter != "file" or not spans:
+        return
+    record = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "ldvelh"},
+                        "spans": [item.to_otlp() for item in spans],
+                    }
+                ],
+            }
+        ]
+    }
+    try:
+        line = dumps_bytes(record) + b"\n"
+        with _file_lock, open(_config.path, "ab") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning(f"[TRACE] Export impossible ({trace_id}): {e}")
@@ -0,0 +1,112 @@
+"""
+LDVELH - Validation Pydantic instrumentée
+Temps de validation par modèle (percentiles, en production) et warm-up
+des modèles au démarrage.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Iterable, TypeVar
+
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Nombre de mesures conservées par modèle (fenêtre glissante)
+VALIDATION_SAMPLES = 512
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentile par rang le plus proche (values triées)"""
+    index = min(len(values) - 1, max(0, round(q * len(values)) - 1))
+    return values[index]
+
+
+class ValidationStats:
+    """Durées de model_validate par modèle, sur les N dernières validations"""
+
+    def __init__(self, samples: int = VALIDATION_SAMPLES):
+        self.samples = samples
+        self._timings: dict[str, deque[float]] = {}
+        self._counts: Counter[str] = Counter()
+        self._errors: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            timings = self._timings.get(model)
+            if timings is None:
+                timings = self._timings[model] = deque(maxlen=self.samples)
+            timings.append(seconds * 1000)
+            self._counts[model] += 1
+            if not ok:
+                self._errors[model] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """Par modèle: nombre, erreurs et percentiles (ms)"""
+        with self._lock:
+            data = {
+                model: (sorted(timings), self._counts[model], self._errors[model])
+                for model, timings in self._timings.items()
+            }
+        return {
+            model: {
+                "count": count,
+                "errors": errors,
+                "p50_ms": round(percentile(timings, 0.50), 3),
+                "p95_ms": round(percentile(timings, 0.95), 3),
+                "p99_ms": round(percentile(timings, 0.99), 3),
+                "max_ms": round(timings[-1], 3),
+            }
+            for model, (timings, count, errors) in sorted(data.items())
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+            self._counts.clear()
+            self._errors.clear()
+
+
+validation_stats = ValidationStats()
+
+
+def validate_model(model_cls: type[T], data: Any) -> T:
+    """model_validate chronométré (succès comme échec), span dans un tour"""
+    with span(f"validate.{model_cls.__name__}"):
+        start = time.perf_counter()
+        try:
+            result = model_cls.model_validate(data)
+        except Exception:
+            validation_stats.record(
+                model_cls.__name__, time.perf_counter() - start, ok=False
+            )
+            raise
+        validation_stats.record(model_cls.__name__, time.perf_counter() - start)
+        return result
+
+
+def warm_up_models(fixtures: Iterable[tuple[type, Any]]) -> dict[str, float]:
+    """
+    Valide chaque fixture une fois (hors statistiques) pour que la première
+    requête ne paie pas la construction paresseuse des validateurs.
+    Une fixture invalide n'empêche pas le warm-up mais est signalée: la
+    validation s'arrête aux champs, les validateurs de modèle (mode="after")
+    ne sont pas exercés. Retourne la durée (ms) par modèle.
+    """
+    durations = {}
+    for model_cls, data in fixtures:
+        start = time.perf_counter()
+        try:
+            model_cls.model_validate(data)
+        except Exception as e:
+            logger.warning(
+                f"[WARMUP] Fixture {model_cls.__name__} invalide, warm-up "
+                f"partiel: {e}"
+            )
+        durations[model_cls.__name__] = (time.perf_counter() - start) * 1000
+    return durations
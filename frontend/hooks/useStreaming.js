@@ -1,8 +1,13 @@
 import { useRef, useCallback, useState } from 'react';
 import { apiUrl } from '../lib/api';
+import { applyProgressEvent } from '../lib/game/progressUtils';
+
+const MAX_RESUME_ATTEMPTS = 3;
+const RESUME_DELAY_MS = 1000;
 
 /**
  * Hook pour gérer le streaming SSE
+ * En cas de coupure, le tour est repris via /chat/{turnId}/stream (Last-Event-ID)
  */
 export function useStreaming({ onChunk, onProgress, onDone, onSaved, onError }) {
 	const abortControllerRef = useRef(null);
@@ -34,60 +39,106 @@ export function useStreaming({ onChunk, onProgress, onDone, onSaved, onError })
 				return { success: true, data };
 			}
 
-			const reader = res.body.getReader();
-			const decoder = new TextDecoder();
-
-			while (true) {
-				const { done, value } = await reader.read();
-				if (done) break;
-
-				const text = decoder.decode(value, { stream: true });
-
-				for (const line of text.split('\n')) {
-					if (!line.startsWith('data: ')) continue;
-
-					try {
-						const data = JSON.parse(line.slice(6));
-						console.log('[Stream] Event reçu:', data.type, '| keys:', Object.keys(data));
-
-						switch (data.type) {
-							case 'chunk':
-								onChunk?.(data.content);
-								break;
+			let turnId = null;
+			let lastEventId = null;
+			let ended = false;
 
-							case 'progress':
-								fullJson = data.rawJson || fullJson;
-								setRawJson(fullJson);
-								onProgress?.(fullJson);
-								break;
+			const readEvents = async (response) => {
+				const reader = response.body.getReader();
+				const decoder = new TextDecoder();
+				let buffer = '';
 
-							case 'extracting':
-								onExtracting?.(data.displayText);
-								break;
+				while (true) {
+					const { done, value } = await reader.read();
+					if (done) break;
 
-							case 'done':
-								onDone?.(data.displayText, data.state);
-								break;
+					// Un événement peut être coupé entre deux lectures
+					buffer += decoder.decode(value, { stream: true });
+					const lines = buffer.split('\n');
+					buffer = lines.pop();
 
-							case 'saved':
-								onSaved?.();
-								break;
-
-							case 'error':
-								onError?.(data.error, data.details);
-								break;
-
-							case 'warning':
-								console.warn('[Stream] Warning:', data.message);
-								break;
-
-							default:
-								console.log('[Stream] Type inconnu:', data.type);
+					for (const line of lines) {
+						if (line.startsWith('id: ')) {
+							lastEventId = line.slice(4);
+							continue;
 						}
-					} catch (e) {
-						// Ignorer les lignes mal formées
+						if (!line.startsWith('data: ')) continue;
+
+						try {
+							const data = JSON.parse(line.slice(6));
+							console.log('[Stream] Event reçu:', data.type, '| keys:', Object.keys(data));
+
+							switch (data.type) {
+								case 'turn':
+									turnId = data.turnId;
+									console.log(`[Stream] Tour ${turnId}, trace ${data.traceId}`);
+									break;
+
+								case 'chunk':
+									onChunk?.(data.content);
+									break;
+
+								case 'progress':
+									fullJson = applyProgressEvent(fullJson, data);
+									setRawJson(fullJson);
+									onProgress?.(fullJson, data.milestones);
+									break;
+
+								case 'extracting':
+									onExtracting?.(data.displayText);
+									break;
+
+								case 'done':
+									onDone?.(data.displayText, data.state);
+									break;
+
+								case 'saved':
+									onSaved?.();
+									break;
+
+								case 'error':
+									console.error(`[Stream] Erreur (trace ${data.traceId}):`, data.error);
+									onError?.(data.error, data.details);
+									break;
+
+								case 'warning':
+									console.warn('[Stream] Warning:', data.message);
+									break;
+
+								case 'end':
+									ended = true;
+									break;
+
+								default:
+									console.log('[Stream] Type inconnu:', data.type);
+							}
+						} catch (e) {
+							// Ignorer les lignes mal formées
+						}
+					}
+				}
+			};
+
+			const { signal } = abortControllerRef.current;
+			for (let attempt = 0; ; attempt++) {
+				try {
+					if (attempt === 0) {
+						await readEvents(res);
+					} else {
+						// Connexion coupée avant la fin du tour: reprise sans regénérer
+						console.warn(`[Stream] Connexion perdue, reprise du tour ${turnId} après #${lastEventId}`);
+						await new Promise((resolve) => setTimeout(resolve, RESUME_DELAY_MS * attempt));
+						const resumed = await fetch(apiUrl(`/chat/${turnId}/stream`), {
+							headers: lastEventId ? { 'Last-Event-ID': lastEventId } : {},
+							signal
+						});
+						if (!resumed.ok) throw new Error('Reprise du stream impossible');
+						await readEvents(resumed);
 					}
+				} catch (e) {
+					if (e.name === 'AbortError' || !turnId || attempt >= MAX_RESUME_ATTEMPTS) throw e;
 				}
+				if (ended || !turnId || attempt >= MAX_RESUME_ATTEMPTS) break;
 			}
 
 			return { success: true, fullJson };
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { tooltipsApi } from '../lib/api';
 
 /**
@@ -12,23 +12,32 @@ export function useTooltips(partieId) {
 	const [isLoading, setIsLoading] = useState(false);
 	const [error, setError] = useState(null);
 
+	const etagRef = useRef(null);
+
 	const fetchTooltips = useCallback(async () => {
-		setTooltipMap({});
-		// if (!partieId) return;
-		//
-		// setIsLoading(true);
-		// setError(null);
-		//
-		// try {
-		// 	const data = await tooltipsApi.get(partieId);
-		// 	// L'API retourne { tooltips: { nom: {...}, ... } }
-		// 	setTooltipMap(data.tooltips || {});
-		// } catch (err) {
-		// 	console.error('[useTooltips] Erreur:', err);
-		// 	setError(err.message);
-		// } finally {
-		// 	setIsLoading(false);
-		// }
+		if (!partieId) {
+			etagRef.current = null;
+			setTooltipMap({});
+			return;
+		}
+
+		setIsLoading(true);
+		setError(null);
+
+		try {
+			// 304 si l'index n'a pas changé depuis le dernier appel
+			const { notModified, data, etag } = await tooltipsApi.getIfChanged(partieId, etagRef.current);
+			if (!notModified) {
+				etagRef.current = etag;
+				// L'API retourne { tooltips: { nom: {...}, ... } }
+				setTooltipMap(data.tooltips || {});
+			}
+		} catch (err) {
+			console.error('[useTooltips] Erreur:', err);
+			setError(err.message);
+		} finally {
+			setIsLoading(false);
+		}
 	}, [partieId]);
 
 	// Charger au mount et quand partieId change
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { stateApi } from '../lib/api';
 
 /**
@@ -20,6 +20,9 @@ export function useWorldData(gameId, enabled = true) {
 	const [loading, setLoading] = useState(false);
 	const [error, setError] = useState(null);
 
+	// ETag par partie (les versions de deux parties peuvent coïncider)
+	const etagRef = useRef({ gameId: null, etag: null });
+
 	const fetchWorldData = useCallback(async () => {
 		if (!gameId || !enabled) return;
 
@@ -27,8 +30,12 @@ export function useWorldData(gameId, enabled = true) {
 		setError(null);
 
 		try {
-			const data = await stateApi.getWorld(gameId);
-			setWorldData(data);
+			const previous = etagRef.current.gameId === gameId ? etagRef.current.etag : null;
+			const { notModified, data, etag } = await stateApi.getWorldIfChanged(gameId, previous);
+			if (!notModified) {
+				etagRef.current = { gameId, etag };
+				setWorldData(data);
+			}
 		} catch (err) {
 			console.error('[useWorldData] Erreur:', err);
 			setError(err.message);
@@ -4,6 +4,8 @@
  * Centralise les appels au backend Python FastAPI
  */
 
+import { applyProgressEvent } from './game/progressUtils';
+
 // URL du backend Python - À configurer via env
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -38,6 +40,30 @@ export const api = {
 		return res.json();
 	},
 
+	/**
+	 * GET conditionnel (ETag): renvoie { notModified, data, etag }
+	 */
+	async getIfChanged(path, params = {}, etag = null) {
+		const url = new URL(apiUrl(path));
+		Object.entries(params).forEach(([k, v]) => {
+			if (v !== undefined && v !== null) {
+				url.searchParams.append(k, v);
+			}
+		});
+
+		const res = await fetch(url.toString(), {
+			headers: etag ? { 'If-None-Match': etag } : {}
+		});
+		if (res.status === 304) {
+			return { notModified: true, data: null, etag };
+		}
+		if (!res.ok) {
+			const error = await res.json().catch(() => ({ error: res.statusText }));
+			throw new Error(error.error || error.detail || 'API Error');
+		}
+		return { notModified: false, data: await res.json(), etag: res.headers.get('ETag') };
+	},
+
 	/**
 	 * POST request
 	 */
@@ -109,15 +135,19 @@ export const api = {
 		const reader = res.body.getReader();
 		const decoder = new TextDecoder();
 		let fullJson = '';
+		let buffer = '';
 
 		try {
 			while (true) {
 				const { done, value } = await reader.read();
 				if (done) break;
 
-				const text = decoder.decode(value, { stream: true });
+				// Un événement peut être coupé entre deux lectures
+				buffer += decoder.decode(value, { stream: true });
+				const lines = buffer.split('\n');
+				buffer = lines.pop();
 
-				for (const line of text.split('\n')) {
+				for (const line of lines) {
 					if (!line.startsWith('data: ')) continue;
 
 					try {
@@ -128,8 +158,8 @@ export const api = {
 								onChunk?.(data.content);
 								break;
 							case 'progress':
-								fullJson = data.rawJson || fullJson;
-								onProgress?.(fullJson);
+								fullJson = applyProgressEvent(fullJson, data);
+								onProgress?.(fullJson, data.milestones);
 								break;
 							case 'extracting':
 								onExtracting?.(data.displayText);
@@ -193,6 +223,9 @@ export const stateApi = {
 	/** Récupère les données du monde pour les sidebars (PNJs, lieux, quêtes, organisations) */
 	getWorld: (gameId) => api.get(`/games/${gameId}/world`),
 
+	/** Idem, 304 si la version du KG n'a pas changé (ETag) */
+	getWorldIfChanged: (gameId, etag) => api.getIfChanged(`/games/${gameId}/world`, {}, etag),
+
 	/** Rollback à un message spécifique */
 	rollback: (gameId, fromIndex) => api.post(`/games/${gameId}/rollback`, { fromIndex })
 };
@@ -213,5 +246,8 @@ export const chatApi = {
 
 export const tooltipsApi = {
 	/** Récupère les tooltips pour une partie */
-	get: (partieId) => api.get('/tooltips', { partieId })
+	get: (partieId) => api.get('/tooltips', { partieId }),
+
+	/** Idem, sans retransfert si l'index n'a pas changé (ETag) */
+	getIfChanged: (partieId, etag) => api.getIfChanged('/tooltips', { partieId }, etag)
 };
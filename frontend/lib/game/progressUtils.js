@@ -15,6 +15,16 @@ export const GENERATION_STEPS = [
 	{ key: 'arrival_event', label: 'Arrivée du Joueur', weight: 6 },
 ];
 
+/**
+ * Reconstitue le JSON partiel à partir d'un événement 'progress'.
+ * Le serveur n'envoie que le texte ajouté (delta) et sa position (offset);
+ * l'ancien format { rawJson } reste accepté.
+ */
+export function applyProgressEvent(fullJson, data) {
+	if (typeof data.delta !== 'string') return data.rawJson || fullJson;
+	return fullJson.slice(0, data.offset ?? fullJson.length) + data.delta;
+}
+
 /**
  * Vérifie si une section JSON est complète (accolades/crochets équilibrés)
  */
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- LDVELH - Migration 001: Cold storage des parties inactives
+-- À appliquer sur une base créée avant l'ajout de game_archives
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS game_archives (
+  game_id UUID PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  format_version INTEGER NOT NULL,
+  last_cycle INTEGER NOT NULL DEFAULT 0,
+  last_date VARCHAR(50),
+  size_bytes INTEGER NOT NULL,
+  data BYTEA NOT NULL,
+  archived_at TIMESTAMPTZ DEFAULT now()
+);
+
+GRANT ALL ON game_archives TO postgres;
@@ -0,0 +1,274 @@
+-- ============================================================================
+-- LDVELH - Migration 002: Variante partitionnée (HASH sur game_id)
+-- ============================================================================
+-- OPTIONNELLE. Convertit attributes, relations, facts et chat_messages en
+-- tables partitionnées par hash de game_id, avec index locaux par partition.
+-- S'applique sur une base existante (données recopiées) ou juste après
+-- schema.sql pour une installation neuve. PostgreSQL >= 13 requis.
+--
+-- Contraintes du partitionnement:
+--   * Les clés primaires deviennent (game_id, id).
+--   * Une clé étrangère ne peut pas viser facts(id) / relations(id) seul:
+--     les FK entrantes (fact_participants, events, commitments,
+--     relations_*, contradictions) sont remplacées par des triggers
+--     AFTER DELETE qui reproduisent ON DELETE CASCADE / SET NULL.
+--     L'intégrité à l'insertion est assurée par l'application
+--     (create_fact, create_relation), comme pour les autres refs.
+--   * Les index (game_id) seuls disparaissent: préfixe de la clé primaire.
+--
+-- Nombre de partitions: n_partitions ci-dessous (16 par défaut).
+-- ============================================================================
+
+BEGIN;
+
+-- ============================================================================
+-- 1. VUES: sauvegarde des définitions puis suppression
+-- ============================================================================
+
+CREATE TEMP TABLE _saved_views ON COMMIT DROP AS
+SELECT c.oid, c.relname, pg_get_viewdef(c.oid) AS definition
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE c.relkind = 'v' AND n.nspname = 'public';
+
+DO $mig$
+DECLARE
+  v RECORD;
+BEGIN
+  FOR v IN SELECT relname FROM _saved_views LOOP
+    EXECUTE format('DROP VIEW IF EXISTS %I CASCADE', v.relname);
+  END LOOP;
+END;
+$mig$;
+
+-- ============================================================================
+-- 2. NOUVELLES TABLES PARTITIONNÉES
+-- ============================================================================
+
+CREATE TABLE attributes_new (
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  entity_id UUID NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+  key VARCHAR(100) NOT NULL,
+  value TEXT NOT NULL,
+  details JSONB,
+  known_by_protagonist BOOLEAN DEFAULT true,
+  start_cycle INTEGER NOT NULL,
+  end_cycle INTEGER,
+  created_at TIMESTAMPTZ DEFAULT now()
+) PARTITION BY HASH (game_id);
+
+CREATE TABLE relations_new (
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  source_id UUID NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+  target_id UUID NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+  type relation_type NOT NULL,
+  start_cycle INTEGER NOT NULL,
+  end_cycle INTEGER,
+  end_reason TEXT,
+  known_by_protagonist BOOLEAN DEFAULT true,
+  created_at TIMESTAMPTZ DEFAULT now()
+) PARTITION BY HASH (game_id);
+
+CREATE TABLE facts_new (
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  cycle INTEGER NOT NULL,
+  time VARCHAR(20),
+  type fact_type NOT NULL,
+  description TEXT NOT NULL,
+  location_id UUID REFERENCES entities(id) ON DELETE SET NULL,
+  importance INTEGER DEFAULT 3 CHECK (importance BETWEEN 1 AND 5),
+  semantic_key VARCHAR(100),
+  created_at TIMESTAMPTZ DEFAULT now()
+) PARTITION BY HASH (game_id);
+
+CREATE TABLE chat_messages_new (
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  role VARCHAR(20) NOT NULL,
+  content TEXT NOT NULL,
+  tone_notes TEXT,
+  cycle INTEGER NOT NULL,
+  time VARCHAR(5),
+  date VARCHAR(50),
+  location_id UUID REFERENCES entities(id) ON DELETE SET NULL,
+  npcs_present UUID[] DEFAULT '{}',
+  summary TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+) PARTITION BY HASH (game_id);
+
+DO $mig$
+DECLARE
+  n_partitions CONSTANT INTEGER := 16;
+  t TEXT;
+  i INTEGER;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['attributes', 'relations', 'facts', 'chat_messages'] LOOP
+    FOR i IN 0 .. n_partitions - 1 LOOP
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES WITH (MODULUS %s, REMAINDER %s)',
+        t || '_p' || i, t || '_new', n_partitions, i
+      );
+    END LOOP;
+  END LOOP;
+END;
+$mig$;
+
+-- ============================================================================
+-- 3. COPIE DES DONNÉES ET BASCULE
+-- ============================================================================
+
+INSERT INTO attributes_new SELECT * FROM attributes;
+INSERT INTO relations_new SELECT * FROM relations;
+INSERT INTO facts_new SELECT * FROM facts;
+INSERT INTO chat_messages_new SELECT * FROM chat_messages;
+
+-- CASCADE: supprime aussi les FK entrantes vers facts / relations
+DROP TABLE attributes, relations, facts, chat_messages CASCADE;
+
+ALTER TABLE attributes_new RENAME TO attributes;
+ALTER TABLE relations_new RENAME TO relations;
+ALTER TABLE facts_new RENAME TO facts;
+ALTER TABLE chat_messages_new RENAME TO chat_messages;
+
+-- ============================================================================
+-- 4. CONTRAINTES ET INDEX (locaux à chaque partition)
+-- ============================================================================
+
+ALTER TABLE attributes ADD PRIMARY KEY (game_id, id);
+
+CREATE INDEX idx_attributes_entity ON attributes(entity_id);
+CREATE INDEX idx_attributes_key ON attributes(entity_id, key);
+CREATE INDEX idx_attributes_active ON attributes(entity_id) WHERE end_cycle IS NULL;
+CREATE INDEX idx_attributes_known ON attributes(entity_id)
+  WHERE known_by_protagonist = true AND end_cycle IS NULL;
+CREATE INDEX idx_attributes_game_key ON attributes(game_id, key) WHERE end_cycle IS NULL;
+
+ALTER TABLE relations ADD PRIMARY KEY (game_id, id);
+ALTER TABLE relations
+  ADD UNIQUE (game_id, source_id, target_id, type, start_cycle);
+
+CREATE INDEX idx_relations_source ON relations(source_id);
+CREATE INDEX idx_relations_target ON relations(target_id);
+CREATE INDEX idx_relations_type ON relations(game_id, type);
+CREATE INDEX idx_relations_active ON relations(game_id) WHERE end_cycle IS NULL;
+CREATE INDEX idx_relations_known ON relations(game_id)
+  WHERE known_by_protagonist = true AND end_cycle IS NULL;
+
+ALTER TABLE facts ADD PRIMARY KEY (game_id, id);
+
+CREATE INDEX idx_facts_cycle ON facts(game_id, cycle);
+CREATE INDEX idx_facts_type ON facts(game_id, type);
+CREATE INDEX idx_facts_importance ON facts(game_id, importance DESC);
+CREATE INDEX idx_facts_location ON facts(location_id);
+CREATE UNIQUE INDEX idx_facts_dedup ON facts(game_id, cycle, semantic_key)
+  WHERE semantic_key IS NOT NULL;
+
+CREATE TRIGGER facts_immutable
+BEFORE UPDATE ON facts
+FOR EACH ROW EXECUTE FUNCTION prevent_fact_update();
+
+ALTER TABLE chat_messages ADD PRIMARY KEY (game_id, id);
+
+CREATE INDEX idx_messages_cycle ON chat_messages(game_id, cycle);
+CREATE INDEX idx_messages_summary ON chat_messages(game_id, cycle) WHERE summary IS NOT NULL;
+
+-- Index des références devenues "logiques" (utilisés par les triggers)
+CREATE INDEX IF NOT EXISTS idx_events_source_fact ON events(source_fact_id)
+  WHERE source_fact_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_events_resolution_fact ON events(resolution_fact_id)
+  WHERE resolution_fact_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_commitments_resolution_fact ON commitments(resolution_fact_id)
+  WHERE resolution_fact_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_contradictions_relation ON contradictions(relation_id)
+  WHERE relation_id IS NOT NULL;
+
+-- ============================================================================
+-- 5. CASCADES ÉMULÉES (remplacent les FK vers facts / relations)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION cascade_fact_delete()
+RETURNS TRIGGER LANGUAGE plpgsql AS $func$
+BEGIN
+  DELETE FROM fact_participants WHERE fact_id = OLD.id;
+  UPDATE events SET source_fact_id = NULL WHERE source_fact_id = OLD.id;
+  UPDATE events SET resolution_fact_id = NULL WHERE resolution_fact_id = OLD.id;
+  UPDATE commitments SET resolution_fact_id = NULL WHERE resolution_fact_id = OLD.id;
+  RETURN NULL;
+END;
+$func$;
+
+CREATE TRIGGER facts_cascade_delete
+AFTER DELETE ON facts
+FOR EACH ROW EXECUTE FUNCTION cascade_fact_delete();
+
+CREATE OR REPLACE FUNCTION cascade_relation_delete()
+RETURNS TRIGGER LANGUAGE plpgsql AS $func$
+BEGIN
+  DELETE FROM relations_social WHERE relation_id = OLD.id;
+  DELETE FROM relations_professional WHERE relation_id = OLD.id;
+  DELETE FROM relations_spatial WHERE relation_id = OLD.id;
+  DELETE FROM relations_ownership WHERE relation_id = OLD.id;
+  DELETE FROM contradictions WHERE relation_id = OLD.id;
+  RETURN NULL;
+END;
+$func$;
+
+CREATE TRIGGER relations_cascade_delete
+AFTER DELETE ON relations
+FOR EACH ROW EXECUTE FUNCTION cascade_relation_delete();
+
+-- ============================================================================
+-- 6. FONCTIONS: élagage des partitions
+-- ============================================================================
+
+-- get_attribute ne reçoit que l'entity_id: on résout le game_id pour que
+-- la requête ne touche qu'une partition au lieu de toutes.
+CREATE OR REPLACE FUNCTION get_attribute(
+  p_entity_id UUID,
+  p_key VARCHAR(100),
+  p_known_only BOOLEAN DEFAULT false
+)
+RETURNS TEXT LANGUAGE plpgsql AS $func$
+DECLARE
+  v_game_id UUID;
+  v_value TEXT;
+BEGIN
+  SELECT game_id INTO v_game_id FROM entities WHERE id = p_entity_id;
+
+  SELECT value INTO v_value FROM attributes
+  WHERE game_id = v_game_id
+    AND entity_id = p_entity_id
+    AND key = p_key
+    AND end_cycle IS NULL
+    AND (NOT p_known_only OR known_by_protagonist = true);
+  RETURN v_value;
+END;
+$func$;
+
+-- ============================================================================
+-- 7. VUES: recréation à l'identique
+-- ============================================================================
+
+DO $mig$
+DECLARE
+  v RECORD;
+BEGIN
+  FOR v IN SELECT relname, definition FROM _saved_views ORDER BY oid LOOP
+    EXECUTE format(
+      'CREATE VIEW %I AS %s', v.relname, rtrim(rtrim(v.definition), ';')
+    );
+  END LOOP;
+END;
+$mig$;
+
+GRANT ALL ON ALL TABLES IN SCHEMA public TO postgres;
+
+COMMIT;
+
+ANALYZE attributes;
+ANALYZE relations;
+ANALYZE facts;
+ANALYZE chat_messages;
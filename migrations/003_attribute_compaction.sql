@@ -0,0 +1,161 @@
+-- ============================================================================
+-- LDVELH - Migration 003: Compaction des versions d'attributs
+-- Ajoute attributes_history, les marqueurs de compaction par partie et
+-- compact_attributes(); rollback_to_cycle restaure les lignes compactées.
+-- Compatible avec le schéma classique et la variante partitionnée (002).
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE games
+  ADD COLUMN IF NOT EXISTS attributes_compacted_through INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS attributes_rollback_floor INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_attributes_superseded ON attributes(game_id, end_cycle)
+  WHERE end_cycle IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS attributes_history (
+  id UUID PRIMARY KEY,
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  entity_id UUID NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+  key VARCHAR(100) NOT NULL,
+  value TEXT NOT NULL,
+  details JSONB,
+  known_by_protagonist BOOLEAN DEFAULT true,
+  start_cycle INTEGER NOT NULL,
+  end_cycle INTEGER NOT NULL,
+  created_at TIMESTAMPTZ,
+  compacted_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_attributes_history_game ON attributes_history(game_id, end_cycle);
+CREATE INDEX IF NOT EXISTS idx_attributes_history_entity ON attributes_history(entity_id, key);
+
+CREATE OR REPLACE FUNCTION rollback_to_cycle(
+  p_game_id UUID,
+  p_target_cycle INTEGER
+)
+RETURNS TABLE(
+  deleted_facts INTEGER,
+  deleted_events INTEGER,
+  deleted_commitments INTEGER,
+  reverted_attributes INTEGER,
+  reverted_relations INTEGER
+) LANGUAGE plpgsql AS $func$
+DECLARE
+  v_deleted_facts INTEGER;
+  v_deleted_events INTEGER;
+  v_deleted_commitments INTEGER;
+  v_reverted_attributes INTEGER;
+  v_reverted_relations INTEGER;
+  v_rollback_floor INTEGER;
+BEGIN
+  -- Versions dropped by compaction cannot be restored
+  SELECT attributes_rollback_floor INTO v_rollback_floor FROM games WHERE id = p_game_id;
+  IF p_target_cycle < COALESCE(v_rollback_floor, 0) THEN
+    RAISE EXCEPTION 'Rollback to cycle % is beyond the retention horizon (floor: %)',
+      p_target_cycle, v_rollback_floor;
+  END IF;
+
+  -- Compacted versions still valid after the target cycle come back first
+  WITH restored AS (
+    DELETE FROM attributes_history
+    WHERE game_id = p_game_id AND end_cycle > p_target_cycle
+    RETURNING id, game_id, entity_id, key, value, details, known_by_protagonist,
+      start_cycle, end_cycle, created_at
+  )
+  INSERT INTO attributes (id, game_id, entity_id, key, value, details,
+    known_by_protagonist, start_cycle, end_cycle, created_at)
+  SELECT * FROM restored;
+
+  UPDATE games SET attributes_compacted_through = p_target_cycle
+  WHERE id = p_game_id AND attributes_compacted_through > p_target_cycle;
+
+  DELETE FROM facts WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_facts = ROW_COUNT;
+  
+  DELETE FROM events WHERE game_id = p_game_id AND planned_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_events = ROW_COUNT;
+  
+  DELETE FROM commitments WHERE game_id = p_game_id AND created_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_commitments = ROW_COUNT;
+  
+  DELETE FROM attributes WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_reverted_attributes = ROW_COUNT;
+  
+  UPDATE attributes SET end_cycle = NULL 
+  WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM relations WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_reverted_relations = ROW_COUNT;
+  
+  UPDATE relations SET end_cycle = NULL, end_reason = NULL
+  WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM skills WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  UPDATE skills SET end_cycle = NULL WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM contradictions WHERE game_id = p_game_id AND detection_cycle > p_target_cycle;
+  DELETE FROM chat_messages WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  DELETE FROM cycle_summaries WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  DELETE FROM extraction_logs WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  
+  UPDATE games SET updated_at = NOW() WHERE id = p_game_id;
+  
+  RETURN QUERY SELECT v_deleted_facts, v_deleted_events, v_deleted_commitments,
+    v_reverted_attributes, v_reverted_relations;
+END;
+$func$;
+
+-- Moves attribute versions superseded more than p_horizon cycles ago out of
+-- the hot table. p_drop = false: kept in attributes_history (rollback stays
+-- exact). p_drop = true: deleted, and rollback_to_cycle refuses to go below
+-- the new floor.
+CREATE OR REPLACE FUNCTION compact_attributes(
+  p_game_id UUID,
+  p_horizon INTEGER,
+  p_drop BOOLEAN DEFAULT false
+)
+RETURNS INTEGER LANGUAGE plpgsql AS $func$
+DECLARE
+  v_current_cycle INTEGER;
+  v_cutoff INTEGER;
+  v_count INTEGER;
+BEGIN
+  SELECT COALESCE(MAX(cycle), 0) INTO v_current_cycle
+  FROM chat_messages WHERE game_id = p_game_id;
+
+  v_cutoff := v_current_cycle - p_horizon;
+  IF v_cutoff <= 0 THEN RETURN 0; END IF;
+
+  IF p_drop THEN
+    DELETE FROM attributes
+    WHERE game_id = p_game_id AND end_cycle IS NOT NULL AND end_cycle <= v_cutoff;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    UPDATE games SET attributes_rollback_floor = GREATEST(attributes_rollback_floor, v_cutoff)
+    WHERE id = p_game_id;
+  ELSE
+    WITH moved AS (
+      DELETE FROM attributes
+      WHERE game_id = p_game_id AND end_cycle IS NOT NULL AND end_cycle <= v_cutoff
+      RETURNING id, game_id, entity_id, key, value, details, known_by_protagonist,
+        start_cycle, end_cycle, created_at
+    )
+    INSERT INTO attributes_history (id, game_id, entity_id, key, value, details,
+      known_by_protagonist, start_cycle, end_cycle, created_at)
+    SELECT * FROM moved;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+  END IF;
+
+  UPDATE games
+  SET attributes_compacted_through = GREATEST(attributes_compacted_through, v_cutoff)
+  WHERE id = p_game_id;
+
+  RETURN v_count;
+END;
+$func$;
+
+GRANT ALL ON attributes_history TO postgres;
+
+COMMIT;
@@ -0,0 +1,316 @@
+-- ============================================================================
+-- LDVELH - Migration 004: Jauges typées du protagoniste
+-- energy / morale / health / credits quittent l'EAV pour protagonist_gauges
+-- (valeur courante) + protagonist_gauge_history (journal). L'historique est
+-- reconstruit à partir des versions existantes de la table attributes.
+-- Requiert la migration 003 (attributes_history).
+-- ============================================================================
+
+BEGIN;
+
+-- Current values: one row per game, updated in place by update_gauge and
+-- credit_transaction (no EAV version per change).
+CREATE TABLE protagonist_gauges (
+  game_id UUID PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  energy NUMERIC NOT NULL DEFAULT 3,
+  morale NUMERIC NOT NULL DEFAULT 3,
+  health NUMERIC NOT NULL DEFAULT 3,
+  credits INTEGER NOT NULL DEFAULT 1400,
+  updated_cycle INTEGER NOT NULL DEFAULT 1,
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Append-only log of every change (stats over time, rollback)
+CREATE TABLE protagonist_gauge_history (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  gauge VARCHAR(20) NOT NULL,
+  cycle INTEGER NOT NULL,
+  old_value NUMERIC,
+  new_value NUMERIC NOT NULL,
+  description TEXT,
+  created_at TIMESTAMPTZ DEFAULT clock_timestamp()
+);
+
+CREATE INDEX idx_gauge_history_game ON protagonist_gauge_history(game_id, gauge, cycle, created_at);
+
+-- ============================================================================
+-- FONCTIONS
+-- ============================================================================
+
+-- Seeds protagonist_gauges from the protagonist's initial attributes.
+-- Returns false when the game has no protagonist yet.
+CREATE OR REPLACE FUNCTION ensure_protagonist_gauges(p_game_id UUID)
+RETURNS BOOLEAN LANGUAGE plpgsql AS $func$
+DECLARE
+  v_inserted INTEGER;
+BEGIN
+  INSERT INTO protagonist_gauges (game_id, energy, morale, health, credits, updated_cycle)
+  SELECT
+    e.game_id,
+    COALESCE(get_attribute(e.id, 'energy')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'morale')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'health')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'credits')::INTEGER, 1400),
+    e.created_cycle
+  FROM entities e
+  WHERE e.game_id = p_game_id AND e.type = 'protagonist' AND e.removed_cycle IS NULL
+  ON CONFLICT (game_id) DO NOTHING;
+  GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+  IF v_inserted > 0 THEN
+    INSERT INTO protagonist_gauge_history (game_id, gauge, cycle, old_value, new_value)
+    SELECT pg.game_id, g.gauge, pg.updated_cycle, NULL, g.value
+    FROM protagonist_gauges pg,
+    LATERAL (VALUES
+      ('energy', pg.energy), ('morale', pg.morale),
+      ('health', pg.health), ('credits', pg.credits::NUMERIC)
+    ) AS g(gauge, value)
+    WHERE pg.game_id = p_game_id;
+  END IF;
+
+  RETURN EXISTS(SELECT 1 FROM protagonist_gauges WHERE game_id = p_game_id);
+END;
+$func$;
+
+CREATE OR REPLACE FUNCTION credit_transaction(
+  p_game_id UUID,
+  p_amount INTEGER,
+  p_cycle INTEGER,
+  p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(success BOOLEAN, new_balance INTEGER, error TEXT) LANGUAGE plpgsql AS $func$
+DECLARE
+  v_current_balance INTEGER;
+  v_new_balance INTEGER;
+BEGIN
+  FOR attempt IN 1..2 LOOP
+    UPDATE protagonist_gauges
+    SET credits = credits + p_amount, updated_cycle = p_cycle, updated_at = now()
+    WHERE game_id = p_game_id AND credits + p_amount >= 0
+    RETURNING credits INTO v_new_balance;
+
+    IF FOUND THEN
+      INSERT INTO protagonist_gauge_history
+        (game_id, gauge, cycle, old_value, new_value, description)
+      VALUES
+        (p_game_id, 'credits', p_cycle, v_new_balance - p_amount, v_new_balance, p_description);
+      RETURN QUERY SELECT true, v_new_balance, NULL::TEXT;
+      RETURN;
+    END IF;
+
+    SELECT credits INTO v_current_balance FROM protagonist_gauges WHERE game_id = p_game_id;
+    IF FOUND THEN
+      RETURN QUERY SELECT false, v_current_balance,
+        format('Insufficient funds: %s + (%s) = %s',
+          v_current_balance, p_amount, v_current_balance + p_amount)::TEXT;
+      RETURN;
+    END IF;
+
+    EXIT WHEN NOT ensure_protagonist_gauges(p_game_id);
+  END LOOP;
+
+  RETURN QUERY SELECT false, 0, 'Protagonist not found'::TEXT;
+END;
+$func$;
+
+CREATE OR REPLACE FUNCTION update_gauge(
+  p_game_id UUID,
+  p_attribute VARCHAR(100),
+  p_delta NUMERIC,
+  p_cycle INTEGER
+)
+RETURNS TABLE(success BOOLEAN, old_value NUMERIC, new_value NUMERIC) LANGUAGE plpgsql AS $func$
+DECLARE
+  v_current_value NUMERIC;
+  v_new_value NUMERIC;
+BEGIN
+  IF p_attribute NOT IN ('energy', 'morale', 'health') THEN
+    RETURN QUERY SELECT false, 0::NUMERIC, 0::NUMERIC;
+    RETURN;
+  END IF;
+
+  FOR attempt IN 1..2 LOOP
+    EXECUTE format(
+      'UPDATE protagonist_gauges g
+       SET %1$I = GREATEST(0, LEAST(5, ROUND((g.%1$I + $2) * 2) / 2)),
+           updated_cycle = $3, updated_at = now()
+       FROM (SELECT %1$I AS value FROM protagonist_gauges WHERE game_id = $1) prev
+       WHERE g.game_id = $1
+       RETURNING prev.value, g.%1$I',
+      p_attribute
+    ) INTO v_current_value, v_new_value USING p_game_id, p_delta, p_cycle;
+
+    IF v_new_value IS NOT NULL THEN
+      IF v_new_value != v_current_value THEN
+        INSERT INTO protagonist_gauge_history (game_id, gauge, cycle, old_value, new_value)
+        VALUES (p_game_id, p_attribute, p_cycle, v_current_value, v_new_value);
+      END IF;
+      RETURN QUERY SELECT true, v_current_value, v_new_value;
+      RETURN;
+    END IF;
+
+    EXIT WHEN NOT ensure_protagonist_gauges(p_game_id);
+  END LOOP;
+
+  RETURN QUERY SELECT false, 0::NUMERIC, 0::NUMERIC;
+END;
+$func$;
+
+CREATE OR REPLACE FUNCTION rollback_to_cycle(
+  p_game_id UUID,
+  p_target_cycle INTEGER
+)
+RETURNS TABLE(
+  deleted_facts INTEGER,
+  deleted_events INTEGER,
+  deleted_commitments INTEGER,
+  reverted_attributes INTEGER,
+  reverted_relations INTEGER
+) LANGUAGE plpgsql AS $func$
+DECLARE
+  v_deleted_facts INTEGER;
+  v_deleted_events INTEGER;
+  v_deleted_commitments INTEGER;
+  v_reverted_attributes INTEGER;
+  v_reverted_relations INTEGER;
+  v_rollback_floor INTEGER;
+BEGIN
+  -- Versions dropped by compaction cannot be restored
+  SELECT attributes_rollback_floor INTO v_rollback_floor FROM games WHERE id = p_game_id;
+  IF p_target_cycle < COALESCE(v_rollback_floor, 0) THEN
+    RAISE EXCEPTION 'Rollback to cycle % is beyond the retention horizon (floor: %)',
+      p_target_cycle, v_rollback_floor;
+  END IF;
+
+  -- Compacted versions still valid after the target cycle come back first
+  WITH restored AS (
+    DELETE FROM attributes_history
+    WHERE game_id = p_game_id AND end_cycle > p_target_cycle
+    RETURNING id, game_id, entity_id, key, value, details, known_by_protagonist,
+      start_cycle, end_cycle, created_at
+  )
+  INSERT INTO attributes (id, game_id, entity_id, key, value, details,
+    known_by_protagonist, start_cycle, end_cycle, created_at)
+  SELECT * FROM restored;
+
+  UPDATE games SET attributes_compacted_through = p_target_cycle
+  WHERE id = p_game_id AND attributes_compacted_through > p_target_cycle;
+
+  DELETE FROM facts WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_facts = ROW_COUNT;
+  
+  DELETE FROM events WHERE game_id = p_game_id AND planned_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_events = ROW_COUNT;
+  
+  DELETE FROM commitments WHERE game_id = p_game_id AND created_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_deleted_commitments = ROW_COUNT;
+  
+  DELETE FROM attributes WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_reverted_attributes = ROW_COUNT;
+  
+  UPDATE attributes SET end_cycle = NULL 
+  WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM relations WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  GET DIAGNOSTICS v_reverted_relations = ROW_COUNT;
+  
+  UPDATE relations SET end_cycle = NULL, end_reason = NULL
+  WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM protagonist_gauge_history
+  WHERE game_id = p_game_id AND cycle > p_target_cycle;
+
+  UPDATE protagonist_gauges pg SET
+    energy = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'energy'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.energy),
+    morale = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'morale'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.morale),
+    health = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'health'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.health),
+    credits = COALESCE((SELECT h.new_value::INTEGER FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'credits'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.credits),
+    updated_cycle = LEAST(pg.updated_cycle, p_target_cycle),
+    updated_at = now()
+  WHERE pg.game_id = p_game_id;
+
+  DELETE FROM skills WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
+  UPDATE skills SET end_cycle = NULL WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
+  
+  DELETE FROM contradictions WHERE game_id = p_game_id AND detection_cycle > p_target_cycle;
+  DELETE FROM chat_messages WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  DELETE FROM cycle_summaries WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  DELETE FROM extraction_logs WHERE game_id = p_game_id AND cycle > p_target_cycle;
+  
+  UPDATE games SET updated_at = NOW() WHERE id = p_game_id;
+  
+  RETURN QUERY SELECT v_deleted_facts, v_deleted_events, v_deleted_commitments,
+    v_reverted_attributes, v_reverted_relations;
+END;
+$func$;
+
+CREATE OR REPLACE VIEW v_protagonist AS
+SELECT 
+  e.id,
+  e.game_id,
+  e.name,
+  pg.credits,
+  pg.energy,
+  pg.morale,
+  pg.health,
+  get_attribute(e.id, 'hobbies') AS hobbies,
+  get_attribute(e.id, 'departure_reason') AS departure_reason,
+  get_attribute(e.id, 'origin') AS origin_location,
+  get_attribute(e.id, 'backstory') AS backstory
+FROM entities e
+LEFT JOIN protagonist_gauges pg ON pg.game_id = e.game_id
+WHERE e.type = 'protagonist' AND e.removed_cycle IS NULL;
+
+-- ============================================================================
+-- REPRISE DES DONNÉES
+-- ============================================================================
+
+INSERT INTO protagonist_gauge_history
+  (game_id, gauge, cycle, old_value, new_value, description, created_at)
+SELECT
+  a.game_id,
+  a.key,
+  a.start_cycle,
+  LAG(a.value::NUMERIC) OVER (
+    PARTITION BY a.entity_id, a.key ORDER BY a.start_cycle, a.created_at
+  ),
+  a.value::NUMERIC,
+  a.details->>'description',
+  a.created_at
+FROM (
+  SELECT game_id, entity_id, key, value, details, start_cycle, created_at FROM attributes
+  UNION ALL
+  SELECT game_id, entity_id, key, value, details, start_cycle, created_at FROM attributes_history
+) a
+JOIN entities e ON e.id = a.entity_id
+WHERE e.type = 'protagonist' AND e.removed_cycle IS NULL
+  AND a.key IN ('energy', 'morale', 'health', 'credits')
+  AND a.value ~ '^-?[0-9]+(\.[0-9]+)?$';
+
+INSERT INTO protagonist_gauges (game_id, energy, morale, health, credits, updated_cycle)
+SELECT
+  e.game_id,
+  COALESCE(get_attribute(e.id, 'energy')::NUMERIC, 3),
+  COALESCE(get_attribute(e.id, 'morale')::NUMERIC, 3),
+  COALESCE(get_attribute(e.id, 'health')::NUMERIC, 3),
+  COALESCE(get_attribute(e.id, 'credits')::INTEGER, 1400),
+  COALESCE(
+    (SELECT MAX(h.cycle) FROM protagonist_gauge_history h WHERE h.game_id = e.game_id),
+    e.created_cycle
+  )
+FROM entities e
+WHERE e.type = 'protagonist' AND e.removed_cycle IS NULL
+ON CONFLICT (game_id) DO NOTHING;
+
+GRANT ALL ON protagonist_gauges, protagonist_gauge_history TO postgres;
+
+COMMIT;
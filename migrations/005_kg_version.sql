@@ -0,0 +1,87 @@
+-- ============================================================================
+-- LDVELH - Migration 005: Version du KG par partie
+-- games.kg_version est incrémenté une fois par transaction d'écriture
+-- (triggers bump_kg_version) et sert d'ETag aux endpoints world / state /
+-- tooltips. Compatible avec la variante partitionnée (migration 002):
+-- les triggers de ligne d'une table partitionnée s'appliquent aux partitions.
+-- Idempotente: à rejouer après 002, qui recrée attributes, relations,
+-- facts et chat_messages (et perd donc leurs triggers).
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE games
+  ADD COLUMN IF NOT EXISTS kg_version BIGINT NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS kg_version_txid BIGINT;
+
+CREATE OR REPLACE FUNCTION bump_kg_version()
+RETURNS TRIGGER LANGUAGE plpgsql AS $func$
+DECLARE
+  v_row RECORD;
+  v_game_id UUID;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  IF TG_NARGS = 0 THEN
+    v_game_id := v_row.game_id;
+  ELSE
+    EXECUTE format('SELECT game_id FROM %I WHERE id = $1', TG_ARGV[0])
+    INTO v_game_id
+    USING (to_jsonb(v_row) ->> TG_ARGV[1])::uuid;
+  END IF;
+
+  UPDATE games
+  SET kg_version = kg_version + 1, kg_version_txid = txid_current()
+  WHERE id = v_game_id
+    AND kg_version_txid IS DISTINCT FROM txid_current();
+  RETURN NULL;
+END;
+$func$;
+
+DO $kgv$
+DECLARE
+  t TEXT;
+  child TEXT[];
+BEGIN
+  FOREACH t IN ARRAY ARRAY[
+    'entities', 'attributes', 'skills', 'protagonist_gauges', 'relations',
+    'facts', 'events', 'commitments', 'chat_messages', 'cycle_summaries'
+  ] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_kg_version', t);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+      'FOR EACH ROW EXECUTE FUNCTION bump_kg_version()',
+      t || '_kg_version', t
+    );
+  END LOOP;
+
+  FOREACH child SLICE 1 IN ARRAY ARRAY[
+    ['entity_locations', 'entities', 'entity_id'],
+    ['entity_ais', 'entities', 'entity_id'],
+    ['entity_organizations', 'entities', 'entity_id'],
+    ['relations_social', 'relations', 'relation_id'],
+    ['relations_professional', 'relations', 'relation_id'],
+    ['relations_spatial', 'relations', 'relation_id'],
+    ['relations_ownership', 'relations', 'relation_id'],
+    ['fact_participants', 'facts', 'fact_id'],
+    ['event_participants', 'events', 'event_id'],
+    ['commitment_arcs', 'commitments', 'commitment_id'],
+    ['commitment_entities', 'commitments', 'commitment_id']
+  ] LOOP
+    EXECUTE format(
+      'DROP TRIGGER IF EXISTS %I ON %I', child[1] || '_kg_version', child[1]
+    );
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+      'FOR EACH ROW EXECUTE FUNCTION bump_kg_version(%L, %L)',
+      child[1] || '_kg_version', child[1], child[2], child[3]
+    );
+  END LOOP;
+END;
+$kgv$;
+
+COMMIT;
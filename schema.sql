@@ -2,6 +2,7 @@
 -- LDVELH - Database Schema (EAV Architecture)
 -- Architecture: CORE → NARRATION → HISTORY
 -- All entity attributes go through the `attributes` table
+-- Optional variant (hash partitions on game_id): migrations/002_partition_by_game.sql
 -- ============================================================================
 
 -- ============================================================================
@@ -57,6 +58,12 @@ CREATE TABLE games (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   name VARCHAR(255) DEFAULT 'New Game',
   active BOOLEAN DEFAULT true,
+  -- Attribute compaction (see compact_attributes)
+  attributes_compacted_through INTEGER NOT NULL DEFAULT 0,
+  attributes_rollback_floor INTEGER NOT NULL DEFAULT 0,
+  -- Bumped once per write transaction (see bump_kg_version), used as ETag
+  kg_version BIGINT NOT NULL DEFAULT 0,
+  kg_version_txid BIGINT,
   created_at TIMESTAMPTZ DEFAULT now(),
   updated_at TIMESTAMPTZ DEFAULT now()
 );
@@ -137,6 +144,27 @@ CREATE INDEX idx_attributes_game ON attributes(game_id);
 CREATE INDEX idx_attributes_known ON attributes(entity_id) 
   WHERE known_by_protagonist = true AND end_cycle IS NULL;
 CREATE INDEX idx_attributes_game_key ON attributes(game_id, key) WHERE end_cycle IS NULL;
+CREATE INDEX idx_attributes_superseded ON attributes(game_id, end_cycle)
+  WHERE end_cycle IS NOT NULL;
+
+-- Superseded versions moved out of `attributes` by compact_attributes.
+-- Same columns; rows come back into `attributes` when a rollback needs them.
+CREATE TABLE attributes_history (
+  id UUID PRIMARY KEY,
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  entity_id UUID NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+  key VARCHAR(100) NOT NULL,
+  value TEXT NOT NULL,
+  details JSONB,
+  known_by_protagonist BOOLEAN DEFAULT true,
+  start_cycle INTEGER NOT NULL,
+  end_cycle INTEGER NOT NULL,
+  created_at TIMESTAMPTZ,
+  compacted_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX idx_attributes_history_game ON attributes_history(game_id, end_cycle);
+CREATE INDEX idx_attributes_history_entity ON attributes_history(entity_id, key);
 
 -- ============================================================================
 -- CORE: SKILLS
@@ -157,6 +185,36 @@ CREATE TABLE skills (
 CREATE INDEX idx_skills_entity ON skills(entity_id);
 CREATE INDEX idx_skills_active ON skills(entity_id) WHERE end_cycle IS NULL;
 
+-- ============================================================================
+-- CORE: PROTAGONIST GAUGES (typed, hot path)
+-- ============================================================================
+
+-- Current values: one row per game, updated in place by update_gauge and
+-- credit_transaction (no EAV version per change).
+CREATE TABLE protagonist_gauges (
+  game_id UUID PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  energy NUMERIC NOT NULL DEFAULT 3,
+  morale NUMERIC NOT NULL DEFAULT 3,
+  health NUMERIC NOT NULL DEFAULT 3,
+  credits INTEGER NOT NULL DEFAULT 1400,
+  updated_cycle INTEGER NOT NULL DEFAULT 1,
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Append-only log of every change (stats over time, rollback)
+CREATE TABLE protagonist_gauge_history (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  gauge VARCHAR(20) NOT NULL,
+  cycle INTEGER NOT NULL,
+  old_value NUMERIC,
+  new_value NUMERIC NOT NULL,
+  description TEXT,
+  created_at TIMESTAMPTZ DEFAULT clock_timestamp()
+);
+
+CREATE INDEX idx_gauge_history_game ON protagonist_gauge_history(game_id, gauge, cycle, created_at);
+
 -- ============================================================================
 -- CORE: RELATIONS (parent table)
 -- ============================================================================
@@ -431,6 +489,22 @@ CREATE TABLE extraction_logs (
 CREATE INDEX idx_logs_game ON extraction_logs(game_id);
 CREATE INDEX idx_logs_cycle ON extraction_logs(game_id, cycle);
 
+-- ============================================================================
+-- HISTORY: COLD STORAGE (parties inactives archivées)
+-- ============================================================================
+
+-- Archive compressée (format kg/archive.py) d'une partie dont les lignes
+-- ont été retirées des tables chaudes. La ligne games est conservée.
+CREATE TABLE game_archives (
+  game_id UUID PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  format_version INTEGER NOT NULL,
+  last_cycle INTEGER NOT NULL DEFAULT 0,
+  last_date VARCHAR(50),
+  size_bytes INTEGER NOT NULL,
+  data BYTEA NOT NULL,
+  archived_at TIMESTAMPTZ DEFAULT now()
+);
+
 -- ============================================================================
 -- HELPER FUNCTIONS
 -- ============================================================================
@@ -523,12 +597,12 @@ DECLARE
   v_old_value TEXT;
 BEGIN
   SELECT value INTO v_old_value FROM attributes
-  WHERE entity_id = p_entity_id AND key = p_key AND end_cycle IS NULL;
+  WHERE game_id = p_game_id AND entity_id = p_entity_id AND key = p_key AND end_cycle IS NULL;
   
   IF v_old_value = p_value THEN RETURN NULL; END IF;
   
   UPDATE attributes SET end_cycle = p_cycle
-  WHERE entity_id = p_entity_id AND key = p_key AND end_cycle IS NULL;
+  WHERE game_id = p_game_id AND entity_id = p_entity_id AND key = p_key AND end_cycle IS NULL;
   
   INSERT INTO attributes (game_id, entity_id, key, value, details, start_cycle, known_by_protagonist)
   VALUES (p_game_id, p_entity_id, p_key, p_value, p_details, p_cycle, p_known_by_protagonist)
@@ -576,7 +650,8 @@ BEGIN
     AND end_cycle IS NULL;
   
   IF v_id IS NOT NULL THEN
-    UPDATE relations SET known_by_protagonist = p_known_by_protagonist WHERE id = v_id;
+    UPDATE relations SET known_by_protagonist = p_known_by_protagonist
+    WHERE game_id = p_game_id AND id = v_id;
     RETURN v_id;
   ELSE
     INSERT INTO relations (game_id, source_id, target_id, type, start_cycle, known_by_protagonist)
@@ -685,6 +760,41 @@ BEGIN
 END;
 $func$;
 
+-- Seeds protagonist_gauges from the protagonist's initial attributes.
+-- Returns false when the game has no protagonist yet.
+CREATE OR REPLACE FUNCTION ensure_protagonist_gauges(p_game_id UUID)
+RETURNS BOOLEAN LANGUAGE plpgsql AS $func$
+DECLARE
+  v_inserted INTEGER;
+BEGIN
+  INSERT INTO protagonist_gauges (game_id, energy, morale, health, credits, updated_cycle)
+  SELECT
+    e.game_id,
+    COALESCE(get_attribute(e.id, 'energy')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'morale')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'health')::NUMERIC, 3),
+    COALESCE(get_attribute(e.id, 'credits')::INTEGER, 1400),
+    e.created_cycle
+  FROM entities e
+  WHERE e.game_id = p_game_id AND e.type = 'protagonist' AND e.removed_cycle IS NULL
+  ON CONFLICT (game_id) DO NOTHING;
+  GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+  IF v_inserted > 0 THEN
+    INSERT INTO protagonist_gauge_history (game_id, gauge, cycle, old_value, new_value)
+    SELECT pg.game_id, g.gauge, pg.updated_cycle, NULL, g.value
+    FROM protagonist_gauges pg,
+    LATERAL (VALUES
+      ('energy', pg.energy), ('morale', pg.morale),
+      ('health', pg.health), ('credits', pg.credits::NUMERIC)
+    ) AS g(gauge, value)
+    WHERE pg.game_id = p_game_id;
+  END IF;
+
+  RETURN EXISTS(SELECT 1 FROM protagonist_gauges WHERE game_id = p_game_id);
+END;
+$func$;
+
 CREATE OR REPLACE FUNCTION credit_transaction(
   p_game_id UUID,
   p_amount INTEGER,
@@ -693,31 +803,36 @@ CREATE OR REPLACE FUNCTION credit_transaction(
 )
 RETURNS TABLE(success BOOLEAN, new_balance INTEGER, error TEXT) LANGUAGE plpgsql AS $func$
 DECLARE
-  v_protagonist_id UUID;
   v_current_balance INTEGER;
   v_new_balance INTEGER;
 BEGIN
-  SELECT e.id INTO v_protagonist_id FROM entities e
-  WHERE e.game_id = p_game_id AND e.type = 'protagonist' AND e.removed_cycle IS NULL;
-  
-  IF v_protagonist_id IS NULL THEN
-    RETURN QUERY SELECT false, 0, 'Protagonist not found'::TEXT;
-    RETURN;
-  END IF;
-  
-  v_current_balance := COALESCE(get_attribute(v_protagonist_id, 'credits')::INTEGER, 1400);
-  v_new_balance := v_current_balance + p_amount;
-  
-  IF v_new_balance < 0 THEN
-    RETURN QUERY SELECT false, v_current_balance, 
-      format('Insufficient funds: %s + (%s) = %s', v_current_balance, p_amount, v_new_balance)::TEXT;
-    RETURN;
-  END IF;
-  
-  PERFORM set_attribute(p_game_id, v_protagonist_id, 'credits', v_new_balance::TEXT, p_cycle,
-    jsonb_build_object('description', p_description, 'amount', p_amount));
-  
-  RETURN QUERY SELECT true, v_new_balance, NULL::TEXT;
+  FOR attempt IN 1..2 LOOP
+    UPDATE protagonist_gauges
+    SET credits = credits + p_amount, updated_cycle = p_cycle, updated_at = now()
+    WHERE game_id = p_game_id AND credits + p_amount >= 0
+    RETURNING credits INTO v_new_balance;
+
+    IF FOUND THEN
+      INSERT INTO protagonist_gauge_history
+        (game_id, gauge, cycle, old_value, new_value, description)
+      VALUES
+        (p_game_id, 'credits', p_cycle, v_new_balance - p_amount, v_new_balance, p_description);
+      RETURN QUERY SELECT true, v_new_balance, NULL::TEXT;
+      RETURN;
+    END IF;
+
+    SELECT credits INTO v_current_balance FROM protagonist_gauges WHERE game_id = p_game_id;
+    IF FOUND THEN
+      RETURN QUERY SELECT false, v_current_balance,
+        format('Insufficient funds: %s + (%s) = %s',
+          v_current_balance, p_amount, v_current_balance + p_amount)::TEXT;
+      RETURN;
+    END IF;
+
+    EXIT WHEN NOT ensure_protagonist_gauges(p_game_id);
+  END LOOP;
+
+  RETURN QUERY SELECT false, 0, 'Protagonist not found'::TEXT;
 END;
 $func$;
 
@@ -729,7 +844,6 @@ CREATE OR REPLACE FUNCTION update_gauge(
 )
 RETURNS TABLE(success BOOLEAN, old_value NUMERIC, new_value NUMERIC) LANGUAGE plpgsql AS $func$
 DECLARE
-  v_protagonist_id UUID;
   v_current_value NUMERIC;
   v_new_value NUMERIC;
 BEGIN
@@ -737,24 +851,31 @@ BEGIN
     RETURN QUERY SELECT false, 0::NUMERIC, 0::NUMERIC;
     RETURN;
   END IF;
-  
-  SELECT e.id INTO v_protagonist_id FROM entities e
-  WHERE e.game_id = p_game_id AND e.type = 'protagonist' AND e.removed_cycle IS NULL;
-  
-  IF v_protagonist_id IS NULL THEN
-    RETURN QUERY SELECT false, 0::NUMERIC, 0::NUMERIC;
-    RETURN;
-  END IF;
-  
-  v_current_value := COALESCE(get_attribute(v_protagonist_id, p_attribute)::NUMERIC, 3);
-  v_new_value := ROUND((v_current_value + p_delta) * 2) / 2;
-  v_new_value := GREATEST(0, LEAST(5, v_new_value));
-  
-  IF v_new_value != v_current_value THEN
-    PERFORM set_attribute(p_game_id, v_protagonist_id, p_attribute, v_new_value::TEXT, p_cycle);
-  END IF;
-  
-  RETURN QUERY SELECT true, v_current_value, v_new_value;
+
+  FOR attempt IN 1..2 LOOP
+    EXECUTE format(
+      'UPDATE protagonist_gauges g
+       SET %1$I = GREATEST(0, LEAST(5, ROUND((g.%1$I + $2) * 2) / 2)),
+           updated_cycle = $3, updated_at = now()
+       FROM (SELECT %1$I AS value FROM protagonist_gauges WHERE game_id = $1) prev
+       WHERE g.game_id = $1
+       RETURNING prev.value, g.%1$I',
+      p_attribute
+    ) INTO v_current_value, v_new_value USING p_game_id, p_delta, p_cycle;
+
+    IF v_new_value IS NOT NULL THEN
+      IF v_new_value != v_current_value THEN
+        INSERT INTO protagonist_gauge_history (game_id, gauge, cycle, old_value, new_value)
+        VALUES (p_game_id, p_attribute, p_cycle, v_current_value, v_new_value);
+      END IF;
+      RETURN QUERY SELECT true, v_current_value, v_new_value;
+      RETURN;
+    END IF;
+
+    EXIT WHEN NOT ensure_protagonist_gauges(p_game_id);
+  END LOOP;
+
+  RETURN QUERY SELECT false, 0::NUMERIC, 0::NUMERIC;
 END;
 $func$;
 
@@ -775,7 +896,29 @@ DECLARE
   v_deleted_commitments INTEGER;
   v_reverted_attributes INTEGER;
   v_reverted_relations INTEGER;
+  v_rollback_floor INTEGER;
 BEGIN
+  -- Versions dropped by compaction cannot be restored
+  SELECT attributes_rollback_floor INTO v_rollback_floor FROM games WHERE id = p_game_id;
+  IF p_target_cycle < COALESCE(v_rollback_floor, 0) THEN
+    RAISE EXCEPTION 'Rollback to cycle % is beyond the retention horizon (floor: %)',
+      p_target_cycle, v_rollback_floor;
+  END IF;
+
+  -- Compacted versions still valid after the target cycle come back first
+  WITH restored AS (
+    DELETE FROM attributes_history
+    WHERE game_id = p_game_id AND end_cycle > p_target_cycle
+    RETURNING id, game_id, entity_id, key, value, details, known_by_protagonist,
+      start_cycle, end_cycle, created_at
+  )
+  INSERT INTO attributes (id, game_id, entity_id, key, value, details,
+    known_by_protagonist, start_cycle, end_cycle, created_at)
+  SELECT * FROM restored;
+
+  UPDATE games SET attributes_compacted_through = p_target_cycle
+  WHERE id = p_game_id AND attributes_compacted_through > p_target_cycle;
+
   DELETE FROM facts WHERE game_id = p_game_id AND cycle > p_target_cycle;
   GET DIAGNOSTICS v_deleted_facts = ROW_COUNT;
   
@@ -797,6 +940,26 @@ BEGIN
   UPDATE relations SET end_cycle = NULL, end_reason = NULL
   WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
   
+  DELETE FROM protagonist_gauge_history
+  WHERE game_id = p_game_id AND cycle > p_target_cycle;
+
+  UPDATE protagonist_gauges pg SET
+    energy = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'energy'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.energy),
+    morale = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'morale'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.morale),
+    health = COALESCE((SELECT h.new_value FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'health'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.health),
+    credits = COALESCE((SELECT h.new_value::INTEGER FROM protagonist_gauge_history h
+      WHERE h.game_id = p_game_id AND h.gauge = 'credits'
+      ORDER BY h.cycle DESC, h.created_at DESC LIMIT 1), pg.credits),
+    updated_cycle = LEAST(pg.updated_cycle, p_target_cycle),
+    updated_at = now()
+  WHERE pg.game_id = p_game_id;
+
   DELETE FROM skills WHERE game_id = p_game_id AND start_cycle > p_target_cycle;
   UPDATE skills SET end_cycle = NULL WHERE game_id = p_game_id AND end_cycle > p_target_cycle;
   
@@ -812,6 +975,55 @@ BEGIN
 END;
 $func$;
 
+-- Moves attribute versions superseded more than p_horizon cycles ago out of
+-- the hot table. p_drop = false: kept in attributes_history (rollback stays
+-- exact). p_drop = true: deleted, and rollback_to_cycle refuses to go below
+-- the new floor.
+CREATE OR REPLACE FUNCTION compact_attributes(
+  p_game_id UUID,
+  p_horizon INTEGER,
+  p_drop BOOLEAN DEFAULT false
+)
+RETURNS INTEGER LANGUAGE plpgsql AS $func$
+DECLARE
+  v_current_cycle INTEGER;
+  v_cutoff INTEGER;
+  v_count INTEGER;
+BEGIN
+  SELECT COALESCE(MAX(cycle), 0) INTO v_current_cycle
+  FROM chat_messages WHERE game_id = p_game_id;
+
+  v_cutoff := v_current_cycle - p_horizon;
+  IF v_cutoff <= 0 THEN RETURN 0; END IF;
+
+  IF p_drop THEN
+    DELETE FROM attributes
+    WHERE game_id = p_game_id AND end_cycle IS NOT NULL AND end_cycle <= v_cutoff;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    UPDATE games SET attributes_rollback_floor = GREATEST(attributes_rollback_floor, v_cutoff)
+    WHERE id = p_game_id;
+  ELSE
+    WITH moved AS (
+      DELETE FROM attributes
+      WHERE game_id = p_game_id AND end_cycle IS NOT NULL AND end_cycle <= v_cutoff
+      RETURNING id, game_id, entity_id, key, value, details, known_by_protagonist,
+        start_cycle, end_cycle, created_at
+    )
+    INSERT INTO attributes_history (id, game_id, entity_id, key, value, details,
+      known_by_protagonist, start_cycle, end_cycle, created_at)
+    SELECT * FROM moved;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+  END IF;
+
+  UPDATE games
+  SET attributes_compacted_through = GREATEST(attributes_compacted_through, v_cutoff)
+  WHERE id = p_game_id;
+
+  RETURN v_count;
+END;
+$func$;
+
 -- ============================================================================
 -- RECONSTRUCTION VIEWS (for backward compatibility)
 -- ============================================================================
@@ -909,15 +1121,16 @@ SELECT
   e.id,
   e.game_id,
   e.name,
-  get_attribute(e.id, 'credits')::INTEGER AS credits,
-  get_attribute(e.id, 'energy')::NUMERIC AS energy,
-  get_attribute(e.id, 'morale')::NUMERIC AS morale,
-  get_attribute(e.id, 'health')::NUMERIC AS health,
+  pg.credits,
+  pg.energy,
+  pg.morale,
+  pg.health,
   get_attribute(e.id, 'hobbies') AS hobbies,
   get_attribute(e.id, 'departure_reason') AS departure_reason,
   get_attribute(e.id, 'origin') AS origin_location,
   get_attribute(e.id, 'backstory') AS backstory
 FROM entities e
+LEFT JOIN protagonist_gauges pg ON pg.game_id = e.game_id
 WHERE e.type = 'protagonist' AND e.removed_cycle IS NULL;
 
 -- View: AIs with attributes pivoted
@@ -1130,6 +1343,83 @@ FROM contradictions c
 LEFT JOIN entities e ON c.entity_id = e.id
 WHERE c.resolved = false;
 
+-- ============================================================================
+-- KG VERSION (conditional GET / cache validation)
+-- ============================================================================
+
+-- Bumps games.kg_version once per transaction writing a game's data
+-- (kg_version_txid deduplicates rows of the same transaction).
+-- Tables without game_id pass (parent_table, fk_column) to resolve it.
+CREATE OR REPLACE FUNCTION bump_kg_version()
+RETURNS TRIGGER LANGUAGE plpgsql AS $func$
+DECLARE
+  v_row RECORD;
+  v_game_id UUID;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  IF TG_NARGS = 0 THEN
+    v_game_id := v_row.game_id;
+  ELSE
+    EXECUTE format('SELECT game_id FROM %I WHERE id = $1', TG_ARGV[0])
+    INTO v_game_id
+    USING (to_jsonb(v_row) ->> TG_ARGV[1])::uuid;
+  END IF;
+
+  UPDATE games
+  SET kg_version = kg_version + 1, kg_version_txid = txid_current()
+  WHERE id = v_game_id
+    AND kg_version_txid IS DISTINCT FROM txid_current();
+  RETURN NULL;
+END;
+$func$;
+
+DO $kgv$
+DECLARE
+  t TEXT;
+  child TEXT[];
+BEGIN
+  FOREACH t IN ARRAY ARRAY[
+    'entities', 'attributes', 'skills', 'protagonist_gauges', 'relations',
+    'facts', 'events', 'commitments', 'chat_messages', 'cycle_summaries'
+  ] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_kg_version', t);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+      'FOR EACH ROW EXECUTE FUNCTION bump_kg_version()',
+      t || '_kg_version', t
+    );
+  END LOOP;
+
+  FOREACH child SLICE 1 IN ARRAY ARRAY[
+    ['entity_locations', 'entities', 'entity_id'],
+    ['entity_ais', 'entities', 'entity_id'],
+    ['entity_organizations', 'entities', 'entity_id'],
+    ['relations_social', 'relations', 'relation_id'],
+    ['relations_professional', 'relations', 'relation_id'],
+    ['relations_spatial', 'relations', 'relation_id'],
+    ['relations_ownership', 'relations', 'relation_id'],
+    ['fact_participants', 'facts', 'fact_id'],
+    ['event_participants', 'events', 'event_id'],
+    ['commitment_arcs', 'commitments', 'commitment_id'],
+    ['commitment_entities', 'commitments', 'commitment_id']
+  ] LOOP
+    EXECUTE format(
+      'DROP TRIGGER IF EXISTS %I ON %I', child[1] || '_kg_version', child[1]
+    );
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+      'FOR EACH ROW EXECUTE FUNCTION bump_kg_version(%L, %L)',
+      child[1] || '_kg_version', child[1], child[2], child[3]
+    );
+  END LOOP;
+END;
+$kgv$;
+
 -- ============================================================================
 -- GRANTS
 -- ============================================================================